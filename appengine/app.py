@@ -2,10 +2,6 @@ import dash
 from dash import Dash, html
 import dash_bootstrap_components as dbc
 
-app = Dash(__name__, use_pages=True, external_stylesheets=[dbc.themes.BOOTSTRAP,'/assets/custom.css'])
-
-server = app.server
-
 # --- Navbar ---
 navbar = dbc.NavbarSimple(
     children=[
@@ -13,7 +9,9 @@ navbar = dbc.NavbarSimple(
         dbc.NavItem(dbc.NavLink("Project Objective", href="/project_objective")),
         dbc.NavItem(dbc.NavLink("Analytical Methods", href="/analytical_methods")),
         dbc.NavItem(dbc.NavLink("Major Findings", href="/major_findings")),
-        dbc.NavItem(dbc.NavLink("Pokemon Recommender", href="/mock_recommender")),
+        dbc.NavItem(dbc.NavLink("Team Recommender", href="/team_recommender")),
+        dbc.NavItem(dbc.NavLink("Set Search", href="/set_search")),
+        dbc.NavItem(dbc.NavLink("Usage Trends", href="/usage_trends")),
         # Not for prod, only for local
         # dbc.NavItem(dbc.NavLink("Pokemon Recommender", href="/pokemon_recommender")),
     ],
@@ -36,12 +34,19 @@ footer = dbc.Container(
 )
 
 # --- App Layout ---
-app.layout = html.Div([
-    navbar,
-    html.Div(style={'height': '20px'}),  # small spacer between navbar and page
-    dash.page_container,
-    footer,
-])
+# Background job workers (components/job_queue.py) are spawned processes that
+# re-run this file as __mp_main__; only the web process builds the app and pages
+if __name__ != '__mp_main__':
+    app = Dash(__name__, use_pages=True, external_stylesheets=[dbc.themes.BOOTSTRAP,'/assets/custom.css'])
+
+    server = app.server
+
+    app.layout = html.Div([
+        navbar,
+        html.Div(style={'height': '20px'}),  # small spacer between navbar and page
+        dash.page_container,
+        footer,
+    ])
 
 if __name__ == '__main__':
     app.run(debug=True)
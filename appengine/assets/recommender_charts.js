@@ -0,0 +1,95 @@
+// Recommender charts drawn in the browser from the bundles served at
+// /_bundle/recommender_charts/<bracket>.json (see components/chart_bundle.py).
+// Each bracket's bundle is fetched once per page load; the browser revalidates
+// it with its ETag, so an unchanged bundle costs a 304.
+(function () {
+    var bundlePromises = {};
+
+    function loadBundle(url) {
+        if (!bundlePromises[url]) {
+            bundlePromises[url] = fetch(url).then(function (response) {
+                if (!response.ok) {
+                    throw new Error('Chart bundle request failed: ' + response.status);
+                }
+                return response.json();
+            }).then(function (bundle) {
+                // Case-insensitive name -> row, as get_pokemon_info matches names
+                bundle.rowByName = {};
+                bundle.rows.forEach(function (id, row) {
+                    bundle.rowByName[bundle.pokemon[id].toLowerCase()] = row;
+                });
+                return bundle;
+            }).catch(function (error) {
+                delete bundlePromises[url];  // retry on the next selection
+                throw error;
+            });
+        }
+        return bundlePromises[url];
+    }
+
+    function emptyFigure(text) {
+        return {
+            data: [],
+            layout: {annotations: [{text: text, xref: 'paper', yref: 'paper', x: 0.5, y: 0.5, showarrow: false}]}
+        };
+    }
+
+    function section(part, row) {
+        return {start: part.ptr[row], end: part.ptr[row + 1]};
+    }
+
+    function moveFigure(bundle, row, name) {
+        var s = section(bundle.moves, row);
+        if (s.start === s.end) {
+            return emptyFigure('No move data available');
+        }
+        var ids = bundle.moves.ids.slice(s.start, s.end);
+        return {
+            data: [{
+                type: 'bar',
+                x: ids.map(function (id) { return bundle.moveNames[id]; }),
+                y: bundle.moves.pct.slice(s.start, s.end),
+                marker: {color: 'rgb(55, 83, 109)'}
+            }],
+            layout: {title: {text: name + ' Move Usage'}, xaxis: {title: {text: 'Move'}},
+                     yaxis: {title: {text: 'Usage %'}}, showlegend: false}
+        };
+    }
+
+    function counterFigure(bundle, row, name) {
+        var s = section(bundle.counters, row);
+        if (s.start === s.end) {
+            return emptyFigure('No counter data available');
+        }
+        var names = bundle.counters.ids.slice(s.start, s.end).map(function (id) { return bundle.pokemon[id]; });
+        return {
+            data: [
+                {type: 'bar', name: 'KO %', x: names, y: bundle.counters.koed.slice(s.start, s.end),
+                 marker: {color: 'rgb(219, 64, 82)'}},
+                {type: 'bar', name: 'Switch %', x: names, y: bundle.counters.switched.slice(s.start, s.end),
+                 marker: {color: 'rgb(55, 83, 109)'}}
+            ],
+            layout: {title: {text: name + ' Counters'}, barmode: 'group', xaxis: {title: {text: 'Counter Pokemon'}},
+                     yaxis: {title: {text: 'Percentage'}}, showlegend: true,
+                     legend: {yanchor: 'top', y: 0.99, xanchor: 'left', x: 1.05}}
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        recommender: {
+            charts: function (pokemon, bracket, url) {
+                if (!pokemon) {
+                    return [{}, {}];
+                }
+                return loadBundle(url + '/' + bracket + '.json').then(function (bundle) {
+                    var row = bundle.rowByName[pokemon.trim().toLowerCase()];
+                    if (row === undefined) {
+                        return [emptyFigure('No move data available'), emptyFigure('No counter data available')];
+                    }
+                    var name = bundle.pokemon[bundle.rows[row]];
+                    return [moveFigure(bundle, row, name), counterFigure(bundle, row, name)];
+                });
+            }
+        }
+    });
+})();
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from components.pokemon_index import build_name_index
+
+# Inverted indexes over the Moves, Items, Abilities and Tera Types sections of
+# gen9ou_full_data.json: each value (e.g. "Choice Scarf") maps to a postings
+# list of Pokemon IDs (ascending, so most used first) and their usage %.
+# Postings for all values of a field live in one CSR-style array triple.
+
+FIELDS = {'move': 'Moves', 'item': 'Items', 'ability': 'Abilities', 'tera': 'Tera Types'}
+INDEX_PATH = 'components/data/attribute_index.npz'
+
+# --- Build ---
+def data_signature(entries):
+    """SHA-256 over every indexed section of the source data, so any change rebuilds a persisted index."""
+    digest = hashlib.sha256()
+    for p in entries:
+        indexed = [p["Pokemon"]] + [p.get(field, {}) for field in FIELDS.values()]
+        digest.update(json.dumps(indexed, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def build_attribute_index(entries):
+    """Postings per field: values, ptr (offsets), ids (int32) and pct (float32)."""
+    names, index = build_name_index(entries)
+    attribute_index = {'names': names, 'index': index, 'signature': data_signature(entries)}
+    for key, field in FIELDS.items():
+        postings = {}
+        for p in entries:
+            usage = p.get(field, {})
+            if isinstance(usage, str):
+                continue
+            for value, pct in usage.items():
+                postings.setdefault(value, []).append((index[p["Pokemon"]], pct))
+        values = sorted(postings)
+        ptr = np.zeros(len(values) + 1, dtype=np.int64)
+        ids, pct = [], []
+        for k, value in enumerate(values):
+            rows = sorted(postings[value])
+            ids.extend(i for i, _ in rows)
+            pct.extend(v for _, v in rows)
+            ptr[k + 1] = len(ids)
+        attribute_index[key] = {
+            'values': values,
+            'lookup': {value: k for k, value in enumerate(values)},
+            'ptr': ptr,
+            'ids': np.asarray(ids, dtype=np.int32),
+            'pct': np.asarray(pct, dtype=np.float32),
+        }
+    return attribute_index
+
+def save_attribute_index(attribute_index, path=INDEX_PATH):
+    """Persist the postings to an .npz file."""
+    arrays = {'names': np.asarray(attribute_index['names'], dtype=str),
+              'signature': np.asarray(attribute_index['signature'])}
+    for key in FIELDS:
+        field = attribute_index[key]
+        arrays[f"{key}_values"] = np.asarray(field['values'], dtype=str)
+        for part in ('ptr', 'ids', 'pct'):
+            arrays[f"{key}_{part}"] = field[part]
+    np.savez(path, **arrays)
+
+def load_attribute_index(path=INDEX_PATH):
+    """Load postings written by save_attribute_index."""
+    with np.load(path, allow_pickle=False) as data:
+        names = data['names'].tolist()
+        attribute_index = {'names': names, 'index': {name: i for i, name in enumerate(names)},
+                           'signature': str(data['signature'])}
+        for key in FIELDS:
+            values = data[f"{key}_values"].tolist()
+            attribute_index[key] = {
+                'values': values,
+                'lookup': {value: k for k, value in enumerate(values)},
+                'ptr': data[f"{key}_ptr"],
+                'ids': data[f"{key}_ids"],
+                'pct': data[f"{key}_pct"],
+            }
+    return attribute_index
+
+def load_or_build_attribute_index(entries, path=INDEX_PATH):
+    """Use the persisted index when it matches `entries`; otherwise build it (and save it when writable)."""
+    if os.path.exists(path):
+        attribute_index = load_attribute_index(path)
+        if attribute_index['signature'] == data_signature(entries):
+            return attribute_index
+    attribute_index = build_attribute_index(entries)
+    try:
+        save_attribute_index(attribute_index, path)
+    except OSError:
+        pass  # read-only deployments just keep the in-memory index
+    return attribute_index
+
+# --- Queries ---
+def postings(attribute_index, field, value, min_pct=0.0):
+    """Sorted Pokemon IDs running `value` in `field` at `min_pct` % or more."""
+    postings_field = attribute_index[field]
+    k = postings_field['lookup'].get(value)
+    if k is None:
+        return np.empty(0, dtype=np.int32)
+    start, end = postings_field['ptr'][k], postings_field['ptr'][k + 1]
+    ids = postings_field['ids'][start:end]
+    return ids if min_pct <= 0 else ids[postings_field['pct'][start:end] >= min_pct]
+
+def search(attribute_index, all_of=(), any_of=()):
+    """IDs matching every clause in `all_of` and at least one in `any_of`.
+
+    Clauses are (field, value, min_pct) tuples, e.g. ("item", "Choice Scarf", 20).
+    Shortest postings are intersected first.
+    """
+    result = None
+    for ids in sorted((postings(attribute_index, *clause) for clause in all_of), key=len):
+        result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        if not result.size:
+            return result
+    if any_of:
+        union = np.unique(np.concatenate([postings(attribute_index, *clause) for clause in any_of]))
+        result = union if result is None else np.intersect1d(result, union, assume_unique=True)
+    return np.empty(0, dtype=np.int32) if result is None else result
+
+def usage_of(attribute_index, field, value, ids):
+    """Usage % of `value` for each ID in `ids` (0 where it is not run)."""
+    postings_field = attribute_index[field]
+    ids = np.asarray(ids)
+    out = np.zeros(len(ids), dtype=np.float32)
+    k = postings_field['lookup'].get(value)
+    if k is None:
+        return out
+    start, end = postings_field['ptr'][k], postings_field['ptr'][k + 1]
+    posting_ids = postings_field['ids'][start:end]
+    if not posting_ids.size:
+        return out
+    found = np.minimum(np.searchsorted(posting_ids, ids), len(posting_ids) - 1)
+    hit = posting_ids[found] == ids
+    out[hit] = postings_field['pct'][start:end][found[hit]]
+    return out
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.attribute_index
+    import json
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    attribute_index = build_attribute_index(data)
+    save_attribute_index(attribute_index)
+    attribute_index = load_attribute_index()
+    names = attribute_index['names']
+    scarf = search(attribute_index, all_of=[('item', 'Choice Scarf', 20)])
+    print("Choice Scarf above 20%:", [names[i] for i in scarf[:10]])
+    rocks = search(attribute_index, all_of=[('move', 'Stealth Rock', 0)], any_of=[('tera', 'Water', 10), ('tera', 'Fairy', 10)])
+    print("Stealth Rock with Water or Fairy Tera:", [names[i] for i in rocks[:10]])
+    start = time.perf_counter()
+    for _ in range(10000):
+        search(attribute_index, all_of=[('move', 'Stealth Rock', 10), ('item', 'Leftovers', 5)])
+    print(f"{(time.perf_counter() - start) / 10000 * 1e6:.1f} us per query")
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+import numpy as np
+
+class MicroBatcher:
+    """Collect concurrent requests for a short window and run them as one batched call.
+
+    `predict_batch` takes a list of requests and returns a list of results in the
+    same order (e.g. `recommend_moves` from forest_inference.build_batch_predictor).
+    Callers block in `submit` while a single worker thread drains the queue.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=32, max_wait_ms=5.0, latency_window=10000):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Metrics
+        self._metrics_lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self._queue_latencies = deque(maxlen=latency_window)
+        self._batch_latencies = deque(maxlen=latency_window)
+
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit_async(self, request):
+        """Queue a request and return a Future for its result."""
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._pending.append((request, future, time.perf_counter()))
+            self._cond.notify()
+        return future
+
+    def submit(self, request, timeout=None):
+        """Queue a request and wait for its result."""
+        return self.submit_async(request).result(timeout)
+
+    def close(self):
+        """Stop the worker after the queued requests have been served."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Wait up to max_wait after the first request for others to join
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(size)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            requests = [request for request, _, _ in batch]
+            try:
+                results = self.predict_batch(requests)
+                error = None
+            except Exception as e:
+                results, error = None, e
+            finished = time.perf_counter()
+
+            with self._metrics_lock:
+                self.batch_sizes[len(batch)] += 1
+                self._batch_latencies.append(finished - started)
+                self._queue_latencies.extend(started - queued for _, _, queued in batch)
+
+            for i, (_, future, _) in enumerate(batch):
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+
+    def metrics(self):
+        """Batch-size distribution and queue / batch latency percentiles in milliseconds."""
+        with self._metrics_lock:
+            sizes = dict(sorted(self.batch_sizes.items()))
+            queue = np.array(self._queue_latencies) * 1000.0
+            predict = np.array(self._batch_latencies) * 1000.0
+        n_batches = sum(sizes.values())
+        n_requests = sum(size * count for size, count in sizes.items())
+
+        def percentiles(values):
+            if len(values) == 0:
+                return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(values.max())}
+
+        return {
+            'batches': n_batches,
+            'requests': n_requests,
+            'mean_batch_size': n_requests / n_batches if n_batches else 0.0,
+            'batch_size_distribution': sizes,
+            'queue_latency_ms': percentiles(queue),
+            'batch_latency_ms': percentiles(predict),
+        }
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.batch_server
+    from concurrent.futures import ThreadPoolExecutor
+
+    def predict_batch(requests):
+        # Stand-in for a forest predict: a fixed cost per call plus a small cost per row
+        time.sleep(0.02 + 0.0005 * len(requests))
+        return [a * b for a, b in requests]
+
+    batcher = MicroBatcher(predict_batch, max_batch_size=32, max_wait_ms=5.0)
+    with ThreadPoolExecutor(max_workers=16) as callers:
+        start = time.perf_counter()
+        results = list(callers.map(lambda i: batcher.submit((i, i)), range(400)))
+        seconds = time.perf_counter() - start
+    batcher.close()
+    assert results == [i * i for i in range(400)]
+    metrics = batcher.metrics()
+    print(f"400 requests from 16 threads in {seconds * 1000:.0f} ms "
+          f"({metrics['batches']} batches, mean size {metrics['mean_batch_size']:.1f}); "
+          f"one predict per request, back to back, takes about {400 * 20.5:.0f} ms")
+    print("queue latency ms:", {k: round(v, 1) for k, v in metrics['queue_latency_ms'].items()})
@@ -0,0 +1,125 @@
+import numpy as np
+from scipy import sparse
+from components.interning import COUNTER_STATS, SECTIONS, intern_months
+
+# All rating cutoffs (brackets) of one month side by side. Every bracket is
+# interned into the global vocabularies of interning.py, so each bracket is a
+# set of sparse (Pokemon x value) matrices over the same ID columns as any
+# other interned month. Battle-count-weighted aggregates across brackets are
+# sparse sums of those matrices, with no re-parsing.
+
+WEIGHTED = 'weighted'
+USAGE_FIELDS = ('Abilities', 'Items', 'Spreads', 'Moves', 'Tera Types')
+COUNTER_FIELDS = ('Score', 'Stdev', 'KOed', 'Switched Out')
+
+# --- Store ---
+def _as_float64(values):
+    # Interned percentages are float32; their shortest decimal form is the value the JSON had
+    return values.astype(str).astype(np.float64)
+
+def _section_matrix(month, section, values, shape):
+    """CSR (Pokemon ID x value ID) from an interned month's (ptr, ids) section."""
+    rows = np.repeat(month['pokemon'], np.diff(section['ptr']))
+    return sparse.csr_matrix((values, (rows, section['ids'])), shape=shape)
+
+def build_bracket_store(entries_by_cutoff, vocab=None):
+    """Intern every bracket's entries ({cutoff: entries}) and keep each as sparse matrices.
+
+    Names are interned with interning.intern_months into `vocab` (a new
+    vocabulary by default), so row and column IDs are the global Pokemon / move
+    / item / ... IDs. Each bracket gets: raw (N,) Raw Count, viability (N,)
+    Viability Ceiling (NaN where missing), a CSR matrix per usage field
+    (Pokemon x value %), Teammates (Pokemon x Pokemon %) and one CSR per Checks
+    and Counters statistic (threat x counter).
+    """
+    cutoffs = sorted(entries_by_cutoff)
+    months, vocab = intern_months({cutoff: entries_by_cutoff[cutoff] for cutoff in cutoffs}, vocab)
+    names = vocab['pokemon']['names']
+    n = len(names)
+    store = {
+        'cutoffs': cutoffs,
+        'vocab': vocab,
+        'names': names,
+        'index': vocab['pokemon']['ids'],
+        'raw': np.zeros((len(cutoffs), n)),
+        'viability': np.full((len(cutoffs), n), np.nan),
+        'matrices': [],
+        '_entries': {},
+    }
+    for b, cutoff in enumerate(cutoffs):
+        month = months[cutoff]
+        store['raw'][b, month['pokemon']] = month['raw']
+        store['viability'][b, month['pokemon']] = month['viability']
+        matrices = {}
+        for field in USAGE_FIELDS + ('Teammates',):
+            width = len(vocab[SECTIONS[field]]['names'])
+            matrices[field] = _section_matrix(month, month[field], _as_float64(month[field]['pct']), (n, width))
+        counters = month['Checks and Counters']
+        for field in COUNTER_FIELDS:
+            # Missing statistics (e.g. no KOed / Switched Out split in chaos files) count as 0
+            matrices[field] = _section_matrix(month, counters, np.nan_to_num(_as_float64(counters[COUNTER_STATS[field]])), (n, n))
+        store['matrices'].append(matrices)
+    return store
+
+def _bracket_arrays(store, bracket):
+    if bracket == WEIGHTED:
+        return weighted_aggregate(store)
+    if bracket not in store['cutoffs']:
+        raise KeyError(f"No data for cutoff {bracket}; available: {store['cutoffs']}")
+    b = store['cutoffs'].index(bracket)
+    return store['raw'][b], store['viability'][b], store['matrices'][b]
+
+def weighted_aggregate(store):
+    """Raw counts summed over brackets; every percentage averaged with each bracket's Raw Count as weight."""
+    raw = store['raw']
+    total = raw.sum(axis=0)
+    scale = sparse.diags(np.divide(1.0, total, out=np.zeros_like(total), where=total > 0))
+    matrices = {}
+    for field in store['matrices'][0]:
+        weighted = sum(sparse.diags(raw[b]) @ store['matrices'][b][field] for b in range(len(store['cutoffs'])))
+        matrices[field] = (scale @ weighted).tocsr()
+    present = ~np.isnan(store['viability'])
+    weights = np.where(present, raw, 0.0)
+    viability = np.divide((np.nan_to_num(store['viability']) * weights).sum(axis=0), weights.sum(axis=0),
+                          out=np.full(len(total), np.nan), where=weights.sum(axis=0) > 0)
+    return total, viability, matrices
+
+# --- Queries ---
+def _row_dict(matrix, i, labels):
+    start, end = matrix.indptr[i], matrix.indptr[i + 1]
+    cols, values = matrix.indices[start:end], matrix.data[start:end]
+    order = np.argsort(-values, kind='stable')
+    return {labels[cols[k]]: float(values[k]) for k in order}
+
+def bracket_entries(store, bracket=0):
+    """Entries in the gen9ou_full_data.json layout for one cutoff (or WEIGHTED), cached per bracket."""
+    if bracket in store['_entries']:
+        return store['_entries'][bracket]
+    raw, viability, matrices = _bracket_arrays(store, bracket)
+    names = store['names']
+    entries = []
+    for i in np.argsort(-raw, kind='stable'):
+        if raw[i] <= 0:
+            continue
+        entry = {"Pokemon": names[i], "Raw Count": int(round(raw[i]))}
+        if not np.isnan(viability[i]):
+            entry["Viability Ceiling"] = int(round(viability[i]))
+        for field in USAGE_FIELDS:
+            entry[field] = _row_dict(matrices[field], i, store['vocab'][SECTIONS[field]]['names'])
+        entry["Teammates"] = _row_dict(matrices['Teammates'], i, names)
+        stats = {field: matrices[field].getrow(i).toarray().ravel() for field in COUNTER_FIELDS}
+        listed = np.flatnonzero(stats['Score'])
+        entry["Checks and Counters"] = [
+            {"Name": names[j], **{field: float(stats[field][j]) for field in COUNTER_FIELDS}}
+            for j in listed[np.argsort(-stats['Score'][listed], kind='stable')]
+        ]
+        entries.append(entry)
+    store['_entries'][bracket] = entries
+    return entries
+
+def bracket_options(store):
+    """Dropdown options: each available cutoff, plus the weighted aggregate when there is more than one."""
+    options = [{'label': f"{cutoff}+" if cutoff else "All ratings (0+)", 'value': cutoff} for cutoff in store['cutoffs']]
+    if len(store['cutoffs']) > 1:
+        options.append({'label': "All brackets (weighted)", 'value': WEIGHTED})
+    return options
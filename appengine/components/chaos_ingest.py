@@ -0,0 +1,271 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from components.compressed_io import open_text
+from components.interning import intern_entries, new_vocabulary, concat_interned
+from components.usage_trends import TRENDS_DIR, ingest_month
+
+# Streaming reader for Smogon "chaos" JSON files ({"info": {...}, "data":
+# {name: stats, ...}}, hundreds of MB per format-month). The file is read in
+# fixed-size chunks and each Pokemon under "data" is decoded on its own, so
+# memory is bounded by the chunk size and the largest single entry (capped at
+# MAX_ENTRY_SIZE), never the whole document. Entries are mapped to the schema
+# parse_all_pokemon produces for the text dumps and interned batch by batch.
+
+CHUNK_SIZE = 1 << 20
+BATCH_SIZE = 256
+MAX_ENTRY_SIZE = 64 << 20  # characters; a longer value is treated as a malformed file
+SECTIONS = ('Abilities', 'Items', 'Spreads', 'Moves', 'Tera Types', 'Teammates')
+_WHITESPACE = ' \t\n\r'
+_CUT_OFF_TAIL = 6  # a literal, number or \uXXXX escape cut off by the buffer end fails this close to it
+
+# --- Reader ---
+class _ChunkedText:
+    """A text file read in chunks, with JSON values decoded in place from a sliding buffer."""
+
+    def __init__(self, f, chunk_size, max_entry_size=MAX_ENTRY_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.max_entry_size = max_entry_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, at_least=0):
+        """Read at least one chunk and `at_least` characters; False at the end of the file."""
+        # Chunks are collected in a list and joined once with the unconsumed
+        # rest, which also drops the consumed prefix
+        chunks, size = [self.buffer[self.pos:]], 0
+        while size == 0 or size < at_least:
+            chunk = self.f.read(self.chunk_size)
+            if not chunk:
+                self.eof = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        if size:
+            self.buffer = ''.join(chunks)
+            self.pos = 0
+        return size > 0
+
+    def _cut_off(self, error):
+        # Only an error at the end of the buffer can be fixed by reading more;
+        # an unterminated string is reported at its opening quote
+        return error.msg.startswith('Unterminated string') or len(self.buffer) - error.pos <= _CUT_OFF_TAIL
+
+    def peek(self):
+        """Next non-whitespace character (consumed whitespace is skipped)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of chaos JSON file")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more chunks while it is cut off."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if self.eof or not self._cut_off(error):
+                    raise
+                pending = len(self.buffer) - self.pos
+                if pending >= self.max_entry_size:
+                    raise ValueError(f"A chaos JSON value is longer than {self.max_entry_size} characters") from error
+                # Read as much again as is pending, so a long value is re-decoded only O(log n) times
+                if self._fill(pending):
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """(key, reader) for each member of the object starting here; the caller must consume each value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key, self
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+def iter_chaos_file(path, chunk_size=CHUNK_SIZE):
+    """Yield ('info', info_dict) and then (name, stats) for every Pokemon under "data", one at a time.
+
+    `path` may be gzip / bzip2 / xz / zstd compressed; it is decompressed as it is read.
+    """
+    with open_text(path) as f:
+        reader = _ChunkedText(f, chunk_size)
+        for key, _ in reader.members():
+            if key == 'data':
+                for name, _ in reader.members():
+                    yield name, reader.value()
+            else:
+                value = reader.value()
+                if key == 'info':
+                    yield 'info', value
+
+# --- Schema ---
+def _percentages(weights, total):
+    # Rows below 0.0005% are dropped before sorting, as the text dumps never list 0.000%
+    floor = total * 5e-6
+    kept = sorted(((w, key) for key, w in weights.items() if w >= floor), reverse=True)
+    scale = 100.0 / total
+    return {key: round(w * scale, 3) for w, key in kept}
+
+def normalize_chaos_entry(name, stats):
+    """Map one chaos entry to the dict layout parse_all_pokemon produces.
+
+    Every section becomes percentages of the Pokemon's total ability weight
+    (Moves therefore sum to ~400, as in the text dumps); the long tail is not
+    folded into an "Other" row. Checks and Counters keep Score / Stdev from (n, p, stdev), with
+    the score glued to the name like the text dumps; chaos files carry no
+    KOed / Switched Out split, so those are None.
+    """
+    total = sum(stats.get('Abilities', {}).values()) or 1.0
+    entry = {"Pokemon": name, "Raw Count": int(stats.get('Raw count', 0))}
+    ceiling = stats.get('Viability Ceiling')
+    if ceiling:
+        entry["Viability Ceiling"] = int(ceiling[1])
+    for section in SECTIONS:
+        entry[section] = _percentages(stats.get(section, {}), total)
+    counters = []
+    for counter, (_, p, stdev) in stats.get('Checks and Counters', {}).items():
+        counters.append({
+            "Name": f"{counter} {100.0 * (p - 4 * stdev):.3f}",
+            "Score": round(100.0 * p, 2),
+            "Stdev": round(100.0 * stdev, 2),
+            "KOed": None,
+            "Switched Out": None,
+        })
+    entry["Checks and Counters"] = sorted(counters, key=lambda c: c["Score"] - 4 * c["Stdev"], reverse=True)
+    return entry
+
+def iter_chaos_entries(path, chunk_size=CHUNK_SIZE):
+    """(info, generator of normalized entries) for a chaos file; the info block precedes "data" in Smogon's files."""
+    stream = iter_chaos_file(path, chunk_size)
+    first = next(stream, None)
+    info = first[1] if first and first[0] == 'info' else {}
+
+    def entries():
+        if first and first[0] != 'info':
+            yield normalize_chaos_entry(*first)
+        for name, stats in stream:
+            if name != 'info':
+                yield normalize_chaos_entry(name, stats)
+    return info, entries()
+
+# --- Ingest ---
+def ingest_chaos(path, month, store_dir=TRENDS_DIR, vocab=None, batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE):
+    """Stream a chaos file into the month partition of the trends store and an interned month.
+
+    Entries are interned `batch_size` at a time, so peak memory is the read
+    buffer, one batch of dicts and the compact arrays. Returns
+    (interned month, vocab, info).
+    """
+    vocab = vocab if vocab is not None else new_vocabulary()
+    info, entries = iter_chaos_entries(path, chunk_size)
+    parts, batch = [], []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) == batch_size:
+            parts.append(intern_entries(batch, vocab))
+            batch = []
+    if batch:
+        parts.append(intern_entries(batch, vocab))
+    month_arrays = concat_interned(parts)
+
+    # The trends partition needs usage share and rank; raw counts sum to six per team
+    names = vocab['pokemon']['names']
+    raw = month_arrays['raw']
+    usage = pd.DataFrame({'Pokemon': [names[i] for i in month_arrays['pokemon']], 'Raw Count': raw,
+                          'Usage %': 100.0 * raw / max(raw.sum(), 1) * 6})
+    usage = usage.sort_values('Raw Count', ascending=False, kind='stable')
+    usage['Rank'] = np.arange(1, len(usage) + 1)
+    viability = {names[i]: v for i, v in zip(month_arrays['pokemon'], month_arrays['viability']) if not np.isnan(v)}
+    ingest_month(month, usage, store_dir, viability=viability)
+    return month_arrays, vocab, info
+
+# --- Synthetic data ---
+def write_synthetic_chaos(path, target_mb, entries, extra_spreads=2000, seed=0):
+    """Write a chaos-format file of about `target_mb` MB by cycling renamed copies of `entries` (JSON-layout dicts).
+
+    Each copy also gets `extra_spreads` rare EV spreads, since the long tail
+    of spreads is what makes real chaos entries large.
+    """
+    rng = np.random.default_rng(seed)
+    natures = ['Adamant', 'Bold', 'Calm', 'Careful', 'Impish', 'Jolly', 'Modest', 'Timid']
+    evs = rng.choice(np.arange(0, 256, 4), size=(4 * extra_spreads + 1, 6))
+    pool = [f"{natures[k % len(natures)]}:{'/'.join(map(str, row))}" for k, row in enumerate(evs)]
+    target = target_mb * 1e6
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        header = '{"info": {"metagame": "gen9ou", "cutoff": 0, "number of battles": 0}, "data": {'
+        f.write(header)
+        written += len(header)
+        k = 0
+        while written < target:
+            p = entries[k % len(entries)]
+            counters = p["Checks and Counters"] if isinstance(p["Checks and Counters"], list) else []
+            stats = {
+                "Raw count": p["Raw Count"],
+                "Viability Ceiling": [p["Raw Count"], p.get("Viability Ceiling", 0), 0, 0],
+                **{section: {key: pct * p["Raw Count"] / 100.0 for key, pct in p[section].items()}
+                   for section in SECTIONS if isinstance(p.get(section), dict)},
+                "Checks and Counters": {c["Name"].rsplit(" ", 1)[0]: [1000.0, (c["Score"] or 0) / 100.0,
+                                                                        (c["Stdev"] or 0) / 100.0]
+                                        for c in counters},
+            }
+            offset = (k * 7919) % (len(pool) - extra_spreads)
+            for r, spread in enumerate(pool[offset:offset + extra_spreads]):
+                stats["Spreads"].setdefault(spread, p["Raw Count"] * 1e-5 / (r + 1))
+            text = ('' if k == 0 else ', ') + json.dumps(f"{p['Pokemon']}-{k // len(entries)}") + ': ' + json.dumps(stats)
+            f.write(text)
+            written += len(text)
+            k += 1
+        f.write('}}')
+    return k
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.chaos_ingest [size_mb]
+    import resource
+    import sys
+    import tempfile
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        source = json.load(f)
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, "gen9ou-0.json")
+    n = write_synthetic_chaos(path, size_mb, source)
+    del source
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    start = time.perf_counter()
+    month, vocab, info = ingest_chaos(path, "2099-01", store_dir=os.path.join(work_dir, "trends"))
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    megabytes = os.path.getsize(path) / 1e6
+    print(f"{megabytes:.0f} MB, {n} Pokemon ({info['metagame']}): {seconds:.1f} s, "
+          f"{megabytes / seconds:.1f} MB/s, {n / seconds:,.0f} entries/s")
+    print(f"Peak RSS {peak:.0f} MB (before ingest: {baseline:.0f} MB); "
+          f"interned month {sum(a.nbytes for v in month.values() for a in (v.values() if isinstance(v, dict) else [v])) / 1e6:.0f} MB")
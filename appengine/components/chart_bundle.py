@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+import json
+import numpy as np
+from flask import Response
+from components.interning import intern_months
+
+# Compact per-Pokemon move and counter arrays for the recommender charts,
+# shipped to the browser once and drawn there by clientside callbacks
+# (assets/recommender_charts.js). The layout is the interned month from
+# interning.py: name vocabularies plus CSR (ptr, ids, values) arrays, with
+# percentages rounded to 2 decimals. The JSON is served gzipped with a
+# content-hash ETag, so a revisit costs a 304 until the data changes.
+
+DECIMALS = 2
+
+def _rounded(values):
+    return np.round(values.astype(np.float64), DECIMALS).tolist()
+
+def build_chart_bundle(entries):
+    """Bundle dict for a list of gen9ou_full_data.json entries."""
+    months, vocab = intern_months({'current': entries})
+    month = months['current']
+    moves, counters = month['Moves'], month['Checks and Counters']
+    return {
+        'pokemon': vocab['pokemon']['names'],
+        'moveNames': vocab['move']['names'],
+        'rows': month['pokemon'].tolist(),
+        'moves': {'ptr': moves['ptr'].tolist(), 'ids': moves['ids'].tolist(), 'pct': _rounded(moves['pct'])},
+        'counters': {'ptr': counters['ptr'].tolist(), 'ids': counters['ids'].tolist(),
+                     'koed': _rounded(counters['koed']), 'switched': _rounded(counters['switched_out'])},
+    }
+
+def encode_bundle(bundle):
+    """{'etag', 'json', 'gzip'}: the bundle as minified JSON, its SHA-256 prefix and a gzipped copy."""
+    body = json.dumps(bundle, separators=(',', ':')).encode('utf-8')
+    return {
+        'etag': hashlib.sha256(body).hexdigest()[:16],
+        'json': body,
+        'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+    }
+
+def bundle_response(encoded, request):
+    """Flask response for an encoded bundle: 304 when the browser's copy is current, gzipped when accepted."""
+    if encoded['etag'] in request.if_none_match:
+        response = Response(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(encoded['gzip'], mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(encoded['json'], mimetype='application/json')
+    response.set_etag(encoded['etag'])
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Cache, but revalidate every time so a reloaded dataset is picked up
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.chart_bundle
+    import plotly.io as pio
+    from components.pokemon_move_recommender import get_pokemon_info
+    from components.visualizations import create_move_usage_graph, create_counter_graph
+    with open('components/data/gen9ou_full_data.json', 'r') as f:
+        entries = json.load(f)
+    encoded = encode_bundle(build_chart_bundle(entries))
+
+    # What the page sent per request before: two server-built figures
+    per_request = [len(pio.to_json(create_move_usage_graph(info['moves'], p['Pokemon'])))
+                   + len(pio.to_json(create_counter_graph(info['counters'], p['Pokemon'])))
+                   for p in entries for info in [get_pokemon_info(p['Pokemon'], entries)]]
+    print(f"{len(entries)} Pokemon: bundle {len(encoded['json']) / 1e3:.0f} kB JSON, "
+          f"{len(encoded['gzip']) / 1e3:.0f} kB gzipped, ETag {encoded['etag']}")
+    print(f"server-built figures: {np.mean(per_request) / 1e3:.1f} kB per request on average")
@@ -0,0 +1,93 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import time
+
+# Transparent reading of compressed Smogon dumps and CSVs. The codec is taken
+# from the file's magic bytes (falling back to the extension), and the data is
+# decompressed as a stream, so archives never need to be unpacked to disk.
+# .zst needs the optional zstandard package; the other codecs are stdlib.
+
+MAGIC = {
+    b'\x1f\x8b': 'gz',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x28\xb5\x2f\xfd': 'zst',
+}
+EXTENSIONS = ('gz', 'bz2', 'xz', 'zst')
+
+def detect_compression(path):
+    """'gz', 'bz2', 'xz', 'zst' or None for plain files."""
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, codec in MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    extension = path.rsplit('.', 1)[-1].lower()
+    return extension if extension in EXTENSIONS else None
+
+def find_input(path):
+    """`path` if it exists, otherwise the first of path.gz / .bz2 / .xz / .zst that does."""
+    if os.path.exists(path):
+        return path
+    for extension in EXTENSIONS:
+        candidate = f"{path}.{extension}"
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f"{path} (or a compressed copy of it) not found")
+
+def open_binary(path):
+    """Binary file object for `path` that decompresses on the fly."""
+    codec = detect_compression(path)
+    if codec == 'gz':
+        return gzip.open(path, 'rb')
+    if codec == 'bz2':
+        return bz2.open(path, 'rb')
+    if codec == 'xz':
+        return lzma.open(path, 'rb')
+    if codec == 'zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f"Reading {path} needs the zstandard package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+def open_text(path, encoding='utf-8', newline=None):
+    """Text file object for a plain or compressed file; a compressed copy is used when `path` itself is missing."""
+    return io.TextIOWrapper(open_binary(find_input(path)), encoding=encoding, newline=newline)
+
+def read_text(path, encoding='utf-8'):
+    """Whole contents of a plain or compressed text file."""
+    with open_text(path, encoding=encoding) as f:
+        return f.read()
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.compressed_io [path/to/dump.txt]
+    import sys
+    import tempfile
+    source = sys.argv[1] if len(sys.argv) > 1 else '../pokemon_analysis/json parsing/data/gen9ou-0.txt'
+    with open(source, 'rb') as f:
+        raw = f.read()
+    work_dir = tempfile.mkdtemp()
+    writers = {'txt': lambda data: data, 'gz': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+    try:
+        import zstandard
+        writers['zst'] = zstandard.ZstdCompressor(level=10).compress
+    except ImportError:
+        print("zstandard not installed; skipping .zst")
+
+    print(f"{'format':<8}{'on disk (MB)':>14}{'ratio':>8}{'read + decode (s)':>20}")
+    for extension, compress in writers.items():
+        path = os.path.join(work_dir, f"dump.{extension}")
+        with open(path, 'wb') as f:
+            f.write(compress(raw))
+        start = time.perf_counter()
+        for _ in range(10):
+            text = read_text(path)
+        seconds = (time.perf_counter() - start) / 10
+        assert len(text) == len(raw.decode('utf-8'))
+        size = os.path.getsize(path)
+        print(f"{extension:<8}{size / 1e6:>14.2f}{len(raw) / size:>8.1f}{seconds:>20.3f}")
@@ -3,6 +3,13 @@ import json
 from google.cloud import storage
 import io
 import os
+from components.interning import intern_months
+
+# orjson decodes the moveset JSON several times faster; the stdlib decoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 USE_GCS = os.environ.get('USE_GCS', '0') == '1'  # Default: use local files
 BUCKET_NAME = 'cs163-group11.appspot.com'
@@ -10,6 +17,33 @@ POKEMON_BLOB = 'Pokemon.csv'
 GEN9OU_BLOB = 'gen9ou_full_data.json'
 POKEMON_LOCAL = 'components/data/Pokemon.csv'
 GEN9OU_LOCAL = 'components/data/gen9ou_full_data.json'
+# Rating cutoffs published by Smogon; cutoff 0 is the existing gen9ou_full_data.json
+CUTOFFS = (0, 1500, 1695, 1825)
+
+def cutoff_file(cutoff):
+    """File name of the parsed moveset data for one rating cutoff."""
+    return GEN9OU_BLOB if cutoff == 0 else f'gen9ou-{cutoff}_full_data.json'
+
+def decode_json(content):
+    """Decode JSON bytes with orjson when it is installed, else the json module."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def project_entries(data, fields=None):
+    """Keep only `fields` of each entry (all fields when None), so unused nested dicts can be freed."""
+    if fields is None:
+        return data
+    return [{field: entry[field] for field in fields if field in entry} for entry in data]
+
+def gen9ou_frame(data):
+    """Pokemon / Viability / Teammates DataFrame built from column lists."""
+    pokemon, viability, teammates = [], [], []
+    for entry in data:
+        pokemon.append(entry['Pokemon'])
+        viability.append(entry.get('Viability Ceiling', 0))
+        teammates.append(' '.join(entry.get('Teammates', {})))
+    return pd.DataFrame({'Pokemon': pokemon, 'Viability': viability, 'Teammates': teammates})
 
 def get_generation_to_region_mapping():
     return {
@@ -34,21 +68,35 @@ if USE_GCS:
         client = storage.Client()
         bucket = client.bucket(BUCKET_NAME)
         blob = bucket.blob(GEN9OU_BLOB)
-        content = blob.download_as_string()
-        data = json.loads(content)
-        
-        rows = []
-        for entry in data:
-            pokemon = entry['Pokemon']
-            viability = entry.get('Viability Ceiling', 0)
-            teammates = entry.get('Teammates', {})
-            teammate_list = [teammate for teammate in teammates.keys()]
-            rows.append({
-                'Pokemon': pokemon,
-                'Viability': viability,
-                'Teammates': ' '.join(teammate_list)
-            })
-        return pd.DataFrame(rows)
+        return gen9ou_frame(decode_json(blob.download_as_string()))
+
+    def load_gen9ou_entries(fields=None):
+        """Load the Gen 9 OU entries (one dict per Pokemon, only `fields` if given) from GCS bucket."""
+        client = storage.Client()
+        bucket = client.bucket(BUCKET_NAME)
+        blob = bucket.blob(GEN9OU_BLOB)
+        return project_entries(decode_json(blob.download_as_string()), fields)
+
+    def load_gen9ou_cutoffs(fields=None):
+        """Load the entries (only `fields` if given) of every rating cutoff present in the GCS bucket, as {cutoff: entries}."""
+        client = storage.Client()
+        bucket = client.bucket(BUCKET_NAME)
+        entries = {}
+        for cutoff in CUTOFFS:
+            blob = bucket.blob(cutoff_file(cutoff))
+            if blob.exists():
+                entries[cutoff] = project_entries(decode_json(blob.download_as_string()), fields)
+        return entries
+
+    def dataset_version(names):
+        """(blob name, generation) for each named blob; a new upload gets a new generation."""
+        client = storage.Client()
+        bucket = client.bucket(BUCKET_NAME)
+        version = []
+        for name in names:
+            blob = bucket.get_blob(name)
+            version.append((name, blob.generation if blob is not None else None))
+        return tuple(version)
 
     def save_pokemon_data(df):
         """Save Pokemon data to GCS bucket."""
@@ -75,21 +123,34 @@ else:
 
     def load_gen9ou_data():
         """Load Gen 9 OU data from local file."""
-        with open(GEN9OU_LOCAL, 'r') as f:
-            data = json.load(f)
-        
-        rows = []
-        for entry in data:
-            pokemon = entry['Pokemon']
-            viability = entry.get('Viability Ceiling', 0)
-            teammates = entry.get('Teammates', {})
-            teammate_list = [teammate for teammate in teammates.keys()]
-            rows.append({
-                'Pokemon': pokemon,
-                'Viability': viability,
-                'Teammates': ' '.join(teammate_list)
-            })
-        return pd.DataFrame(rows)
+        with open(GEN9OU_LOCAL, 'rb') as f:
+            return gen9ou_frame(decode_json(f.read()))
+
+    def load_gen9ou_entries(fields=None):
+        """Load the Gen 9 OU entries (one dict per Pokemon, only `fields` if given) from local file."""
+        with open(GEN9OU_LOCAL, 'rb') as f:
+            return project_entries(decode_json(f.read()), fields)
+
+    def load_gen9ou_cutoffs(fields=None):
+        """Load the entries (only `fields` if given) of every rating cutoff present locally, as {cutoff: entries}."""
+        entries = {}
+        for cutoff in CUTOFFS:
+            path = os.path.join(os.path.dirname(GEN9OU_LOCAL), cutoff_file(cutoff))
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    entries[cutoff] = project_entries(decode_json(f.read()), fields)
+        return entries
+
+    def dataset_version(names):
+        """(file name, mtime_ns, size) for each named data file, with None for missing files."""
+        version = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(os.path.dirname(GEN9OU_LOCAL), name))
+                version.append((name, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append((name, None, None))
+        return tuple(version)
 
     def save_pokemon_data(df):
         """Save Pokemon data to local file."""
@@ -98,4 +159,49 @@ else:
     def save_gen9ou_data(df):
         """Save Gen 9 OU data to local file."""
         with open(GEN9OU_LOCAL, 'w') as f:
-            json.dump(df.to_dict('records'), f, indent=2) 
\ No newline at end of file
+            json.dump(df.to_dict('records'), f, indent=2)
+
+def load_gen9ou_interned(label='current'):
+    """Gen 9 OU entries with every name stored as an integer ID: ({label: month arrays}, vocab decode table)."""
+    return intern_months({label: load_gen9ou_entries()})
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.data_loader
+    import time
+    import tracemalloc
+
+    def previous_loader():
+        # The loader before the column-list / orjson path, for comparison
+        with open(GEN9OU_LOCAL, 'r') as f:
+            data = json.load(f)
+        rows = [{'Pokemon': e['Pokemon'], 'Viability': e.get('Viability Ceiling', 0),
+                 'Teammates': ' '.join(e.get('Teammates', {}))} for e in data]
+        return pd.DataFrame(rows)
+
+    def timed(fn, repeat=20):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = fn()
+        return (time.perf_counter() - start) / repeat * 1000, result
+
+    old_ms, old_df = timed(previous_loader)
+    new_ms, new_df = timed(load_gen9ou_data)
+    assert old_df.equals(new_df)
+    print(f"load_gen9ou_data: {old_ms:.1f} ms -> {new_ms:.1f} ms ({'orjson' if orjson else 'json'})")
+
+    def previous_entries():
+        with open(GEN9OU_LOCAL, 'r') as f:
+            return json.load(f)
+
+    fields = ('Pokemon', 'Raw Count', 'Viability Ceiling', 'Moves', 'Checks and Counters')
+    loaders = (('json.load, all fields', previous_entries),
+               ('load_gen9ou_entries, all fields', load_gen9ou_entries),
+               ('load_gen9ou_entries, projected', lambda: load_gen9ou_entries(fields=fields)))
+    for label, loader in loaders:
+        ms, _ = timed(loader)
+        tracemalloc.start()
+        entries = loader()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del entries
+        print(f"{label}: {ms:.1f} ms, {held / 1e6:.1f} MB held")
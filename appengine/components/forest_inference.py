@@ -0,0 +1,201 @@
+import os
+import numpy as np
+
+# Only numpy is needed at serve time; the sklearn objects are read by attribute
+# in export_model, so this module never imports sklearn itself.
+EXPORT_PATH = os.path.join(os.path.dirname(__file__), 'models', 'pokemon_model.npz')
+TREE_LEAF = -1
+
+# --- Export ---
+def export_model(model, scaler, pca, feature_names):
+    """Flatten a fitted scaler, PCA and random forest into plain NumPy arrays."""
+    n_features = len(feature_names)
+    scale_mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+    scale_std = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+
+    components = np.asarray(pca.components_, dtype=np.float64)
+    if pca.whiten:
+        pca_scale = np.sqrt(pca.explained_variance_)
+        pca_scale[pca_scale < np.finfo(pca_scale.dtype).eps] = 1.0
+    else:
+        pca_scale = np.ones(components.shape[0])
+
+    # All trees are concatenated into one node table; child indices are
+    # shifted so they point into the flat arrays.
+    features, thresholds, lefts, rights = [], [], [], []
+    leaf_counts, leaf_classes, leaf_values = [], [], []
+    roots = []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        roots.append(offset)
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        is_leaf = left == TREE_LEAF
+        features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(tree.threshold.astype(np.float64))
+        lefts.append(np.where(is_leaf, TREE_LEAF, left + offset))
+        rights.append(np.where(is_leaf, TREE_LEAF, right + offset))
+
+        # Leaf class distributions are stored sparsely (CSR), normalised the
+        # same way DecisionTreeClassifier.predict_proba does.
+        values = tree.value[:, 0, :]
+        normalizer = values.sum(axis=1)
+        normalizer[normalizer == 0.0] = 1.0
+        proba = values / normalizer[:, None]
+        stored = (proba != 0.0) & is_leaf[:, None]
+        node_idx, class_idx = np.nonzero(stored)
+        leaf_classes.append(class_idx)
+        leaf_values.append(proba[node_idx, class_idx])
+        leaf_counts.append(stored.sum(axis=1))
+        offset += tree.node_count
+
+    return {
+        'feature_names': np.asarray(feature_names, dtype=str),
+        'classes': np.asarray(model.classes_, dtype=str),
+        'scaler_mean': np.asarray(scale_mean, dtype=np.float64),
+        'scaler_scale': np.asarray(scale_std, dtype=np.float64),
+        'pca_components': components,
+        'pca_offset': np.asarray(pca.mean_, dtype=np.float64) @ components.T,
+        'pca_scale': np.asarray(pca_scale, dtype=np.float64),
+        'tree_roots': np.asarray(roots, dtype=np.int64),
+        'node_feature': np.concatenate(features),
+        'node_threshold': np.concatenate(thresholds),
+        'node_left': np.concatenate(lefts),
+        'node_right': np.concatenate(rights),
+        'leaf_ptr': np.concatenate([[0], np.cumsum(np.concatenate(leaf_counts))]).astype(np.int64),
+        'leaf_class': np.concatenate(leaf_classes).astype(np.int32),
+        'leaf_value': np.concatenate(leaf_values).astype(np.float64),
+    }
+
+def save_exported_model(exported, path=EXPORT_PATH):
+    """Save exported arrays as an uncompressed .npz so loading is a plain read."""
+    np.savez(path, **exported)
+    print(f"Exported model saved to {path}")
+
+def load_exported_model(path=EXPORT_PATH):
+    """Load exported arrays from an .npz file."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Exported model not found at {path}. Run train_and_save_model.py first.")
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+# --- Inference ---
+def transform(exported, X):
+    """Apply the exported StandardScaler and PCA projection to a batch."""
+    X = np.asarray(X, dtype=np.float64)
+    scaled = (X - exported['scaler_mean']) / exported['scaler_scale']
+    # Same operation order as PCA.transform so the output matches bit for bit
+    projected = scaled @ exported['pca_components'].T
+    projected -= exported['pca_offset']
+    projected /= exported['pca_scale']
+    return projected
+
+def apply_trees(exported, X):
+    """Return the leaf node reached in every tree for every row, shape (n_trees, n_rows)."""
+    # Trees compare float32 inputs against float64 thresholds, as sklearn does
+    X = np.asarray(X, dtype=np.float32)
+    n_rows = X.shape[0]
+    feature = exported['node_feature']
+    threshold = exported['node_threshold']
+    left = exported['node_left']
+    right = exported['node_right']
+
+    nodes = np.repeat(exported['tree_roots'][:, None], n_rows, axis=1)
+    rows = np.broadcast_to(np.arange(n_rows), nodes.shape)
+    active = left[nodes] != TREE_LEAF
+    while active.any():
+        current = nodes[active]
+        values = X[rows[active], feature[current]]
+        nodes[active] = np.where(values <= threshold[current], left[current], right[current])
+        active[active] = left[nodes[active]] != TREE_LEAF
+    return nodes
+
+def predict_proba(exported, X_pca):
+    """Average the leaf class distributions over all trees."""
+    leaves = apply_trees(exported, X_pca)
+    n_trees, n_rows = leaves.shape
+    proba = np.zeros((n_rows, len(exported['classes'])), dtype=np.float64)
+    ptr = exported['leaf_ptr']
+    # Accumulate tree by tree, in order, to reproduce sklearn's summation exactly
+    for t in range(n_trees):
+        starts = ptr[leaves[t]]
+        counts = ptr[leaves[t] + 1] - starts
+        first = np.cumsum(counts) - counts
+        row_idx = np.repeat(np.arange(n_rows), counts)
+        entry_idx = np.repeat(starts - first, counts) + np.arange(counts.sum())
+        proba[row_idx, exported['leaf_class'][entry_idx]] += exported['leaf_value'][entry_idx]
+    proba /= n_trees
+    return proba
+
+def predict(exported, X):
+    """Predict class labels for a batch of raw (unscaled) feature rows."""
+    proba = predict_proba(exported, transform(exported, X))
+    return exported['classes'][np.argmax(proba, axis=1)]
+
+# --- Prediction Function ---
+def build_batch_predictor(exported, pokemon_data, extract_features, pair_features=None):
+    """Build a recommender that scores many (pokemon_1, pokemon_2) pairs in one call.
+
+    `extract_features` is the per-Pokemon feature function used at training time,
+    and `pair_features` the optional "pair_" column function passed to train_model.
+    Pair rows are assembled in the exported feature order, so no DataFrame is needed.
+    """
+    # Feature names look like "p1_p1_move_1": the first prefix says which side
+    # of the pair the value comes from, the rest is the extract_features key.
+    columns = [name.split('_', 1) for name in exported['feature_names']]
+    index = {p["Pokemon"]: i for i, p in enumerate(pokemon_data)}
+    per_pokemon = [extract_features(p) for p in pokemon_data]
+    side_matrix = {
+        side: np.array([[f.get(key, 0) if s == side else 0 for s, key in columns] for f in per_pokemon],
+                       dtype=np.float64)
+        for side in ('p1', 'p2')
+    }
+    pair_columns = [(col, name) for col, name in enumerate(exported['feature_names']) if name.startswith('pair_')]
+    if pair_columns and pair_features is None:
+        raise ValueError("Exported model uses pair features; pass the pair_features function it was trained with.")
+
+    fallbacks = []
+    move_sets = []
+    for p in pokemon_data:
+        moves = p.get("Moves", {})
+        if isinstance(moves, str):
+            moves = {move: 1.0 for move in moves.split()}
+        move_sets.append(moves)
+        fallbacks.append(sorted(moves.items(), key=lambda x: x[1], reverse=True)[0][0] if moves else None)
+
+    def recommend_moves(pairs):
+        results = [None] * len(pairs)
+        valid, i1, i2 = [], [], []
+        for k, (pokemon_1_name, pokemon_2_name) in enumerate(pairs):
+            if pokemon_1_name not in index or pokemon_2_name not in index:
+                results[k] = f"Error: One of the Pokémon ('{pokemon_1_name}', '{pokemon_2_name}') not found."
+            else:
+                valid.append(k)
+                i1.append(index[pokemon_1_name])
+                i2.append(index[pokemon_2_name])
+        if not valid:
+            return results
+
+        X = side_matrix['p1'][i1] + side_matrix['p2'][i2]
+        if pair_columns:
+            for row, (p1_idx, p2_idx) in enumerate(zip(i1, i2)):
+                values = pair_features(pokemon_data[p1_idx], pokemon_data[p2_idx])
+                for col, name in pair_columns:
+                    X[row, col] = values.get(name, 0)
+        predictions = predict(exported, X)
+        for k, p1_idx, prediction in zip(valid, i1, predictions):
+            prediction = str(prediction)
+            if prediction not in move_sets[p1_idx]:
+                if fallbacks[p1_idx] is not None:
+                    results[k] = f"Recommended move: {fallbacks[p1_idx]}"
+                else:
+                    results[k] = "Recommended action: SWITCH"
+            else:
+                results[k] = f"Recommended move: {prediction}"
+        return results
+
+    def recommend_move(pokemon_1_name, pokemon_2_name):
+        return recommend_moves([(pokemon_1_name, pokemon_2_name)])[0]
+
+    return recommend_move, recommend_moves
@@ -0,0 +1,225 @@
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# Datasets and model artifacts that can change under a running server. Each
+# Reloadable holds one (version, value) snapshot. A watcher thread polls the
+# sources' versions (file mtimes locally, blob generations on GCS), builds the
+# new value off the request path and rebinds the snapshot in one assignment.
+# Callbacks read the snapshot once, so a request that started on the old
+# version finishes on it.
+
+RELOAD_INTERVAL = float(os.environ.get('HOT_RELOAD_INTERVAL', '60'))  # seconds; 0 disables the watcher
+
+def file_version(paths):
+    """(path, mtime_ns, size) for each path, with None for missing files."""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append((path, None, None))
+    return tuple(version)
+
+def directory_version(directory, suffix=''):
+    """file_version of every file in `directory` ending with `suffix`."""
+    if not os.path.isdir(directory):
+        return ()
+    return file_version(sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                               if name.endswith(suffix)))
+
+class Reloadable:
+    """A value built from versioned sources and swapped for a rebuilt one when they change.
+
+    `version()` must be cheap (it runs on every poll); `build()` may be slow.
+    `retire(old_value)` runs after a swap, e.g. to close a worker thread.
+    With `lazy=True` the first build happens on the first `get()`.
+    """
+
+    def __init__(self, name, version, build, retire=None, lazy=False, latency_window=100):
+        self.name = name
+        self.version = version
+        self.build = build
+        self.retire = retire
+        self._build_lock = threading.Lock()
+        self._snapshot = None
+
+        # Metrics
+        self.swaps = 0
+        self.last_swap = None
+        self.last_error = None
+        self._swap_latencies = deque(maxlen=latency_window)
+        self._build_seconds = deque(maxlen=latency_window)
+        if not lazy:
+            self._snapshot = self._load()
+
+    def _load(self):
+        version = self.version()
+        start = time.perf_counter()
+        value = self.build()
+        self._build_seconds.append(time.perf_counter() - start)
+        return version, value
+
+    def get(self):
+        """The current value; hold on to it for the whole request."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._build_lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                snapshot = self._snapshot
+        return snapshot[1]
+
+    def refresh(self):
+        """Rebuild and swap in the new value if the sources changed; True when a new version went live."""
+        with self._build_lock:
+            old = self._snapshot
+            if old is None:
+                return False  # lazy and never used: the first get() will load the latest version
+            version = self.version()
+            if version == old[0]:
+                return False
+            detected = time.perf_counter()
+            try:
+                value = self.build()
+            except Exception as e:
+                # Keep serving the old version; the next poll retries
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            built = time.perf_counter()
+            self._snapshot = (version, value)
+            swapped = time.perf_counter()
+            self.swaps += 1
+            self.last_swap = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self.last_error = None
+            self._build_seconds.append(built - detected)
+            self._swap_latencies.append(swapped - detected)
+        print(f"Reloaded {self.name} in {(swapped - detected) * 1000:.0f} ms")
+        if self.retire is not None:
+            self.retire(old[1])
+        return True
+
+    def metrics(self):
+        """Swap count and detection-to-live latency / build time percentiles in milliseconds."""
+        def percentiles(values):
+            values = np.array(values) * 1000.0
+            if len(values) == 0:
+                return {'p50': 0.0, 'max': 0.0}
+            return {'p50': float(np.percentile(values, 50)), 'max': float(values.max())}
+
+        return {
+            'loaded': self._snapshot is not None,
+            'swaps': self.swaps,
+            'last_swap': self.last_swap,
+            'last_error': self.last_error,
+            'swap_latency_ms': percentiles(self._swap_latencies),
+            'build_ms': percentiles(self._build_seconds),
+        }
+
+class HotReloader:
+    """Polls every registered Reloadable on one daemon thread."""
+
+    def __init__(self, interval=RELOAD_INTERVAL):
+        self.interval = interval
+        self._items = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, reloadable):
+        """Watch `reloadable` (starting the thread on first use) and return it."""
+        with self._lock:
+            self._items.append(reloadable)
+            if self.interval > 0 and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='hot-reloader', daemon=True)
+                self._thread.start()
+        return reloadable
+
+    def check_now(self):
+        """Poll every source once; returns the names that were swapped."""
+        with self._lock:
+            items = list(self._items)
+        swapped = []
+        for item in items:
+            try:
+                if item.refresh():
+                    swapped.append(item.name)
+            except Exception as e:
+                # A failing version() check must not stop the watcher
+                item.last_error = f"{type(e).__name__}: {e}"
+        return swapped
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check_now()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def metrics(self):
+        with self._lock:
+            return {item.name: item.metrics() for item in self._items}
+
+reloader = HotReloader()
+
+def reloadable(name, version, build, retire=None, lazy=False):
+    """Create a Reloadable watched by the shared reloader."""
+    return reloader.register(Reloadable(name, version, build, retire=retire, lazy=lazy))
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.hot_reload
+    import json
+    import shutil
+    import tempfile
+    from collections import Counter
+    from components.attribute_index import build_attribute_index, search
+
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, 'gen9ou_full_data.json')
+    shutil.copy('components/data/gen9ou_full_data.json', path)
+
+    def build():
+        with open(path, 'r') as f:
+            return build_attribute_index(json.load(f))
+
+    watcher = HotReloader(interval=0)
+    index = watcher.register(Reloadable('attribute_index', lambda: file_version([path]), build))
+    query = [('item', 'Choice Scarf', 20)]
+    before = len(search(index.get(), all_of=query))
+
+    # Requests keep running while a new month (here: Choice Scarf usage halved) is swapped in
+    with open(path, 'r') as f:
+        data = json.load(f)
+    for p in data:
+        if 'Choice Scarf' in p['Items']:
+            p['Items']['Choice Scarf'] /= 2
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+    stop = threading.Event()
+    seen = Counter()
+
+    def client():
+        while not stop.is_set():
+            # One snapshot per request, as the page callbacks do
+            current = index.get()
+            seen[len(search(current, all_of=query))] += 1
+
+    clients = [threading.Thread(target=client) for _ in range(4)]
+    for thread in clients:
+        thread.start()
+    time.sleep(0.1)
+    print("Swapped:", watcher.check_now())
+    time.sleep(0.1)
+    stop.set()
+    for thread in clients:
+        thread.join()
+    after = len(search(index.get(), all_of=query))
+    print(f"Choice Scarf >= 20%: {before} Pokemon before, {after} after; "
+          f"answers served while swapping: {dict(seen)}")
+    print(json.dumps(watcher.metrics(), indent=2))
@@ -0,0 +1,197 @@
+import json
+import time
+import numpy as np
+from components.pokemon_index import counter_name
+
+# One global vocabulary per kind of name (Pokemon, moves, items, abilities,
+# spreads, tera types), assigned at ingest. A month of gen9ou_full_data.json
+# becomes flat arrays: per-Pokemon columns plus, for every nested section, a
+# CSR-style (ptr, ids, pct) triple whose ids index the vocabulary. Teammates
+# and Checks and Counters reference the same Pokemon vocabulary, with the score
+# that Smogon glues onto counter names dropped (it is Score - 4 * Stdev).
+
+KINDS = ('pokemon', 'ability', 'item', 'spread', 'move', 'tera')
+SECTIONS = {'Abilities': 'ability', 'Items': 'item', 'Spreads': 'spread', 'Moves': 'move',
+            'Tera Types': 'tera', 'Teammates': 'pokemon'}
+COUNTER_STATS = {'Score': 'score', 'Stdev': 'stdev', 'KOed': 'koed', 'Switched Out': 'switched_out'}
+
+# --- Vocabulary ---
+def new_vocabulary():
+    """Empty vocabulary: kind -> {'names': [...], 'ids': {name: id}}."""
+    return {kind: {'names': [], 'ids': {}} for kind in KINDS}
+
+def intern(vocab, kind, name):
+    """ID of `name`, assigning the next free one the first time it is seen."""
+    table = vocab[kind]
+    i = table['ids'].get(name)
+    if i is None:
+        i = table['ids'][name] = len(table['names'])
+        table['names'].append(name)
+    return i
+
+def decode(vocab, kind, ids):
+    """Names for an ID or an array of IDs."""
+    names = vocab[kind]['names']
+    if np.ndim(ids) == 0:
+        return names[int(ids)]
+    return [names[i] for i in ids]
+
+# --- Ingest ---
+def _number(value):
+    return np.nan if value is None else value
+
+def intern_entries(entries, vocab):
+    """Flat ID-based arrays for one month of entries, growing `vocab` with unseen names."""
+    n = len(entries)
+    month = {
+        'pokemon': np.empty(n, dtype=np.int32),
+        'raw': np.empty(n, dtype=np.int64),
+        'viability': np.empty(n, dtype=np.float32),
+    }
+    sections = {field: ([0], [], []) for field in SECTIONS}
+    counters = ([0], [], {stat: [] for stat in COUNTER_STATS})
+    for r, p in enumerate(entries):
+        month['pokemon'][r] = intern(vocab, 'pokemon', p["Pokemon"])
+        month['raw'][r] = p.get("Raw Count", 0)
+        month['viability'][r] = _number(p.get("Viability Ceiling"))
+        for field, kind in SECTIONS.items():
+            ptr, ids, pct = sections[field]
+            usage = p.get(field, {})
+            if isinstance(usage, dict):
+                for name, value in usage.items():
+                    ids.append(intern(vocab, kind, name))
+                    pct.append(value)
+            ptr.append(len(ids))
+        ptr, ids, stats = counters
+        listed = p.get("Checks and Counters", [])
+        for c in listed if isinstance(listed, list) else []:
+            ids.append(intern(vocab, 'pokemon', counter_name(c.get("Name", ""))))
+            for stat in COUNTER_STATS:
+                stats[stat].append(_number(c.get(stat)))
+        ptr.append(len(ids))
+
+    for field, (ptr, ids, pct) in sections.items():
+        month[field] = {'ptr': np.asarray(ptr, dtype=np.int32), 'ids': np.asarray(ids, dtype=np.int32),
+                        'pct': np.asarray(pct, dtype=np.float32)}
+    ptr, ids, stats = counters
+    month['Checks and Counters'] = {'ptr': np.asarray(ptr, dtype=np.int32), 'ids': np.asarray(ids, dtype=np.int32),
+                                    **{key: np.asarray(stats[stat], dtype=np.float32)
+                                       for stat, key in COUNTER_STATS.items()}}
+    return month
+
+def intern_months(months, vocab=None):
+    """({label: month arrays}, vocab) for {label: entries}; pass `vocab` to extend an existing one."""
+    vocab = vocab if vocab is not None else new_vocabulary()
+    return {label: intern_entries(entries, vocab) for label, entries in months.items()}, vocab
+
+def concat_interned(parts):
+    """One month from interned batches of its entries (all interned with the same vocab), in order."""
+    month = {}
+    for key, value in parts[0].items():
+        if not isinstance(value, dict):
+            month[key] = np.concatenate([part[key] for part in parts])
+            continue
+        offsets = np.cumsum([0] + [len(part[key]['ids']) for part in parts[:-1]])
+        month[key] = {'ptr': np.concatenate([[0]] + [part[key]['ptr'][1:] + offset
+                                                     for part, offset in zip(parts, offsets)]).astype(np.int32)}
+        for column in value:
+            if column != 'ptr':
+                month[key][column] = np.concatenate([part[key][column] for part in parts])
+    return month
+
+def decode_entry(month, vocab, r):
+    """Row `r` of an interned month back in the gen9ou_full_data.json layout (without Avg Weight)."""
+    entry = {"Pokemon": decode(vocab, 'pokemon', month['pokemon'][r]), "Raw Count": int(month['raw'][r])}
+    if not np.isnan(month['viability'][r]):
+        entry["Viability Ceiling"] = int(month['viability'][r])
+    for field, kind in SECTIONS.items():
+        section = month[field]
+        start, end = section['ptr'][r], section['ptr'][r + 1]
+        entry[field] = dict(zip(decode(vocab, kind, section['ids'][start:end]), section['pct'][start:end].tolist()))
+    counters = month['Checks and Counters']
+    start, end = counters['ptr'][r], counters['ptr'][r + 1]
+    entry["Checks and Counters"] = [
+        {"Name": decode(vocab, 'pokemon', counters['ids'][k]),
+         **{stat: float(counters[key][k]) for stat, key in COUNTER_STATS.items()}}
+        for k in range(start, end)
+    ]
+    return entry
+
+# --- Persistence ---
+def save_interned(months, vocab, path):
+    """Write interned months and their vocabulary to one .npz file."""
+    arrays = {f"vocab_{kind}": np.asarray(vocab[kind]['names'], dtype=str) for kind in KINDS}
+    arrays['labels'] = np.asarray(list(months), dtype=str)
+    for m, month in enumerate(months.values()):
+        for key, value in month.items():
+            if isinstance(value, dict):
+                for part, array in value.items():
+                    arrays[f"{m}/{key}/{part}"] = array
+            else:
+                arrays[f"{m}/{key}"] = value
+    np.savez(path, **arrays)
+
+def load_interned(path):
+    """({label: month arrays}, vocab) written by save_interned."""
+    with np.load(path, allow_pickle=False) as data:
+        vocab = {}
+        for kind in KINDS:
+            names = data[f"vocab_{kind}"].tolist()
+            vocab[kind] = {'names': names, 'ids': {name: i for i, name in enumerate(names)}}
+        months = {label: {} for label in data['labels'].tolist()}
+        labels = list(months)
+        for key in data.files:
+            if '/' not in key:
+                continue
+            m, *parts = key.split('/')
+            month = months[labels[int(m)]]
+            if len(parts) == 1:
+                month[parts[0]] = data[key]
+            else:
+                month.setdefault(parts[0], {})[parts[1]] = data[key]
+    return months, vocab
+
+def interned_nbytes(months, vocab):
+    """Array bytes of the interned months plus the (approximate) size of the decode strings."""
+    arrays = sum(value.nbytes if not isinstance(value, dict) else sum(a.nbytes for a in value.values())
+                 for month in months.values() for value in month.values())
+    strings = sum(len(name) for kind in KINDS for name in vocab[kind]['names'])
+    return arrays + strings
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.interning [n_months]
+    import os
+    import sys
+    import tempfile
+    import tracemalloc
+    n_months = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    source = "components/data/gen9ou_full_data.json"
+    with open(source, "r") as f:
+        text = f.read()
+
+    # Only one month is on disk, so the same file stands in for each month
+    tracemalloc.start()
+    start = time.perf_counter()
+    raw_months = {f"month-{m:02d}": json.loads(text) for m in range(n_months)}
+    json_seconds = time.perf_counter() - start
+    json_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    months, vocab = intern_months(raw_months)
+    assert decode_entry(months["month-00"], vocab, 0)["Moves"].keys() == raw_months["month-00"][0]["Moves"].keys()
+    del raw_months
+    path = os.path.join(tempfile.mkdtemp(), "interned.npz")
+    save_interned(months, vocab, path)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    months, vocab = load_interned(path)
+    npz_seconds = time.perf_counter() - start
+    npz_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{n_months} months, vocabulary sizes: " + ", ".join(f"{k}={len(vocab[k]['names'])}" for k in KINDS))
+    print(f"JSON:     {json_seconds:.2f} s to parse, {json_bytes / 1e6:.1f} MB of Python objects")
+    print(f"Interned: {npz_seconds:.2f} s to load,  {npz_bytes / 1e6:.1f} MB "
+          f"({interned_nbytes(months, vocab) / 1e6:.1f} MB arrays + strings); "
+          f"file {os.path.getsize(path) / 1e6:.1f} MB vs {n_months * len(text) / 1e6:.1f} MB of JSON")
@@ -0,0 +1,341 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import importlib
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
+from dash.exceptions import PreventUpdate
+from dash.background_callback.managers import BaseBackgroundCallbackManager
+
+# Background callbacks without Celery or diskcache: jobs, progress and results
+# live in one SQLite file and the callbacks run on a small local process pool,
+# so a slow callback never occupies a web worker. Results are kept by cache
+# key (the callback's inputs plus `cache_by`), so a repeated query is served
+# from disk without starting a job. Cancelling marks the job in the database:
+# a queued job is skipped and a running one stops at its next progress update.
+#
+# The pool uses the 'spawn' start method (forking a threaded web process can
+# copy held locks) and is started on the first job. Spawned processes import a
+# job by module and name, so a background callback must be a module-level
+# function outside pages/ (e.g. components/recommender_job.py). A spawned
+# process also re-runs the script that started the server as __mp_main__, so
+# that script must not build the app there (see app.py). Jobs get their
+# inputs and `set_progress`, but no callback_context or set_props.
+#
+# Each pool process runs up to JOB_THREADS jobs at once on threads, so jobs
+# in one process can share a loaded model and batch their predicts (see
+# recommender_job.py). A job records the process that took it, and a job
+# whose process has died is marked 'failed' when the page polls it.
+
+JOB_DIR = os.environ.get('JOB_QUEUE_DIR', os.path.join(tempfile.gettempdir(), 'dash_jobs'))
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_THREADS = int(os.environ.get('JOB_THREADS', '4'))  # jobs run at once in each pool process
+RESULT_TTL = float(os.environ.get('JOB_RESULT_TTL', str(24 * 3600)))  # seconds a cached result is kept
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS store (key TEXT PRIMARY KEY, value BLOB, expires REAL);
+CREATE INDEX IF NOT EXISTS store_expires ON store (expires);
+CREATE TABLE IF NOT EXISTS jobs (job INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, status TEXT,
+                                 cancelled INTEGER DEFAULT 0, created REAL, started REAL, finished REAL,
+                                 pid INTEGER);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status);
+"""
+ACTIVE = ('queued', 'running')
+
+class JobCancelled(BaseException):
+    """Raised inside a job once it has been cancelled (a BaseException so callback error handling lets it through)."""
+
+# --- Disk store ---
+class JobStore:
+    """Pickled values and job rows in one SQLite file, safe to share between processes."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            # Job files written before process IDs were recorded
+            if 'pid' not in [row[1] for row in db.execute("PRAGMA table_info(jobs)")]:
+                db.execute("ALTER TABLE jobs ADD COLUMN pid INTEGER")
+
+    def _connect(self):
+        # Autocommit; closing() releases the file handle after each operation
+        return closing(sqlite3.connect(self.path, timeout=30, isolation_level=None))
+
+    def get(self, key, default=None):
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM store WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                             (key, time.time())).fetchone()
+        return pickle.loads(row[0]) if row else default
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + ttl if ttl else None
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO store VALUES (?, ?, ?)", (key, pickle.dumps(value), expires))
+
+    def add(self, key, value):
+        """Set `key` only if it is absent."""
+        with self._connect() as db:
+            db.execute("INSERT OR IGNORE INTO store VALUES (?, ?, NULL)", (key, pickle.dumps(value)))
+
+    def touch(self, key, ttl):
+        with self._connect() as db:
+            db.execute("UPDATE store SET expires = ? WHERE key = ?", (time.time() + ttl, key))
+
+    def delete(self, key):
+        with self._connect() as db:
+            db.execute("DELETE FROM store WHERE key = ?", (key,))
+
+    def purge(self):
+        """Drop expired values and finished job rows older than a day."""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("DELETE FROM store WHERE expires <= ?", (now,))
+            db.execute("DELETE FROM jobs WHERE status NOT IN (?, ?) AND finished < ?", (*ACTIVE, now - 24 * 3600))
+
+    # Jobs
+    def new_job(self, key, status='queued'):
+        now = time.time()
+        with self._connect() as db:
+            return db.execute("INSERT INTO jobs (key, status, created, finished) VALUES (?, ?, ?, ?)",
+                              (key, status, now, None if status in ACTIVE else now)).lastrowid
+
+    def job(self, job):
+        """(status, cancelled, pid) of a job."""
+        with self._connect() as db:
+            row = db.execute("SELECT status, cancelled, pid FROM jobs WHERE job = ?", (job,)).fetchone()
+        return row if row else (None, 0, None)
+
+    def set_status(self, job, status):
+        column = 'started' if status == 'running' else 'finished'
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET status = ?, {column} = ? WHERE job = ?", (status, time.time(), job))
+
+    def assign(self, job):
+        """Record that this process has taken the job."""
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET pid = ? WHERE job = ?", (os.getpid(), job))
+
+    def cancel(self, job):
+        with self._connect() as db:
+            db.execute("UPDATE jobs SET cancelled = 1 WHERE job = ? AND status IN (?, ?)", (job, *ACTIVE))
+
+    def counts(self):
+        """Number of jobs per status."""
+        with self._connect() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+class _JobWrites:
+    """The store as seen by one running job: every write first checks whether the job was cancelled."""
+
+    def __init__(self, store, job, ttl):
+        self.store = store
+        self.job = job
+        self.ttl = ttl
+
+    def set(self, key, value):
+        if self.store.job(self.job)[1]:
+            raise JobCancelled()
+        self.store.set(key, value, ttl=self.ttl)
+
+# --- Worker side ---
+def _call(fn, set_progress, args):
+    """Call a callback the way Dash does: progress setter first, then its inputs."""
+    progress = [set_progress] if set_progress else []
+    if isinstance(args, dict):
+        return fn(*progress, **args)
+    if isinstance(args, (list, tuple)):
+        return fn(*progress, *args)
+    return fn(*progress, args)
+
+def _execute(path, module, name, progress, ttl, job, result_key, progress_key, args):
+    """Run one callback on a job thread, storing its result (or error) under `result_key`."""
+    store = JobStore(path)
+    if store.job(job)[1]:
+        store.set_status(job, 'cancelled')
+        return
+    store.set_status(job, 'running')
+    writes = _JobWrites(store, job, ttl)
+    set_progress = (lambda value: writes.set(progress_key, list(value) if isinstance(value, (list, tuple))
+                                             else [value])) if progress else None
+    try:
+        fn = getattr(importlib.import_module(module), name)
+        try:
+            result = _call(fn, set_progress, args)
+        except PreventUpdate:
+            result = {"_dash_no_update": "_dash_no_update"}
+        except Exception as err:
+            result = {"background_callback_error": {"msg": str(err), "tb": traceback.format_exc()}}
+        writes.set(result_key, result)
+        store.set_status(job, 'done')
+    except JobCancelled:
+        store.set_status(job, 'cancelled')
+    except BaseException as err:
+        print(f"Background job {job} failed: {err}")
+        store.set_status(job, 'failed')
+
+_job_threads = None  # this pool process's job threads
+
+def _run_job(path, module, name, progress, ttl, threads, job, result_key, progress_key, args, context):
+    """Hand one job to this pool process's job threads and return."""
+    global _job_threads
+    JobStore(path).assign(job)
+    if _job_threads is None:
+        _job_threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='job')
+    _job_threads.submit(_execute, path, module, name, progress, ttl, job, result_key, progress_key, args)
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+# --- Dash manager ---
+class LocalJobManager(BaseBackgroundCallbackManager):
+    """Dash background callback manager backed by a SQLite job store and a local process pool.
+
+    Pass it as `manager=` to `@callback(..., background=True)`. With `cache_by`
+    (a list of zero-argument functions, e.g. a dataset version) results are
+    kept for `expire` seconds and reused for identical inputs.
+    """
+
+    def __init__(self, path=None, workers=JOB_WORKERS, threads=JOB_THREADS, cache_by=None, expire=RESULT_TTL):
+        os.makedirs(JOB_DIR, exist_ok=True)
+        self.store = JobStore(path or os.path.join(JOB_DIR, 'jobs.sqlite'))
+        self.workers = workers
+        self.threads = threads
+        self.expire = expire
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        super().__init__(cache_by)
+
+    def _submit(self, *args):
+        with self._pool_lock:
+            if self._pool is None:  # first job, or replaced after a worker died
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool.submit(*args)
+
+    def _check_finished(self, job, future):
+        # A job handed to a broken pool never starts; fail it so the page stops polling
+        if future.exception() is not None:
+            print(f"Background job {job} failed: {future.exception()}")
+            self.store.set_status(job, 'failed')
+            with self._pool_lock:
+                self._pool = None
+
+    def make_job_fn(self, fn, progress, key=None):
+        # Picklable reference to the job; the pool process imports `fn` itself
+        return partial(_run_job, self.store.path, fn.__module__, fn.__qualname__, bool(progress),
+                       self.expire if self.cache_by else None, self.threads)
+
+    def call_job_fn(self, key, job_fn, args, context):
+        """Queue a job for `key` and return its ID; a cached key is answered without starting one."""
+        self.store.purge()
+        if self.cache_by is not None and self.store.get(key) is not None:
+            return self.store.new_job(key, status='done')
+        job = self.store.new_job(key)
+        future = self._submit(job_fn, job, key, self._make_progress_key(key), args, dict(context))
+        future.add_done_callback(partial(self._check_finished, job))
+        return job
+
+    def terminate_job(self, job):
+        if job is not None:
+            self.store.cancel(int(job))
+
+    def terminate_unhealthy_job(self, job):
+        return False
+
+    def job_running(self, job):
+        status, cancelled, pid = self.store.job(int(job))
+        if status in ACTIVE and pid and not _alive(pid):
+            # Its pool process died (e.g. out of memory); fail the job so the page stops polling
+            self.store.set_status(int(job), 'failed')
+            return False
+        return status in ACTIVE and not cancelled
+
+    def get_progress(self, key):
+        progress_key = self._make_progress_key(key)
+        progress = self.store.get(progress_key)
+        if progress:
+            self.store.delete(progress_key)
+        return progress
+
+    def result_ready(self, key):
+        return self.store.get(key) is not None
+
+    def get_result(self, key, job):
+        result = self.store.get(key, self.UNDEFINED)
+        if result is self.UNDEFINED:
+            return self.UNDEFINED
+        if self.cache_by is None:
+            self.store.delete(key)
+        elif self.expire:
+            self.store.touch(key, self.expire)
+        self.store.delete(self._make_progress_key(key))
+        return result
+
+    def get_updated_props(self, key):
+        set_props_key = self._make_set_props_key(key)
+        props = self.store.get(set_props_key, self.UNDEFINED)
+        if props is self.UNDEFINED:
+            return {}
+        self.store.delete(set_props_key)
+        return props
+
+    def get_or_create_signing_secret(self, generate):
+        self.store.add(self.SIGNING_SECRET_KEY, generate())
+        return self.store.get(self.SIGNING_SECRET_KEY)
+
+    def metrics(self):
+        """Job counts per status ('queued', 'running', 'done', 'cancelled', 'failed')."""
+        return self.store.counts()
+
+def slow_square(set_progress, x):
+    """Demo job for the __main__ block below (module-level, so spawned workers can import it)."""
+    for step in range(5):
+        set_progress(f"step {step + 1}/5")
+        time.sleep(0.2)
+    return x * x
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.job_queue
+    work_dir = tempfile.mkdtemp()
+    manager = LocalJobManager(path=os.path.join(work_dir, 'jobs.sqlite'), cache_by=[lambda: 'v1'])
+    job_fn = manager.make_job_fn(slow_square, True)
+
+    def request(x, cancel_after=None):
+        """Start a job like Dash does and poll it every 50 ms; returns (result, seconds, progress seen)."""
+        key = manager.build_cache_key(slow_square, [x], [], None)
+        start = time.perf_counter()
+        job = manager.call_job_fn(key, job_fn, [x], {})
+        seen = []
+        while True:
+            progress = manager.get_progress(key)
+            if progress:
+                seen.append(progress[0])
+            result = manager.get_result(key, job)
+            if result is not manager.UNDEFINED or not manager.job_running(job):
+                return result, time.perf_counter() - start, seen
+            if cancel_after is not None and time.perf_counter() - start > cancel_after:
+                manager.terminate_job(job)
+            time.sleep(0.05)
+
+    result, seconds, seen = request(12)
+    print(f"first request:    {result} in {seconds * 1000:.0f} ms, progress {seen}")
+    result, seconds, _ = request(12)
+    print(f"cached request:   {result} in {seconds * 1000:.1f} ms")
+    result, seconds, seen = request(13, cancel_after=0.3)
+    print(f"cancelled request: {'no result' if result is manager.UNDEFINED else result} after "
+          f"{seconds * 1000:.0f} ms, progress {seen}")
+    time.sleep(0.3)
+    print("jobs:", manager.metrics())
@@ -0,0 +1,214 @@
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from components.pokemon_index import build_name_index, counter_matrices
+
+# Monte Carlo 6v6 simulator. Each exchange between the two active Pokemon ends
+# in one of four outcomes (either side KOs the other, or either side switches
+# out), weighted by the KOed / Switched Out percentages from Checks and Counters.
+# Items and moves are sampled per game from their usage percentages and nudge
+# the KO weights. Games are simulated as NumPy arrays, one row per game.
+
+TEAM_SIZE = 6
+# Added to every outcome weight (in percentage points) so pairs with no
+# counter data play out as a coin flip instead of never ending
+BASE_RATE = 10.0
+MAX_TURNS = 300
+Z_95 = 1.959964
+
+OFFENSIVE_ITEMS = {'Choice Band', 'Choice Specs', 'Life Orb', 'Expert Belt', 'Booster Energy', 'Loaded Dice',
+                   'Weakness Policy', 'Throat Spray'}
+DEFENSIVE_ITEMS = {'Leftovers', 'Heavy-Duty Boots', 'Focus Sash', 'Eviolite', 'Assault Vest', 'Rocky Helmet',
+                   'Sitrus Berry', 'Black Sludge'}
+RECOVERY_MOVES = {'Recover', 'Roost', 'Slack Off', 'Synthesis', 'Moonlight', 'Morning Sun', 'Soft-Boiled',
+                  'Shore Up', 'Strength Sap', 'Wish', 'Rest', 'Milk Drink'}
+SETUP_MOVES = {'Swords Dance', 'Nasty Plot', 'Dragon Dance', 'Calm Mind', 'Quiver Dance', 'Bulk Up',
+               'Shell Smash', 'Belly Drum', 'Victory Dance', 'Tidy Up', 'Agility', 'Trailblaze'}
+# KO weight multipliers: offensive items / setup moves raise KOs dealt,
+# defensive items / recovery moves lower KOs taken
+ITEM_BOOST = 1.15
+MOVE_BOOST = 1.10
+
+# --- Data ---
+def _usage_probability(usage, names):
+    if isinstance(usage, str):
+        return 0.0
+    return min(sum(pct for name, pct in usage.items() if name in names) / 100.0, 1.0)
+
+def _any_probability(usage, names):
+    # Each move is picked independently with its usage %, so P(at least one) = 1 - prod(1 - p)
+    if isinstance(usage, str):
+        return 0.0
+    p_none = np.prod([1.0 - min(pct / 100.0, 1.0) for name, pct in usage.items() if name in names])
+    return float(1.0 - p_none)
+
+def build_simulator_data(entries):
+    """Counter matrices plus per-Pokemon item and move probabilities for one month of data."""
+    names, index = build_name_index(entries)
+    counters = counter_matrices(entries, index, fields=("KOed", "Switched Out"))
+    probs = np.zeros((len(names), 4))
+    for p in entries:
+        i = index[p["Pokemon"]]
+        items = p.get("Items", {})
+        moves = p.get("Moves", {})
+        probs[i] = [_usage_probability(items, OFFENSIVE_ITEMS), _usage_probability(items, DEFENSIVE_ITEMS),
+                    _any_probability(moves, SETUP_MOVES), _any_probability(moves, RECOVERY_MOVES)]
+    return {'names': names, 'index': index, 'ko': counters["KOed"], 'switched': counters["Switched Out"],
+            'probs': probs}
+
+def _team_ids(sim, team):
+    unknown = [name for name in team if name not in sim['index']]
+    if unknown:
+        raise KeyError(f"Unknown Pokemon: {', '.join(unknown)}")
+    if not 1 <= len(team) <= TEAM_SIZE:
+        raise ValueError(f"Teams need between 1 and {TEAM_SIZE} Pokemon")
+    return np.array([sim['index'][name] for name in team], dtype=np.int64)
+
+def matchup_tables(sim, ids_a, ids_b):
+    """Outcome weights for every (a, b) pair of active Pokemon, padded to TEAM_SIZE x TEAM_SIZE.
+
+    Order of the first axis: a KOs b, b KOs a, a switches out, b switches out.
+    ko[i, j] is how often j KOed i, so "a KOs b" reads the transposed block.
+    """
+    ko, switched = sim['ko'], sim['switched']
+    tables = np.zeros((4, TEAM_SIZE, TEAM_SIZE))
+    na, nb = len(ids_a), len(ids_b)
+    tables[0, :na, :nb] = ko[ids_b][:, ids_a].toarray().T
+    tables[1, :na, :nb] = ko[ids_a][:, ids_b].toarray()
+    tables[2, :na, :nb] = switched[ids_a][:, ids_b].toarray()
+    tables[3, :na, :nb] = switched[ids_b][:, ids_a].toarray().T
+    return tables + BASE_RATE
+
+# --- Simulation ---
+def _send_in(rng, alive, active, games, side, exclude_active):
+    # Replace the active Pokemon of `side` in `games` with a random alive teammate
+    candidates = alive[games, side].copy()
+    if exclude_active:
+        candidates[np.arange(len(games)), active[games, side]] = False
+    scores = np.where(candidates, rng.random(candidates.shape), -1.0)
+    has_candidate = candidates.any(axis=1)
+    active[games[has_candidate], side] = scores[has_candidate].argmax(axis=1)
+
+def simulate_games(tables, member_probs, sizes, n_games, seed, max_turns=MAX_TURNS):
+    """Play `n_games` games between two fixed teams; returns (wins, losses, draws, turns) for side A.
+
+    member_probs has shape (2, TEAM_SIZE, 4): offensive item, defensive item,
+    setup move and recovery move probability for each slot.
+    """
+    rng = np.random.default_rng(seed)
+    # Items are mutually exclusive, so one uniform draw picks offensive / defensive / neither
+    item_u = rng.random((n_games, 2, TEAM_SIZE))
+    offensive_item = item_u < member_probs[:, :, 0]
+    defensive_item = (~offensive_item) & (item_u < member_probs[:, :, 0] + member_probs[:, :, 1])
+    setup = rng.random((n_games, 2, TEAM_SIZE)) < member_probs[:, :, 2]
+    recovery = rng.random((n_games, 2, TEAM_SIZE)) < member_probs[:, :, 3]
+    offense = np.where(offensive_item, ITEM_BOOST, 1.0) * np.where(setup, MOVE_BOOST, 1.0)
+    defense = np.where(defensive_item, 1.0 / ITEM_BOOST, 1.0) * np.where(recovery, 1.0 / MOVE_BOOST, 1.0)
+
+    slots = np.arange(TEAM_SIZE)
+    alive = np.stack([slots < sizes[0], slots < sizes[1]])[None].repeat(n_games, axis=0)
+    active = np.zeros((n_games, 2), dtype=np.int64)
+    result = np.zeros(n_games, dtype=np.int8)
+    live = np.arange(n_games)
+    turns = 0
+
+    for _ in range(max_turns):
+        if not live.size:
+            break
+        turns += live.size
+        a, b = active[live, 0], active[live, 1]
+        weights = tables[:, a, b].T.copy()
+        weights[:, 0] *= offense[live, 0, a] * defense[live, 1, b]
+        weights[:, 1] *= offense[live, 1, b] * defense[live, 0, a]
+        cumulative = np.cumsum(weights, axis=1)
+        u = rng.random(live.size) * cumulative[:, -1]
+        outcome = (u[:, None] >= cumulative).sum(axis=1)
+
+        # outcome 0: A KOs B, 1: B KOs A, 2: A switches, 3: B switches
+        for ko_code, switch_code, side in ((1, 2, 0), (0, 3, 1)):
+            fainted = live[outcome == ko_code]
+            alive[fainted, side, active[fainted, side]] = False
+            _send_in(rng, alive, active, fainted, side, exclude_active=False)
+            _send_in(rng, alive, active, live[outcome == switch_code], side, exclude_active=True)
+
+        remaining = alive[live].any(axis=2)
+        finished = ~remaining.all(axis=1)
+        result[live[finished & remaining[:, 0]]] = 1
+        result[live[finished & remaining[:, 1]]] = -1
+        live = live[~finished]
+
+    # Games still running at max_turns count as draws
+    return int((result == 1).sum()), int((result == -1).sum()), int((result == 0).sum()), turns
+
+def _simulate_chunk(args):
+    return simulate_games(*args)
+
+def wilson_interval(successes, n, z=Z_95):
+    """Wilson score interval for a binomial proportion."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return float(centre - half), float(centre + half)
+
+def simulate_matchup(sim, team_a, team_b, n_games=100000, n_workers=None, chunk_size=10000, seed=0,
+                     max_turns=MAX_TURNS):
+    """Estimate team A's win rate against team B.
+
+    Games are split into fixed-size chunks, each with its own seed spawned
+    from `seed`, so results are identical for any number of workers.
+    """
+    ids_a, ids_b = _team_ids(sim, team_a), _team_ids(sim, team_b)
+    tables = matchup_tables(sim, ids_a, ids_b)
+    member_probs = np.zeros((2, TEAM_SIZE, 4))
+    member_probs[0, :len(ids_a)] = sim['probs'][ids_a]
+    member_probs[1, :len(ids_b)] = sim['probs'][ids_b]
+    sizes = (len(ids_a), len(ids_b))
+
+    chunks = [chunk_size] * (n_games // chunk_size) + ([n_games % chunk_size] if n_games % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    jobs = [(tables, member_probs, sizes, n, s, max_turns) for n, s in zip(chunks, seeds)]
+    n_workers = n_workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if n_workers == 1:
+        outcomes = [_simulate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            outcomes = list(pool.map(_simulate_chunk, jobs))
+    elapsed = time.perf_counter() - start
+
+    wins, losses, draws, turns = (sum(values) for values in zip(*outcomes))
+    # Draws count as half a win for the estimate and its interval
+    low, high = wilson_interval(wins + 0.5 * draws, n_games)
+    return {
+        'team_a': list(team_a),
+        'team_b': list(team_b),
+        'games': n_games,
+        'wins': wins,
+        'losses': losses,
+        'draws': draws,
+        'win_rate': (wins + 0.5 * draws) / n_games,
+        'ci_95': (low, high),
+        'avg_turns': turns / n_games,
+        'workers': n_workers,
+        'seconds': elapsed,
+        'games_per_second': n_games / elapsed,
+    }
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.matchup_simulator
+    import json
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    sim = build_simulator_data(data)
+    team_a = ["Great Tusk", "Kingambit", "Gholdengo", "Dragapult", "Iron Valiant", "Corviknight"]
+    team_b = ["Gliscor", "Raging Bolt", "Ogerpon-Wellspring", "Darkrai", "Zamazenta", "Iron Moth"]
+    for workers in (1, None):
+        result = simulate_matchup(sim, team_a, team_b, n_games=200000, n_workers=workers)
+        print(f"workers={result['workers']}: win rate {result['win_rate']:.4f} "
+              f"(95% CI {result['ci_95'][0]:.4f}-{result['ci_95'][1]:.4f}), "
+              f"{result['games_per_second']:,.0f} games/s")
@@ -0,0 +1,123 @@
+import re
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from components.pokemon_index import build_name_index, counter_matrices
+
+# Replicator dynamics for the metagame: each Pokemon's share grows with its
+# average advantage against the current meta. The payoff matrix stays sparse
+# (only pairs listed in Checks and Counters are non-zero), so a step is one
+# sparse matrix-vector product and scales with the number of counter entries.
+
+USAGE_PATH = '../pokemon_analysis/data/combined_pokemon_usage.csv'
+MONTH_PATTERN = re.compile(r"(\d{4}-\d{2})")
+
+# --- Data ---
+def load_usage_history(path=USAGE_PATH):
+    """{month: Series of Usage % indexed by Pokemon} from combined_pokemon_usage.csv, oldest first."""
+    df = pd.read_csv(path)
+    df['Month'] = df['Source File'].str.extract(MONTH_PATTERN, expand=False)
+    return {month: group.groupby('Pokemon')['Usage %'].sum() for month, group in sorted(df.groupby('Month'))}
+
+def build_payoff_matrix(datasets, extra_names=()):
+    """Sparse antisymmetric payoff matrix A, A[i, j] = how much more often i forces j out than the reverse.
+
+    Names in `extra_names` without counter data (e.g. from older usage months)
+    are appended with empty rows, so they keep their share but never grow.
+    """
+    names, index = build_name_index(datasets)
+    for name in extra_names:
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+    counters = counter_matrices(datasets, index, fields=("KOed", "Switched Out"))
+    # forces_out[i, j]: share of j's matchups against i that end with j KOed or switched out
+    forces_out = ((counters["KOed"] + counters["Switched Out"]).T / 100.0).tocsr()
+    return names, index, (forces_out - forces_out.T).tocsr()
+
+def usage_shares(usage, index):
+    """Usage % aligned to `index` and normalised to sum to 1 (usage % sums to ~600 for six slots)."""
+    x = np.zeros(len(index))
+    for name, pct in usage.items():
+        if name in index:
+            x[index[name]] = pct
+    return x / x.sum()
+
+# --- Dynamics ---
+def replicator_step(payoff, x, eta):
+    """One discrete (exponential) replicator update: x_i *= exp(eta * (fitness_i - mean fitness))."""
+    fitness = payoff @ x
+    x = x * np.exp(eta * (fitness - x @ fitness))
+    return x / x.sum()
+
+def project_meta(payoff, x0, steps=12, eta=1.0, mutation=0.0, return_path=False):
+    """Iterate the meta forward `steps` times from shares x0.
+
+    `mutation` mixes a fraction of the starting shares back in every step, so
+    Pokemon with a losing matchup spread fade instead of going extinct.
+    """
+    x = np.asarray(x0, dtype=np.float64)
+    path = [x]
+    for _ in range(steps):
+        x = replicator_step(payoff, x, eta)
+        if mutation:
+            x = (1.0 - mutation) * x + mutation * x0
+        path.append(x)
+    return np.array(path) if return_path else x
+
+# --- Backtest ---
+def prediction_metrics(predicted, actual, k=20):
+    """Mean absolute error (percentage points of share), rank correlation and top-k overlap."""
+    top_predicted = set(np.argsort(-predicted, kind='stable')[:k])
+    top_actual = set(np.argsort(-actual, kind='stable')[:k])
+    return {
+        'mae_pct': float(np.abs(predicted - actual).mean() * 100),
+        'spearman': float(pd.Series(predicted).corr(pd.Series(actual), method='spearman')),
+        f'top{k}_overlap': len(top_predicted & top_actual) / k,
+    }
+
+def backtest(payoff, index, history, etas=(0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0), steps=12, mutation=0.0):
+    """Project each month of `history` to the next and score every eta.
+
+    eta = 0 is the persistence baseline (next year looks like this year).
+    The best eta is picked on the first transition and reported on the rest.
+    The payoff matrix comes from a single month of counter data, so earlier
+    transitions are scored with matchups from later in the history.
+    """
+    months = list(history)
+    transitions = []
+    for start, end in zip(months, months[1:]):
+        x0, actual = usage_shares(history[start], index), usage_shares(history[end], index)
+        scores = {eta: prediction_metrics(project_meta(payoff, x0, steps, eta, mutation), actual) for eta in etas}
+        transitions.append({'from': start, 'to': end, 'scores': scores})
+    best_eta = min(etas, key=lambda eta: transitions[0]['scores'][eta]['mae_pct']) if transitions else None
+    return {
+        'best_eta': best_eta,
+        'transitions': transitions,
+        'held_out': [{'from': t['from'], 'to': t['to'], 'best': t['scores'][best_eta], 'baseline': t['scores'][0.0]}
+                     for t in transitions[1:]] if 0.0 in etas else [],
+    }
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.meta_dynamics
+    import json
+    import time
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    history = load_usage_history()
+    all_names = sorted({name for usage in history.values() for name in usage.index})
+    names, index, payoff = build_payoff_matrix(data, extra_names=all_names)
+    print(f"{len(names)} Pokemon, {payoff.nnz} non-zero payoffs")
+    result = backtest(payoff, index, history)
+    print(f"Best eta on {result['transitions'][0]['from']} -> {result['transitions'][0]['to']}: {result['best_eta']}")
+    for t in result['transitions']:
+        print(t['from'], '->', t['to'], {eta: round(s['mae_pct'], 4) for eta, s in t['scores'].items()})
+    for t in result['held_out']:
+        print('held out', t['from'], '->', t['to'], 'model', t['best'], 'persistence', t['baseline'])
+
+    # Scaling check: a random sparse payoff over 5,000 Pokemon
+    big = sparse.random(5000, 5000, density=0.01, format='csr', random_state=0)
+    big = (big - big.T).tocsr()
+    start = time.perf_counter()
+    project_meta(big, np.full(5000, 1 / 5000), steps=100)
+    print(f"5000 Pokemon, 100 steps: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,278 @@
+import argparse
+import json
+import math
+import os
+import pickle
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from pokemon_move_recommender import (
+    extract_features_from_full, load_model, train_model, KO_THRESHOLD, SWITCH_THRESHOLD
+)
+from out_of_core_training import pokemon_feature_matrix, pair_label
+from forest_inference import export_model, save_exported_model
+from type_effectiveness import build_type_engine, type_pair_features
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), 'models')
+MANIFEST_NAME = 'manifest.json'
+POKEMON_CSV = os.path.join(os.path.dirname(__file__), 'data', 'Pokemon.csv')
+# A numeric feature counts as changed when it moves by more than this many of
+# its training standard deviations. Between the 2024-02 and 2025-02 usage
+# stats, raw counts move by more than 5% for 93% of the 447 modelled Pokemon,
+# but by more than 0.25 standard deviations for 14% of them.
+TOLERANCE = 0.25
+# Above this share of changed pairs a full retrain is run instead
+MAX_AFFECTED_SHARE = 0.5
+
+def model_pair_features(columns, pokemon_data):
+    """The pair feature function a model was trained with: type features when it has "pair_" columns."""
+    if not any(column.startswith('pair_') for column in columns):
+        return None
+    engine = build_type_engine([p["Pokemon"] for p in pokemon_data], pd.read_csv(POKEMON_CSV))
+    return type_pair_features(engine)
+
+def feature_scales(df, scaler):
+    """Training standard deviation of each per-Pokemon feature, keyed like extract_features_from_full."""
+    return {column[len("p1_"):]: scale for column, scale in zip(df.columns, scaler.scale_)
+            if column.startswith("p1_")}
+
+# --- Change Detection ---
+def _label_signature(p):
+    """The parts of an entry that decide its pair labels (best move, move list, threat outcomes)."""
+    moves = p.get("Moves", {})
+    if isinstance(moves, str):
+        moves = {move: 1.0 for move in moves.split()}
+    best_move = sorted(moves.items(), key=lambda x: x[1], reverse=True)[0][0] if moves else None
+    counters = p.get("Checks and Counters", [])
+    if isinstance(counters, str):
+        counters = []
+    # Counter names carry a monthly score suffix ("Great Tusk 70.123"); only the
+    # name and the is_threatened outcome matter for labels.
+    threats = tuple((c.get("Name", "").rsplit(" ", 1)[0],
+                     c.get("KOed", 0) > KO_THRESHOLD and c.get("Switched Out", 0) > SWITCH_THRESHOLD)
+                    for c in counters)
+    return best_move, tuple(sorted(moves)), threats
+
+def changed_pokemon(old_data, new_data, scales, tolerance=TOLERANCE):
+    """Names in new_data that are new or whose training inputs changed, plus names that were removed.
+
+    Label inputs must match exactly; numeric features count as changed when any
+    moves by more than `tolerance` times its training standard deviation
+    (`scales`, see feature_scales), since raw counts and averages drift for
+    every Pokemon each month.
+    """
+    old_by_name = {p["Pokemon"]: p for p in old_data}
+    changed = set()
+    for p in new_data:
+        name = p["Pokemon"]
+        old = old_by_name.get(name)
+        if old is None or _label_signature(old) != _label_signature(p):
+            changed.add(name)
+            continue
+        f_old = extract_features_from_full(old)
+        f_new = extract_features_from_full(p)
+        for key, value in f_new.items():
+            before = f_old.get(key, 0)
+            if abs(value - before) > tolerance * scales.get(key, 1.0):
+                changed.add(name)
+                break
+    removed = set(old_by_name) - {p["Pokemon"] for p in new_data}
+    return changed, removed
+
+def _pair_frame(features, keys, i1, i2, pairs, pair_features):
+    """Pair rows in train_model's column layout, with the model's pair features appended."""
+    columns = [f"p1_{k}" for k in keys] + [f"p2_{k}" for k in keys]
+    X = np.hstack([features[i1], features[i2]]) if len(i1) else np.empty((0, len(columns)))
+    df = pd.DataFrame(X, columns=columns)
+    if pair_features is not None and len(i1):
+        df = pd.concat([df, pd.DataFrame([pair_features(p1, p2) for p1, p2 in pairs])], axis=1)
+    return df
+
+def affected_pair_rows(new_data, changed, pair_features=None):
+    """Feature rows and labels for every pair with at least one changed Pokemon."""
+    features, keys = pokemon_feature_matrix(new_data)
+    names = [p["Pokemon"] for p in new_data]
+    is_changed = np.array([name in changed for name in names])
+    i1, i2, pairs, labels = [], [], [], []
+    for i, p1 in enumerate(new_data):
+        for j, p2 in enumerate(new_data):
+            if names[i] == names[j] or not (is_changed[i] or is_changed[j]):
+                continue
+            i1.append(i)
+            i2.append(j)
+            pairs.append((p1, p2))
+            labels.append(pair_label(p1, p2))
+    return _pair_frame(features, keys, i1, i2, pairs, pair_features), labels
+
+def class_anchor_rows(new_data, changed, missing_classes, pair_features=None):
+    """One unchanged pair per class the slice lacks, so the extra trees see the full class list."""
+    features, keys = pokemon_feature_matrix(new_data)
+    missing = set(missing_classes)
+    i1, i2, pairs, labels = [], [], [], []
+    for i, p1 in enumerate(new_data):
+        if not missing:
+            break
+        if p1["Pokemon"] in changed:
+            continue
+        for j, p2 in enumerate(new_data):
+            if p2["Pokemon"] == p1["Pokemon"] or p2["Pokemon"] in changed:
+                continue
+            label = pair_label(p1, p2)
+            if label in missing:
+                missing.discard(label)
+                i1.append(i)
+                i2.append(j)
+                pairs.append((p1, p2))
+                labels.append(label)
+                if not missing:
+                    break
+    return _pair_frame(features, keys, i1, i2, pairs, pair_features), labels, missing
+
+# --- Refresh ---
+def refresh_model(model_data, new_data, extra_trees=None, tolerance=TOLERANCE):
+    """Update a trained model for a new month by replacing its oldest trees with trees fitted on the affected pairs.
+
+    The scaler and PCA stay frozen so existing trees remain valid, and the
+    forest keeps its size. The model's feature set (with or without type pair
+    features, read from its columns) is kept. Falls back to a full retrain when
+    the new month introduces a label the forest has never seen, or when more
+    than MAX_AFFECTED_SHARE of the pairs changed.
+    Returns (new model_data or None if nothing changed, report dict).
+    """
+    start = time.perf_counter()
+    model, scaler, pca, df, old_data = model_data
+    pair_features = model_pair_features(df.columns, new_data)
+    changed, removed = changed_pokemon(old_data, new_data, feature_scales(df, scaler), tolerance)
+    n = len(new_data)
+    report = {
+        'changed_pokemon': len(changed),
+        'removed_pokemon': len(removed),
+        'total_pairs': n * (n - 1),
+        'affected_pairs': 0,
+        'extra_trees': 0,
+        'mode': 'unchanged',
+    }
+    if not changed:
+        report['refresh_seconds'] = time.perf_counter() - start
+        return None, report
+
+    def full_retrain(reason):
+        print(f"{reason}; running a full retrain.")
+        refreshed = train_model(new_data, pair_features=pair_features)
+        report['mode'] = 'full'
+        report['refresh_seconds'] = time.perf_counter() - start
+        return refreshed, report
+
+    X_slice, y_slice = affected_pair_rows(new_data, changed, pair_features)
+    report['affected_pairs'] = len(y_slice)
+    n_trees = len(model.estimators_)
+    if extra_trees is None:
+        # Scale the number of replaced trees with the share of pairs that changed
+        extra_trees = max(5, math.ceil(n_trees * len(y_slice) / report['total_pairs']))
+    if len(y_slice) > MAX_AFFECTED_SHARE * report['total_pairs'] or extra_trees >= n_trees:
+        return full_retrain(f"{len(y_slice)} of {report['total_pairs']} pairs changed")
+    known = set(model.classes_)
+    if not set(y_slice) <= known:
+        return full_retrain("New month introduces moves the model has never seen")
+
+    X_anchor, y_anchor, still_missing = class_anchor_rows(new_data, changed, known - set(y_slice), pair_features)
+    if still_missing:
+        return full_retrain(f"No unchanged pairs left for {len(still_missing)} classes")
+
+    X_fit = pd.concat([X_slice, X_anchor], ignore_index=True)[list(df.columns)]
+    y_fit = y_slice + y_anchor
+    model.set_params(warm_start=True, n_estimators=n_trees + extra_trees)
+    model.fit(pca.transform(scaler.transform(X_fit)), y_fit)
+    # Keep the forest at its size: the oldest trees, fitted on the oldest data, make way for the new ones
+    model.estimators_ = model.estimators_[extra_trees:]
+    model.set_params(warm_start=False, n_estimators=n_trees)
+
+    report['extra_trees'] = extra_trees
+    report['mode'] = 'warm_start'
+    report['refresh_seconds'] = time.perf_counter() - start
+    return (model, scaler, pca, df, new_data), report
+
+# --- Artifact Versions ---
+def read_manifest(models_dir=MODELS_DIR):
+    """Load the artifact manifest, or an empty one if nothing has been published."""
+    path = os.path.join(models_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {'latest': None, 'versions': []}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _atomic_publish(tmp_path, versioned_path, current_path):
+    try:
+        os.link(tmp_path, versioned_path)
+    except OSError:
+        shutil.copy2(tmp_path, versioned_path)
+    os.replace(tmp_path, current_path)
+
+def publish_model(model_data, report, models_dir=MODELS_DIR):
+    """Write model_data as a new numbered version and atomically make it current.
+
+    pokemon_model.pkl / pokemon_model.npz always point at the latest version, so
+    existing loaders pick it up; older versions stay as pokemon_model_v<N>.*.
+    """
+    os.makedirs(models_dir, exist_ok=True)
+    manifest = read_manifest(models_dir)
+    version = (manifest['latest'] or 0) + 1
+    model, scaler, pca, df, _ = model_data
+
+    pkl_tmp = os.path.join(models_dir, 'pokemon_model.pkl.tmp')
+    with open(pkl_tmp, 'wb') as f:
+        pickle.dump(model_data, f)
+    _atomic_publish(pkl_tmp, os.path.join(models_dir, f'pokemon_model_v{version}.pkl'),
+                    os.path.join(models_dir, 'pokemon_model.pkl'))
+
+    npz_tmp = os.path.join(models_dir, 'pokemon_model.tmp.npz')
+    save_exported_model(export_model(model, scaler, pca, list(df.columns)), npz_tmp)
+    _atomic_publish(npz_tmp, os.path.join(models_dir, f'pokemon_model_v{version}.npz'),
+                    os.path.join(models_dir, 'pokemon_model.npz'))
+
+    manifest['latest'] = version
+    manifest['versions'].append(dict(report, version=version, published=time.strftime('%Y-%m-%dT%H:%M:%S')))
+    manifest_tmp = os.path.join(models_dir, MANIFEST_NAME + '.tmp')
+    with open(manifest_tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_tmp, os.path.join(models_dir, MANIFEST_NAME))
+    print(f"Published model version {version} to {models_dir}")
+    return version
+
+def main(new_data_path, compare_full=False, extra_trees=None, tolerance=TOLERANCE):
+    with open(new_data_path, 'r') as f:
+        new_data = json.load(f)
+    model_data = load_model()
+
+    refreshed, report = refresh_model(model_data, new_data, extra_trees, tolerance)
+    if refreshed is None:
+        print("No Pokemon changed; nothing to publish.")
+        return report
+
+    if compare_full:
+        start = time.perf_counter()
+        train_model(new_data, pair_features=model_pair_features(model_data[3].columns, new_data))
+        report['full_retrain_seconds'] = time.perf_counter() - start
+    else:
+        # Fall back to the most recent full retrain recorded in the manifest
+        previous = [v for v in read_manifest()['versions'] if 'full_retrain_seconds' in v]
+        report['full_retrain_seconds'] = previous[-1]['full_retrain_seconds'] if previous else None
+
+    publish_model(refreshed, report)
+    print("\n=== Refresh Report ===")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the move model for a new month of data.")
+    parser.add_argument('new_data', help="Path to the new month's gen9ou_full_data.json")
+    parser.add_argument('--compare-full', action='store_true',
+                        help="Also time a full retrain on the new data for comparison")
+    parser.add_argument('--extra-trees', type=int, default=None,
+                        help="Number of trees to replace (default scales with the changed share of pairs)")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="Change in a numeric feature, in training standard deviations, that marks a Pokemon as changed")
+    args = parser.parse_args()
+    main(args.new_data, compare_full=args.compare_full, extra_trees=args.extra_trees, tolerance=args.tolerance)
@@ -0,0 +1,232 @@
+import time
+import numpy as np
+from components.pokemon_index import build_name_index
+
+# Draws complete sets (4 moves, item, ability, spread, tera type) from the
+# per-Pokemon usage distributions in gen9ou_full_data.json. Every distribution
+# is turned into a Walker alias table once, padded into one 2-D array per
+# field, so sampling a batch is a couple of gathers and a comparison.
+
+SET_FIELDS = {'item': 'Items', 'ability': 'Abilities', 'spread': 'Spreads', 'tera': 'Tera Types'}
+N_MOVES = 4
+EMPTY = -1  # "Nothing" move slots and missing values
+# Duplicate move draws are redrawn this many times before the remaining rows
+# fall back to exact sampling without replacement
+MAX_REDRAWS = 8
+
+# --- Alias Tables ---
+def alias_table(weights):
+    """Walker/Vose alias table (prob, alias) for a 1-D array of non-negative weights."""
+    n = len(weights)
+    scaled = np.asarray(weights, dtype=np.float64) * n / np.sum(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
+
+def _code_dtype(n_values):
+    return np.int8 if n_values < 127 else np.int16 if n_values < 32767 else np.int32
+
+def _stack_tables(distributions, vocab):
+    # Pad every Pokemon's table to the widest one; size says how many columns are real
+    width = max(1, max(len(d) for d in distributions))
+    n = len(distributions)
+    tables = {
+        'prob': np.ones((n, width)),
+        'alias': np.zeros((n, width), dtype=np.int64),
+        'codes': np.full((n, width), EMPTY, dtype=np.int64),
+        'weights': np.zeros((n, width)),
+        'size': np.zeros(n, dtype=np.int64),
+    }
+    for i, dist in enumerate(distributions):
+        dist = {k: v for k, v in dist.items() if v > 0}
+        if not dist:
+            tables['size'][i] = 1
+            continue
+        prob, alias = alias_table(list(dist.values()))
+        k = len(dist)
+        tables['prob'][i, :k] = prob
+        tables['alias'][i, :k] = alias
+        tables['codes'][i, :k] = [vocab.get(value, EMPTY) for value in dist]
+        tables['weights'][i, :k] = list(dist.values())
+        tables['size'][i] = k
+    return tables
+
+def _draw(tables, rows, rng):
+    # Pick a column uniformly, then keep it or jump to its alias
+    size = tables['size'][rows]
+    col = np.minimum((rng.random(len(rows)) * size).astype(np.int64), size - 1)
+    keep = rng.random(len(rows)) < tables['prob'][rows, col]
+    col = np.where(keep, col, tables['alias'][rows, col])
+    return tables['codes'][rows, col]
+
+def _distribution(entry, field):
+    values = entry.get(field, {})
+    return values if isinstance(values, dict) else {}
+
+# --- Sampler ---
+def build_sampler(entries):
+    """Vocabularies and padded alias tables for every field of every Pokemon in one month of data."""
+    names, index = build_name_index(entries)
+    by_id = [None] * len(names)
+    for p in entries:
+        by_id[index[p["Pokemon"]]] = p
+
+    vocabs = {}
+    tables = {}
+    fields = dict(SET_FIELDS, move='Moves')
+    for key, field in fields.items():
+        values = sorted({v for p in by_id for v in _distribution(p, field)} - ({'Nothing'} if key == 'move' else set()))
+        vocabs[key] = values
+        tables[key] = _stack_tables([_distribution(p, field) for p in by_id], {v: i for i, v in enumerate(values)})
+    teammates = [{name: pct for name, pct in _distribution(p, 'Teammates').items() if name in index} for p in by_id]
+    tables['teammate'] = _stack_tables(teammates, index)
+    usage = np.array([p.get("Raw Count", 0) for p in by_id], dtype=np.float64)
+    return {'names': names, 'index': index, 'vocabs': vocabs, 'tables': tables, 'usage': usage}
+
+def _sample_moves(tables, pokemon, rng):
+    moves = np.empty((len(pokemon), N_MOVES), dtype=np.int64)
+    for slot in range(N_MOVES):
+        moves[:, slot] = _draw(tables, pokemon, rng)
+
+    def duplicated(rows):
+        m = moves[rows]
+        dup = np.zeros(m.shape, dtype=bool)
+        for a in range(1, N_MOVES):
+            for b in range(a):
+                dup[:, a] |= (m[:, a] == m[:, b]) & (m[:, a] != EMPTY)
+        return dup
+
+    pending = np.arange(len(pokemon))
+    for _ in range(MAX_REDRAWS):
+        dup = duplicated(pending)
+        pending = pending[dup.any(axis=1)]
+        if not pending.size:
+            return moves
+        rows, slots = np.nonzero(duplicated(pending))
+        moves[pending[rows], slots] = _draw(tables, pokemon[pending[rows]], rng)
+
+    # Rows that keep colliding (few distinct moves, one dominant) are sampled
+    # exactly without replacement with the Gumbel top-k trick
+    pending = pending[duplicated(pending).any(axis=1)]
+    if pending.size:
+        weights = tables['weights'][pokemon[pending]]
+        with np.errstate(divide='ignore'):
+            keys = np.log(weights) - np.log(-np.log(rng.random(weights.shape)))
+        top = np.argsort(-keys, axis=1)[:, :N_MOVES]
+        picked = np.take_along_axis(tables['codes'][pokemon[pending]], top, axis=1)
+        picked[np.take_along_axis(keys, top, axis=1) == -np.inf] = EMPTY
+        moves[pending] = picked
+    return moves
+
+def sample_sets(sampler, pokemon, seed=0):
+    """Draw one complete set for each Pokemon ID in `pokemon` (repeats allowed).
+
+    Returns compact integer arrays: pokemon, moves (n x 4, EMPTY for "Nothing"),
+    item, ability, spread and tera, coded against sampler['vocabs'].
+    """
+    rng = np.random.default_rng(seed)
+    pokemon = np.asarray(pokemon, dtype=np.int64)
+    tables = sampler['tables']
+    vocabs = sampler['vocabs']
+    sets = {'pokemon': pokemon.astype(_code_dtype(len(sampler['names'])))}
+    sets['moves'] = _sample_moves(tables['move'], pokemon, rng).astype(_code_dtype(len(vocabs['move'])))
+    for key in SET_FIELDS:
+        sets[key] = _draw(tables[key], pokemon, rng).astype(_code_dtype(len(vocabs[key])))
+    return sets
+
+def sample_teams(sampler, n_teams, anchors=None, team_size=6, seed=0):
+    """(n_teams, team_size) Pokemon IDs where each new member is a teammate of an existing one.
+
+    Teams start from `anchors` (an ID per team, or usage-weighted when None);
+    every further slot picks a random current member and draws from its
+    Teammates distribution, redrawing duplicates and falling back to overall
+    usage when a member's teammates are exhausted. `team_size` can be at most
+    the number of Pokemon with usage.
+    """
+    available = np.count_nonzero(sampler['usage'])
+    if not 1 <= team_size <= available:
+        raise ValueError(f"team_size must be between 1 and {available} (the Pokemon with usage)")
+    rng = np.random.default_rng(seed)
+    teammate_tables = sampler['tables']['teammate']
+    usage_prob, usage_alias = alias_table(sampler['usage'] + 1e-9)
+    usage_tables = {'prob': usage_prob[None], 'alias': usage_alias[None],
+                    'codes': np.arange(len(usage_prob))[None], 'size': np.array([len(usage_prob)])}
+    zeros = np.zeros(n_teams, dtype=np.int64)
+
+    teams = np.full((n_teams, team_size), EMPTY, dtype=np.int64)
+    teams[:, 0] = _draw(usage_tables, zeros, rng) if anchors is None else np.asarray(anchors, dtype=np.int64)
+    for slot in range(1, team_size):
+        pending = np.arange(n_teams)
+        for attempt in range(MAX_REDRAWS + 1):
+            if attempt < MAX_REDRAWS:
+                members = teams[pending, rng.integers(0, slot, size=len(pending))]
+                drawn = _draw(teammate_tables, members, rng)
+            else:
+                drawn = _draw(usage_tables, zeros[:len(pending)], rng)
+            ok = (drawn != EMPTY) & ~(teams[pending, :slot] == drawn[:, None]).any(axis=1)
+            teams[pending[ok], slot] = drawn[ok]
+            pending = pending[~ok]
+            if not pending.size:
+                break
+        # Usage fallback can still collide; redraw those rows a few times, then
+        # pick exactly among the Pokemon not on the team yet (Gumbel max)
+        for _ in range(MAX_REDRAWS):
+            if not pending.size:
+                break
+            drawn = _draw(usage_tables, zeros[:len(pending)], rng)
+            ok = ~(teams[pending, :slot] == drawn[:, None]).any(axis=1)
+            teams[pending[ok], slot] = drawn[ok]
+            pending = pending[~ok]
+        if pending.size:
+            with np.errstate(divide='ignore'):
+                keys = np.log(sampler['usage']) - np.log(-np.log(rng.random((len(pending), len(sampler['usage'])))))
+            np.put_along_axis(keys, teams[pending, :slot], -np.inf, axis=1)
+            teams[pending, slot] = keys.argmax(axis=1)
+    return teams.astype(_code_dtype(len(sampler['names'])))
+
+def sample_team_sets(sampler, n_teams, anchors=None, team_size=6, seed=0):
+    """Teammate-conditioned teams plus a full set per member, as (n_teams, team_size, ...) arrays."""
+    teams = sample_teams(sampler, n_teams, anchors, team_size, seed)
+    sets = sample_sets(sampler, teams.ravel(), seed + 1)
+    return {key: values.reshape((n_teams, team_size) + values.shape[1:]) for key, values in sets.items()}
+
+# --- Persistence ---
+def save_sets(path, sets, sampler):
+    """Write sampled arrays and the vocabularies needed to decode them to an .npz file."""
+    vocab_arrays = {f"vocab_{key}": np.asarray(values, dtype=str) for key, values in sampler['vocabs'].items()}
+    np.savez_compressed(path, names=np.asarray(sampler['names'], dtype=str), **vocab_arrays, **sets)
+
+def decode_set(sampler, sets, row):
+    """Readable dict for one sampled set (for checks and debugging)."""
+    vocabs = sampler['vocabs']
+    decoded = {'pokemon': sampler['names'][int(sets['pokemon'][row])],
+               'moves': [vocabs['move'][m] for m in sets['moves'][row] if m != EMPTY]}
+    for key in SET_FIELDS:
+        code = int(sets[key][row])
+        decoded[key] = vocabs[key][code] if code != EMPTY else None
+    return decoded
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.moveset_sampler
+    import json
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    sampler = build_sampler(data)
+    rng = np.random.default_rng(0)
+    pokemon = rng.integers(0, len(sampler['names']), size=1_000_000)
+    start = time.perf_counter()
+    sets = sample_sets(sampler, pokemon)
+    elapsed = time.perf_counter() - start
+    print(f"{len(pokemon) / elapsed:,.0f} sets/s")
+    print(decode_set(sampler, sets, 0))
+    start = time.perf_counter()
+    team_sets = sample_team_sets(sampler, 100_000)
+    print(f"{100_000 / (time.perf_counter() - start):,.0f} teams/s", [sampler['names'][i] for i in team_sets['pokemon'][0]])
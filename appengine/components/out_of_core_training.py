@@ -0,0 +1,182 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from pokemon_move_recommender import (
+    extract_features_from_full, is_threatened, confusion_counts, evaluation_report, save_report
+)
+
+# Pair rows are streamed to memory-mapped files in work_dir, so peak memory is
+# bounded by chunk_size rows instead of the full N^2 pair expansion.
+DEFAULT_CHUNK_SIZE = 50000
+N_COMPONENTS = 5  # PCA components, as in train_model; a chunk must hold at least this many rows
+
+# --- Pair Row Streaming ---
+def pokemon_feature_matrix(pokemon_data):
+    """Per-Pokemon feature matrix (N x F) and the feature keys, computed once."""
+    per_pokemon = [extract_features_from_full(p) for p in pokemon_data]
+    keys = list(per_pokemon[0].keys()) if per_pokemon else []
+    matrix = np.array([[f.get(k, 0) for k in keys] for f in per_pokemon], dtype=np.float64)
+    return matrix, keys
+
+def pair_label(p1, p2):
+    """Training label for (p1, p2), identical to the labelling in train_model."""
+    p1_moves = list(p1.get("Moves", {}).keys())
+    best_move = sorted(p1["Moves"].items(), key=lambda x: x[1], reverse=True)[0][0] if p1_moves else "SWITCH"
+    label = "SWITCH" if is_threatened(p1, p2["Pokemon"]) else best_move
+    if label != "SWITCH" and label not in p1_moves:
+        label = "SWITCH"
+    return label
+
+def iter_pair_chunks(pokemon_data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (p1 indices, p2 indices, labels) for every ordered pair, about chunk_size rows at a time."""
+    names = np.array([p["Pokemon"] for p in pokemon_data], dtype=object)
+    i1, i2, labels = [], [], []
+    for i, p1 in enumerate(pokemon_data):
+        others = np.flatnonzero(names != p1["Pokemon"])
+        i1.append(np.full(len(others), i))
+        i2.append(others)
+        labels.extend(pair_label(p1, pokemon_data[j]) for j in others)
+        if len(labels) >= chunk_size:
+            yield np.concatenate(i1), np.concatenate(i2), labels
+            i1, i2, labels = [], [], []
+    if labels:
+        yield np.concatenate(i1), np.concatenate(i2), labels
+
+def write_training_data(pokemon_data, work_dir, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream pair rows and integer labels into memory-mapped arrays under work_dir."""
+    os.makedirs(work_dir, exist_ok=True)
+    features, keys = pokemon_feature_matrix(pokemon_data)
+    columns = [f"p1_{k}" for k in keys] + [f"p2_{k}" for k in keys]
+
+    names = [p["Pokemon"] for p in pokemon_data]
+    counts = pd.Series(names).value_counts()
+    n_rows = int(sum(len(names) - counts[name] for name in names))
+
+    X = np.lib.format.open_memmap(os.path.join(work_dir, 'X.npy'), mode='w+',
+                                  dtype=np.float64, shape=(n_rows, len(columns)))
+    y = np.lib.format.open_memmap(os.path.join(work_dir, 'y.npy'), mode='w+',
+                                  dtype=np.int32, shape=(n_rows,))
+    class_index = {}
+    row = 0
+    for i1, i2, labels in iter_pair_chunks(pokemon_data, chunk_size):
+        end = row + len(labels)
+        X[row:end, :len(keys)] = features[i1]
+        X[row:end, len(keys):] = features[i2]
+        y[row:end] = [class_index.setdefault(label, len(class_index)) for label in labels]
+        row = end
+    X.flush()
+    y.flush()
+
+    meta = {'n_rows': n_rows, 'columns': columns, 'classes': list(class_index)}
+    with open(os.path.join(work_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    print(f"Wrote {n_rows} pair rows to {work_dir}")
+    return meta
+
+def open_training_data(work_dir):
+    """Open the memory-mapped pair rows written by write_training_data."""
+    with open(os.path.join(work_dir, 'meta.json'), 'r') as f:
+        meta = json.load(f)
+    X = np.load(os.path.join(work_dir, 'X.npy'), mmap_mode='r')
+    y = np.load(os.path.join(work_dir, 'y.npy'), mmap_mode='r')
+    return X, y, meta
+
+# --- Incremental Fitting ---
+def fit_scaler_and_pca(X, chunk_size=DEFAULT_CHUNK_SIZE, n_components=N_COMPONENTS):
+    """Fit StandardScaler and IncrementalPCA one chunk at a time."""
+    from sklearn.decomposition import IncrementalPCA
+    from sklearn.preprocessing import StandardScaler
+
+    if chunk_size < n_components:
+        raise ValueError(f"chunk_size must be at least n_components ({n_components})")
+
+    scaler = StandardScaler()
+    for start in range(0, len(X), chunk_size):
+        scaler.partial_fit(X[start:start + chunk_size])
+
+    pca = IncrementalPCA(n_components=n_components)
+    starts = list(range(0, len(X), chunk_size))
+    # IncrementalPCA needs at least n_components rows per batch, so a short tail joins the previous chunk
+    if len(starts) > 1 and len(X) - starts[-1] < n_components:
+        starts.pop()
+    for start, end in zip(starts, starts[1:] + [len(X)]):
+        pca.partial_fit(scaler.transform(X[start:end]))
+    return scaler, pca
+
+def write_projected(X, y, scaler, pca, work_dir, chunk_size=DEFAULT_CHUNK_SIZE, test_size=0.2, random_state=42):
+    """Project every row through scaler and PCA into a float32 memmap, train rows first.
+
+    Each row is equally likely to be a test row (ceil(n_rows * test_size) in
+    total) and the rows of each chunk are shuffled, so the train split is the
+    contiguous slice [:n_train] and can be handed to the classifier as a view.
+    Only chunk-sized index arrays are held, never a permutation of all rows.
+    """
+    n_rows = len(X)
+    n_test = int(np.ceil(n_rows * test_size))
+    n_train = n_rows - n_test
+    rng = np.random.default_rng(random_state)
+    starts = np.arange(0, n_rows, chunk_size)
+    sizes = np.minimum(chunk_size, n_rows - starts)
+    # Test rows per chunk, distributed as in a uniform random split of all rows
+    test_counts = rng.multivariate_hypergeometric(sizes, n_test)
+
+    X_pca = np.lib.format.open_memmap(os.path.join(work_dir, 'X_pca.npy'), mode='w+',
+                                      dtype=np.float32, shape=(n_rows, pca.n_components_))
+    y_shuffled = np.lib.format.open_memmap(os.path.join(work_dir, 'y_shuffled.npy'), mode='w+',
+                                           dtype=np.int32, shape=(n_rows,))
+    train_row, test_row = 0, n_train
+    for start, size, chunk_test in zip(starts, sizes, test_counts):
+        local = rng.permutation(size)
+        projected = pca.transform(scaler.transform(X[start:start + size]))[local]
+        labels = np.asarray(y[start:start + size])[local]
+        chunk_train = size - chunk_test
+        X_pca[train_row:train_row + chunk_train] = projected[:chunk_train]
+        y_shuffled[train_row:train_row + chunk_train] = labels[:chunk_train]
+        X_pca[test_row:test_row + chunk_test] = projected[chunk_train:]
+        y_shuffled[test_row:test_row + chunk_test] = labels[chunk_train:]
+        train_row += chunk_train
+        test_row += chunk_test
+    X_pca.flush()
+    y_shuffled.flush()
+    return X_pca, y_shuffled, n_train
+
+def train_model_out_of_core(pokemon_data, work_dir, chunk_size=DEFAULT_CHUNK_SIZE, n_estimators=50, report_path=None):
+    """Out-of-core counterpart of train_model; returns the same (clf, scaler, pca, df, pokemon_data) tuple.
+
+    `df` holds only a sample of the training rows (with the full column list),
+    since the complete pair table lives on disk.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    write_training_data(pokemon_data, work_dir, chunk_size)
+    X, y, meta = open_training_data(work_dir)
+    scaler, pca = fit_scaler_and_pca(X, chunk_size)
+    X_pca, y_codes, n_train = write_projected(X, y, scaler, pca, work_dir, chunk_size)
+
+    classes = np.array(meta['classes'], dtype=object)
+    clf = RandomForestClassifier(n_estimators=n_estimators, random_state=42, n_jobs=-1)
+    # Fit on the integer codes so no N^2 array of label strings is materialised,
+    # then relabel; forest predictions index into classes_.
+    clf.fit(X_pca[:n_train], y_codes[:n_train])
+    clf.classes_ = classes[clf.classes_]
+
+    # Confusion counts are accumulated chunk by chunk over the test slice
+    labels = np.sort(np.asarray(classes, dtype=str))
+    cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    for start in range(n_train, len(X_pca), chunk_size):
+        stop = min(start + chunk_size, len(X_pca))
+        cm += confusion_counts(classes[y_codes[start:stop]], clf.predict(X_pca[start:stop]), labels)[1]
+
+    distribution = np.zeros(len(classes), dtype=np.int64)
+    for start in range(0, len(y), chunk_size):
+        distribution += np.bincount(y[start:start + chunk_size], minlength=len(classes))
+    order = np.argsort(-distribution, kind='stable')
+    report = evaluation_report((labels, cm), {str(classes[i]): int(distribution[i]) for i in order})
+    report['pca_explained_variance'] = pca.explained_variance_ratio_.tolist()
+    report['n_train'] = int(n_train)
+    report['n_test'] = int(len(X_pca) - n_train)
+    save_report(report, report_path)
+
+    df = pd.DataFrame(np.asarray(X[:1000]), columns=meta['columns'])
+    return clf, scaler, pca, df, pokemon_data
@@ -0,0 +1,121 @@
+import re
+import numpy as np
+from scipy import sparse
+
+# Integer IDs for Pokemon names and sparse N x N matrices built from the
+# Teammates and Checks and Counters sections of gen9ou_full_data.json.
+
+COUNTER_SCORE_SUFFIX = re.compile(r"\s+\d+(\.\d+)?$")
+# Smogon form suffixes that are spelled differently in Pokemon.csv's Form column
+FORM_ALIASES = {'galar': 'galarian', 'alola': 'alolan', 'hisui': 'hisuian', 'paldea': 'combat', 'f': 'female'}
+
+def counter_name(raw_name):
+    """Strip the trailing score from a counter entry ("Great Tusk 70.123" -> "Great Tusk")."""
+    return COUNTER_SCORE_SUFFIX.sub("", raw_name).strip()
+
+def _as_months(datasets):
+    # A single month is a list of entry dicts; several months are a list of those
+    if datasets and isinstance(datasets[0], dict):
+        return [datasets]
+    return list(datasets)
+
+def build_name_index(datasets):
+    """Names ordered by total raw count (most used first) and a name -> ID dict."""
+    totals = {}
+    for month in _as_months(datasets):
+        for p in month:
+            totals[p["Pokemon"]] = totals.get(p["Pokemon"], 0) + p.get("Raw Count", 0)
+    names = sorted(totals, key=lambda name: totals[name], reverse=True)
+    return names, {name: i for i, name in enumerate(names)}
+
+def usage_vector(datasets, index):
+    """Raw count per Pokemon ID, summed over months."""
+    usage = np.zeros(len(index), dtype=np.float64)
+    for month in _as_months(datasets):
+        for p in month:
+            usage[index[p["Pokemon"]]] += p.get("Raw Count", 0)
+    return usage
+
+def _average_over_months(rows, cols, values, presence, n):
+    matrix = sparse.coo_matrix((values, (rows, cols)), shape=(n, n)).tocsr()
+    matrix.sum_duplicates()
+    # Average each row over the months in which that Pokemon appears
+    scale = np.divide(1.0, presence, out=np.zeros(n), where=presence > 0)
+    return sparse.diags(scale) @ matrix
+
+def teammate_matrix(datasets, index):
+    """CSR matrix T where T[i, j] is the % of i's teams that also run j."""
+    rows, cols, values = [], [], []
+    presence = np.zeros(len(index))
+    for month in _as_months(datasets):
+        for p in month:
+            i = index[p["Pokemon"]]
+            presence[i] += 1
+            teammates = p.get("Teammates", {})
+            if isinstance(teammates, str):
+                continue
+            for name, pct in teammates.items():
+                if name in index:
+                    rows.append(i)
+                    cols.append(index[name])
+                    values.append(pct)
+    return _average_over_months(rows, cols, values, presence, len(index)).tocsr()
+
+def counter_matrices(datasets, index, fields=("KOed", "Switched Out", "Score")):
+    """CSR matrices M[field][i, j] for counter j listed under Pokemon i's Checks and Counters."""
+    entries = {field: ([], [], []) for field in fields}
+    presence = np.zeros(len(index))
+    for month in _as_months(datasets):
+        for p in month:
+            i = index[p["Pokemon"]]
+            presence[i] += 1
+            counters = p.get("Checks and Counters", [])
+            if isinstance(counters, str):
+                continue
+            for c in counters:
+                j = index.get(counter_name(c.get("Name", "")))
+                if j is None:
+                    continue
+                for field in fields:
+                    rows, cols, values = entries[field]
+                    rows.append(i)
+                    cols.append(j)
+                    values.append(c.get(field) or 0.0)
+    return {field: _average_over_months(*entries[field], presence, len(index)).tocsr() for field in fields}
+
+def resolve_pokemon_rows(names, pokemon_df):
+    """Row index in Pokemon.csv for each Smogon name (e.g. "Slowking-Galar"), or -1 if unknown.
+
+    Tries the full name first (for names like "Kommo-o"), then splits off form
+    suffixes and picks the row whose Form mentions them, later suffixes
+    weighing more ("Tauros-Paldea-Blaze" -> "Blaze Breed").
+    """
+    by_name = {}
+    for row, (name, form) in enumerate(zip(pokemon_df['Name'], pokemon_df['Form'])):
+        by_name.setdefault(str(name).strip(), []).append((row, str(form).strip()))
+
+    def default_row(candidates):
+        blank = [row for row, form in candidates if not form]
+        return blank[0] if blank else candidates[0][0]
+
+    rows = np.full(len(names), -1, dtype=np.int64)
+    for k, full_name in enumerate(names):
+        if full_name in by_name:
+            rows[k] = default_row(by_name[full_name])
+            continue
+        parts = full_name.split('-')
+        for split in range(len(parts) - 1, 0, -1):
+            base = '-'.join(parts[:split])
+            if base not in by_name:
+                continue
+            tokens = [FORM_ALIASES.get(t.lower(), t.lower()) for t in parts[split:]]
+            best, best_score = None, 0
+            for row, form in by_name[base]:
+                words = re.split(r"[\s\-]+", form.lower())
+                score = sum(pos + 1 for pos, token in enumerate(tokens)
+                            if any(word.startswith(token) for word in words))
+                if score > best_score:
+                    best, best_score = row, score
+            rows[k] = best if best is not None else default_row(by_name[base])
+            break
+    return rows
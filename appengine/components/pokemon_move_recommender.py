@@ -2,14 +2,14 @@ import json
 import pandas as pd
 import pickle
 import os
-print("[INFO] Importing sklearn.decomposition.PCA...")
-from sklearn.decomposition import PCA
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, precision_score, recall_score, f1_score
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+REPORT_PATH = os.path.join(os.path.dirname(__file__), 'models', 'training_report.json')
+# A counter threatens a Pokemon when it both KOs and forces a switch often enough
+KO_THRESHOLD = 25
+SWITCH_THRESHOLD = 40
+
 # --- Feature Extraction ---
 def extract_features_from_full(p):
     """Extract features from Pokemon data with consistent feature names."""
@@ -52,7 +52,7 @@ def is_threatened(p1, p2_name):
         counters = []
     for counter in counters:
         if p2_name.lower() in counter.get("Name", "").lower():
-            return counter.get("KOed", 0) > 25 and counter.get("Switched Out", 0) > 40
+            return counter.get("KOed", 0) > KO_THRESHOLD and counter.get("Switched Out", 0) > SWITCH_THRESHOLD
     return False
 
 # --- Model Loading ---
@@ -79,7 +79,20 @@ def load_model():
         raise Exception(f"Error loading model: {str(e)}")
 
 # --- Model Training ---
-def train_model(pokemon_data):
+def train_model(pokemon_data, report_path=None, pair_features=None):
+    """Fit the move model on every ordered Pokemon pair.
+
+    `pair_features(p1, p2)` optionally adds "pair_"-prefixed columns computed
+    from both Pokemon at once (e.g. type_effectiveness.type_pair_features).
+    """
+    # sklearn is only needed for training; serving uses the exported arrays in
+    # forest_inference, so keep it out of the module import.
+    print("[INFO] Importing sklearn.decomposition.PCA...")
+    from sklearn.decomposition import PCA
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import train_test_split
+
     X_data = []
     y_data = []
 
@@ -92,6 +105,8 @@ def train_model(pokemon_data):
             f2 = extract_features_from_full(p2)
             row = {f"p1_{k}": v for k, v in f1.items()}
             row.update({f"p2_{k}": v for k, v in f2.items()})
+            if pair_features is not None:
+                row.update(pair_features(p1, p2))
 
             p1_moves = list(p1.get("Moves", {}).keys())
             best_move = sorted(p1["Moves"].items(), key=lambda x: x[1], reverse=True)[0][0] if p1_moves else "SWITCH"
@@ -110,80 +125,100 @@ def train_model(pokemon_data):
     pca = PCA(n_components=5)
     X_pca = pca.fit_transform(X_scaled)
 
-    X_train, X_test, y_train, y_test = train_test_split(X_pca, y_data, test_size=0.2, random_state=42)
-    clf = RandomForestClassifier(n_estimators=50, random_state=42)
-    clf.fit(X_train, y_train)
-
-    # Make predictions
-    y_pred = clf.predict(X_test)
-    
-    # Print classification metrics
-    print("\n=== Classification Metrics ===")
-    print("\nClassification Report:")
-    print(classification_report(y_test, y_pred))
-    
-    print("\nConfusion Matrix:")
-    print(confusion_matrix(y_test, y_pred))
-    
-    print("\nOverall Metrics:")
-    print(f"Accuracy: {accuracy_score(y_test, y_pred):.4f}")
-    print(f"Precision (weighted): {precision_score(y_test, y_pred, average='weighted'):.4f}")
-    print(f"Recall (weighted): {recall_score(y_test, y_pred, average='weighted'):.4f}")
-    print(f"F1 Score (weighted): {f1_score(y_test, y_pred, average='weighted'):.4f}")
-    
-    # Train a separate model on original features to get feature importance
-    X_train_orig, X_test_orig, y_train_orig, y_test_orig = train_test_split(X_scaled, y_data, test_size=0.2, random_state=42)
-    clf_orig = RandomForestClassifier(n_estimators=50, random_state=42)
-    clf_orig.fit(X_train_orig, y_train_orig)
-    
-    # Feature importance for original features
-    feature_importance = pd.DataFrame({
-        'feature': df.columns,
-        'importance': clf_orig.feature_importances_
-    })
-    feature_importance = feature_importance.sort_values('importance', ascending=False)
-    
-    print("\nTop 10 Most Important Features:")
-    print(feature_importance.head(10).to_string(index=False))
-    
-    # PCA explained variance
-    print("\nPCA Explained Variance:")
-    print(f"Total explained variance: {sum(pca.explained_variance_ratio_):.4f}")
-    for i, ratio in enumerate(pca.explained_variance_ratio_):
-        print(f"PC{i+1}: {ratio:.4f}")
-
-    # Class distribution
-    class_dist = pd.Series(y_data).value_counts()
-    print("\nClass Distribution (Top 10 most common moves):")
-    print(class_dist.head(10))
-
-    # Move performance summary
-    move_performance = []
-    for move in class_dist.index:
-        y_true_move = np.array(y_test) == move
-        y_pred_move = np.array(y_pred) == move
-        if np.any(y_true_move):  # Only calculate metrics if the move appears in test set
-            move_performance.append({
-                'Move': move,
-                'Count': class_dist[move],
-                'Precision': precision_score(y_true_move, y_pred_move, zero_division=0),
-                'Recall': recall_score(y_true_move, y_pred_move, zero_division=0),
-                'F1': f1_score(y_true_move, y_pred_move, zero_division=0)
-            })
-    
-    move_performance_df = pd.DataFrame(move_performance)
-    
-    print("\nTop 10 Best Performing Moves (by F1 score):")
-    print(move_performance_df.sort_values('F1', ascending=False).head(10).to_string(index=False))
-    
-    print("\nTop 10 Worst Performing Moves (by F1 score):")
-    print(move_performance_df.sort_values('F1').head(10).to_string(index=False))
+    # One split shared by both forests (same indices the two separate
+    # train_test_split calls used to produce)
+    y_data = np.asarray(y_data, dtype=object)
+    train_idx, test_idx = train_test_split(np.arange(len(y_data)), test_size=0.2, random_state=42)
+    y_train, y_test = y_data[train_idx], y_data[test_idx]
+
+    # The PCA forest is the served model; the forest on the scaled features is
+    # only for feature importances. Both fit at once, each across all cores.
+    clf = RandomForestClassifier(n_estimators=50, random_state=42, n_jobs=-1)
+    clf_orig = RandomForestClassifier(n_estimators=50, random_state=42, n_jobs=-1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        fit_pca = pool.submit(clf.fit, X_pca[train_idx], y_train)
+        fit_orig = pool.submit(clf_orig.fit, X_scaled[train_idx], y_train)
+        fit_pca.result()
+        fit_orig.result()
+
+    y_pred = clf.predict(X_pca[test_idx])
+
+    report = evaluation_report(confusion_counts(y_test, y_pred), class_counts(y_data))
+    report['feature_importance'] = dict(sorted(zip(df.columns, clf_orig.feature_importances_.tolist()),
+                                               key=lambda x: x[1], reverse=True))
+    report['pca_explained_variance'] = pca.explained_variance_ratio_.tolist()
+    report['n_train'] = len(train_idx)
+    report['n_test'] = len(test_idx)
+    save_report(report, report_path)
 
     return clf, scaler, pca, df, pokemon_data
 
+# --- Evaluation ---
+def class_counts(y):
+    """Label -> count, most common first."""
+    labels, counts = np.unique(np.asarray(y, dtype=str), return_counts=True)
+    order = np.argsort(-counts, kind='stable')
+    return dict(zip(labels[order].tolist(), counts[order].tolist()))
+
+def confusion_counts(y_true, y_pred, labels=None):
+    """Confusion matrix over the sorted union of labels; rows are true, columns predicted."""
+    y_true = np.asarray(y_true, dtype=str)
+    y_pred = np.asarray(y_pred, dtype=str)
+    if labels is None:
+        labels = np.union1d(y_true, y_pred)
+    labels = np.asarray(labels, dtype=str)
+    true_idx = np.searchsorted(labels, y_true)
+    pred_idx = np.searchsorted(labels, y_pred)
+    cm = np.bincount(true_idx * len(labels) + pred_idx, minlength=len(labels) ** 2)
+    return labels, cm.reshape(len(labels), len(labels))
+
+def evaluation_report(confusion, class_distribution):
+    """Accuracy, weighted and per-class precision/recall/F1, all derived from one confusion matrix."""
+    labels, cm = confusion
+    tp = np.diag(cm).astype(np.float64)
+    predicted = cm.sum(axis=0)
+    support = cm.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    weights = support / support.sum() if support.sum() else support
+
+    # Per-class rows only for moves that appear in the test set, best F1 first
+    present = np.flatnonzero(support > 0)
+    present = present[np.argsort(-f1[present], kind='stable')]
+    per_class = [{
+        'move': str(labels[i]),
+        'count': int(class_distribution.get(str(labels[i]), 0)),
+        'support': int(support[i]),
+        'precision': float(precision[i]),
+        'recall': float(recall[i]),
+        'f1': float(f1[i]),
+    } for i in present]
+
+    return {
+        'accuracy': float(tp.sum() / cm.sum()) if cm.sum() else 0.0,
+        'precision_weighted': float(precision @ weights),
+        'recall_weighted': float(recall @ weights),
+        'f1_weighted': float(f1 @ weights),
+        'per_class': per_class,
+        'class_distribution': class_distribution,
+        'confusion_matrix': {'labels': labels.tolist(), 'matrix': cm.tolist()},
+    }
+
+def save_report(report, report_path=None):
+    """Write the evaluation report as JSON next to the model artifacts."""
+    report_path = report_path or REPORT_PATH
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Accuracy: {report['accuracy']:.4f} | F1 (weighted): {report['f1_weighted']:.4f}")
+    print(f"Evaluation report written to {report_path}")
+
 # --- Prediction Function ---
-def build_predictor(model, scaler, pca, pokemon_data):
+def build_predictor(model, scaler, pca, pokemon_data, pair_features=None):
     name_to_features = {p["Pokemon"]: extract_features_from_full(p) for p in pokemon_data}
+    name_to_data = {p["Pokemon"]: p for p in pokemon_data}
 
     def recommend_move(pokemon_1_name, pokemon_2_name):
         if pokemon_1_name not in name_to_features or pokemon_2_name not in name_to_features:
@@ -201,12 +236,14 @@ def build_predictor(model, scaler, pca, pokemon_data):
         # Add Pokemon 2 features with p2_p1_ prefix
         for k, v in f2.items():
             features[f"p2_{k}"] = v
+        if pair_features is not None:
+            features.update(pair_features(name_to_data[pokemon_1_name], name_to_data[pokemon_2_name]))
 
         # Create DataFrame with all expected features
         df_row = pd.DataFrame([features])
         
-        # Ensure all expected features exist
-        expected_features = [
+        # Ensure all expected features exist (the scaler records the training columns)
+        expected_features = list(getattr(scaler, 'feature_names_in_', [])) or [
             'p1_p1_raw_count', 'p1_p1_viability_ceiling',
             'p1_p1_move_1', 'p1_p1_move_2', 'p1_p1_move_3', 'p1_p1_move_4',
             'p1_p1_avg_koed', 'p1_p1_avg_switched',
@@ -0,0 +1,130 @@
+import os
+import threading
+import pandas as pd
+from dash import html
+from components.data_loader import CUTOFFS, cutoff_file, dataset_version, load_gen9ou_cutoffs
+from components.brackets import build_bracket_store, bracket_entries
+from components.pokemon_move_recommender import load_model, get_pokemon_info, build_predictor, extract_features_from_full
+from components.forest_inference import EXPORT_PATH, load_exported_model, build_batch_predictor
+from components.batch_server import MicroBatcher
+from components.hot_reload import file_version, reloadable
+from components.type_effectiveness import build_type_engine, type_pair_features
+
+# The move recommender's background job. It lives outside pages/ so the job
+# queue's spawned pool processes can import it without building the Dash app.
+
+# Only the fields the move model and the detail view read
+RECOMMENDER_FIELDS = ('Pokemon', 'Raw Count', 'Viability Ceiling', 'Moves', 'Checks and Counters')
+MODEL_PATH = os.path.join(os.path.dirname(EXPORT_PATH), 'pokemon_model.pkl')
+
+# Jobs running at once in a pool process (JOB_THREADS in job_queue.py) are
+# coalesced into one forest predict per batching window
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', '32'))
+BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', '5'))
+
+def _pair_features(feature_names, pokemon_data):
+    # Only models trained with --type-features have "pair_" columns
+    if not any(name.startswith('pair_') for name in feature_names):
+        return None
+    engine = build_type_engine([p["Pokemon"] for p in pokemon_data], pd.read_csv("./components/data/Pokemon.csv"))
+    return type_pair_features(engine)
+
+def build_recommender():
+    """Load every rating cutoff and the move model; each bracket's predictor is built when first picked."""
+    store = build_bracket_store(load_gen9ou_cutoffs(fields=RECOMMENDER_FIELDS))
+    try:
+        # NumPy-only export: no sklearn import or unpickling on the request path
+        model = {'exported': load_exported_model()}
+    except FileNotFoundError:
+        model = {'pickled': load_model()}
+    return {'store': store, 'model': model, 'brackets': {}, 'lock': threading.Lock(), 'retired': False}
+
+def _build_bracket(model, pokemon_data):
+    """Predictor for one bracket's entries, behind one MicroBatcher shared by the process's jobs."""
+    if 'exported' in model:
+        exported = model['exported']
+        _, recommend_moves = build_batch_predictor(exported, pokemon_data, extract_features_from_full,
+                                                   _pair_features(exported['feature_names'], pokemon_data))
+    else:
+        forest, scaler, pca, _, _ = model['pickled']
+        recommend = build_predictor(forest, scaler, pca, pokemon_data,
+                                    _pair_features(getattr(scaler, 'feature_names_in_', []), pokemon_data))
+        recommend_moves = lambda pairs: [recommend(p1, p2) for p1, p2 in pairs]
+    batcher = MicroBatcher(recommend_moves, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS)
+    return {'pokemon_data': pokemon_data, 'batcher': batcher}
+
+def bracket_recommender(current, bracket):
+    """{'pokemon_data', 'batcher'} for a bracket (a cutoff or brackets.WEIGHTED) of one snapshot."""
+    with current['lock']:
+        if current['retired']:
+            raise RuntimeError("Recommender snapshot was replaced")
+        if bracket not in current['brackets']:
+            current['brackets'][bracket] = _build_bracket(current['model'], bracket_entries(current['store'], bracket))
+        return current['brackets'][bracket]
+
+def retire_recommender(old):
+    # Requests already queued on the old batchers are served before they stop
+    with old['lock']:
+        old['retired'] = True
+    for built in old['brackets'].values():
+        built['batcher'].close()
+
+def recommender_version():
+    return dataset_version([cutoff_file(c) for c in CUTOFFS]) + file_version([EXPORT_PATH, MODEL_PATH])
+
+# Built on the first job in each pool process, then rebuilt when the data or a model file changes
+# (each pool process runs its own reloader thread)
+recommender = reloadable('pokemon_recommender', recommender_version, build_recommender,
+                         retire=retire_recommender, lazy=True)
+
+def recommend(pair, bracket=0):
+    """(move recommendation, pokemon_data) for one bracket from one snapshot of the recommender."""
+    try:
+        built = bracket_recommender(recommender.get(), bracket)
+        return built['batcher'].submit(pair), built['pokemon_data']
+    except RuntimeError:
+        # The snapshot was swapped out and its batchers closed between get() and submit()
+        built = bracket_recommender(recommender.get(), bracket)
+        return built['batcher'].submit(pair), built['pokemon_data']
+
+def recommend_job(set_progress, n_clicks, pokemon1, pokemon2, bracket=0):
+    """Background callback body: the recommendation and both Pokemon's details in one bracket for the page."""
+    if n_clicks > 0 and pokemon1 and pokemon2:
+        try:
+            set_progress("Loading the model and predicting...")
+            recommendation, pokemon_data = recommend((pokemon1, pokemon2), bracket)
+
+            p1_info = get_pokemon_info(pokemon1, pokemon_data)
+            p2_info = get_pokemon_info(pokemon2, pokemon_data)
+
+            if not p1_info or not p2_info:
+                return "Error: One or both Pokemon not found."
+
+            recommendation_output = html.Div([
+                html.H3('Recommendation:'),
+                html.P(recommendation),
+                html.H4('Pokemon Details:'),
+                html.Div([
+                    html.Div([
+                        html.H5(f'{pokemon1} Stats:'),
+                        html.P(f'Raw Count: {p1_info["raw_count"]}'),
+                        html.P(f'Viability Ceiling: {p1_info["viability_ceiling"]}'),
+                    ], style={'marginRight': '20px'}),
+                    html.Div([
+                        html.H5(f'{pokemon2} Stats:'),
+                        html.P(f'Raw Count: {p2_info["raw_count"]}'),
+                        html.P(f'Viability Ceiling: {p2_info["viability_ceiling"]}'),
+                    ])
+                ], style={'display': 'flex', 'justifyContent': 'space-around'})
+            ])
+
+            return recommendation_output
+
+        except Exception as e:
+            print(f"Error in recommend_job: {str(e)}")
+            return html.Div([
+                html.H3('Error:'),
+                html.P(str(e))
+            ])
+
+    return ''
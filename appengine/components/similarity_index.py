@@ -0,0 +1,199 @@
+import time
+import numpy as np
+from components.pokemon_index import build_name_index, counter_name
+from components.stat_calculator import STATS, base_stat_matrix
+
+# "Find Pokemon like this one": each (month, Pokemon) becomes a vector of base
+# stats plus move, item, teammate and checks-and-counters usage profiles,
+# projected with PCA and L2-normalised, so top-k cosine similarity is one
+# matrix-vector product. New months are projected with the stored PCA and
+# appended without refitting.
+
+BLOCKS = ('stats', 'moves', 'items', 'teammates', 'counters')
+DEFAULT_COMPONENTS = 32
+
+# --- Features ---
+def _usage_block(entries, field, vocab):
+    lookup = {value: j for j, value in enumerate(vocab)}
+    block = np.zeros((len(entries), len(vocab)), dtype=np.float32)
+    for i, p in enumerate(entries):
+        usage = p.get(field, {})
+        if isinstance(usage, str):
+            continue
+        for key, pct in usage.items():
+            j = lookup.get(key)
+            if j is not None:
+                block[i, j] = pct / 100.0
+    return block
+
+def _counter_block(entries, vocab):
+    lookup = {value: j for j, value in enumerate(vocab)}
+    block = np.zeros((len(entries), len(vocab)), dtype=np.float32)
+    for i, p in enumerate(entries):
+        counters = p.get("Checks and Counters", [])
+        if isinstance(counters, str):
+            continue
+        for c in counters:
+            j = lookup.get(counter_name(c.get("Name", "")))
+            if j is not None:
+                block[i, j] = (c.get("Score") or 0.0) / 100.0
+    return block
+
+def feature_blocks(entries, vocabs, pokemon_df):
+    """Raw (unscaled) feature blocks for one month, rows in `entries` order."""
+    base = base_stat_matrix([p["Pokemon"] for p in entries], pokemon_df).astype(np.float32)
+    return {
+        'stats': base,
+        'moves': _usage_block(entries, "Moves", vocabs['moves']),
+        'items': _usage_block(entries, "Items", vocabs['items']),
+        'teammates': _usage_block(entries, "Teammates", vocabs['names']),
+        'counters': _counter_block(entries, vocabs['names']),
+    }
+
+def _scaled(blocks, scaling):
+    # Stats are z-scored (unknown typings/forms get the mean); every block is
+    # then divided by its average row norm so each contributes equally
+    stats = blocks['stats'].copy()
+    unknown = (stats < 0).any(axis=1)
+    stats[unknown] = scaling['stats_mean']
+    stats = (stats - scaling['stats_mean']) / scaling['stats_std']
+    parts = [stats / scaling['block_norm'][0]]
+    parts += [blocks[name] / scaling['block_norm'][k] for k, name in enumerate(BLOCKS) if k > 0]
+    return np.hstack(parts).astype(np.float32)
+
+def _month_slices(keys):
+    # Rows of one month are contiguous: label -> (start, end)
+    slices = {}
+    for r, (label, _) in enumerate(keys):
+        start, _ = slices.get(label, (r, r))
+        slices[label] = (start, r + 1)
+    return slices
+
+def _normalise(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+# --- Index ---
+def build_similarity_index(months, pokemon_df, n_components=DEFAULT_COMPONENTS):
+    """Fit the vocabularies, scaling and PCA on `months` ({label: entries}) and embed every row."""
+    from sklearn.decomposition import PCA
+
+    all_entries = [p for entries in months.values() for p in entries]
+    names, _ = build_name_index(all_entries)
+    vocabs = {
+        'names': names,
+        'moves': sorted({m for p in all_entries if isinstance(p.get("Moves"), dict) for m in p["Moves"]}),
+        'items': sorted({i for p in all_entries if isinstance(p.get("Items"), dict) for i in p["Items"]}),
+    }
+    blocks_by_month = {label: feature_blocks(entries, vocabs, pokemon_df) for label, entries in months.items()}
+
+    stats = np.vstack([b['stats'] for b in blocks_by_month.values()])
+    known = stats[(stats >= 0).all(axis=1)]
+    scaling = {'stats_mean': known.mean(axis=0), 'stats_std': known.std(axis=0) + 1e-6,
+               'block_norm': np.ones(len(BLOCKS), dtype=np.float32)}
+    widths = np.cumsum([0] + [len(STATS), len(vocabs['moves']), len(vocabs['items']), len(names), len(names)])
+    X = np.vstack([_scaled(b, scaling) for b in blocks_by_month.values()])
+    scaling['block_norm'] = np.array([max(np.linalg.norm(X[:, a:b], axis=1).mean(), 1e-6)
+                                      for a, b in zip(widths, widths[1:])], dtype=np.float32)
+
+    X = np.vstack([_scaled(b, scaling) for b in blocks_by_month.values()])
+    pca = PCA(n_components=min(n_components, *X.shape), random_state=42)
+    embeddings = _normalise(pca.fit_transform(X)).astype(np.float32)
+    keys = [(label, p["Pokemon"]) for label, entries in months.items() for p in entries]
+    return {
+        'vocabs': vocabs,
+        'scaling': scaling,
+        'pca_mean': pca.mean_.astype(np.float32),
+        'pca_components': pca.components_.astype(np.float32),
+        'explained_variance_ratio': pca.explained_variance_ratio_,
+        'keys': keys,
+        'lookup': {key: i for i, key in enumerate(keys)},
+        'month_slices': _month_slices(keys),
+        'embeddings': embeddings,
+    }
+
+def add_month(similarity_index, label, entries, pokemon_df):
+    """Project a new month with the stored vocabularies and PCA and append its rows (no refit).
+
+    Moves, items and Pokemon unseen at fit time carry no weight in the profile
+    blocks; rebuild the index when a month introduces many of them.
+    """
+    if label in similarity_index['month_slices']:
+        raise ValueError(f"Month {label} is already in the index")
+    X = _scaled(feature_blocks(entries, similarity_index['vocabs'], pokemon_df), similarity_index['scaling'])
+    embedded = _normalise((X - similarity_index['pca_mean']) @ similarity_index['pca_components'].T)
+    start = len(similarity_index['keys'])
+    for offset, p in enumerate(entries):
+        key = (label, p["Pokemon"])
+        similarity_index['keys'].append(key)
+        similarity_index['lookup'][key] = start + offset
+    similarity_index['month_slices'][label] = (start, start + len(entries))
+    similarity_index['embeddings'] = np.vstack([similarity_index['embeddings'], embedded.astype(np.float32)])
+    return similarity_index
+
+def save_similarity_index(similarity_index, path):
+    """Write the index to an .npz file."""
+    labels, names = zip(*similarity_index['keys'])
+    scaling = similarity_index['scaling']
+    np.savez(path, key_labels=np.asarray(labels, dtype=str), key_names=np.asarray(names, dtype=str),
+             **{f"vocab_{k}": np.asarray(v, dtype=str) for k, v in similarity_index['vocabs'].items()},
+             stats_mean=scaling['stats_mean'], stats_std=scaling['stats_std'], block_norm=scaling['block_norm'],
+             pca_mean=similarity_index['pca_mean'], pca_components=similarity_index['pca_components'],
+             explained_variance_ratio=similarity_index['explained_variance_ratio'],
+             embeddings=similarity_index['embeddings'])
+
+def load_similarity_index(path):
+    """Load an index written by save_similarity_index."""
+    with np.load(path, allow_pickle=False) as data:
+        keys = list(zip(data['key_labels'].tolist(), data['key_names'].tolist()))
+        return {
+            'vocabs': {k: data[f"vocab_{k}"].tolist() for k in ('names', 'moves', 'items')},
+            'scaling': {'stats_mean': data['stats_mean'], 'stats_std': data['stats_std'],
+                        'block_norm': data['block_norm']},
+            'pca_mean': data['pca_mean'],
+            'pca_components': data['pca_components'],
+            'explained_variance_ratio': data['explained_variance_ratio'],
+            'keys': keys,
+            'lookup': {key: i for i, key in enumerate(keys)},
+            'month_slices': _month_slices(keys),
+            'embeddings': data['embeddings'],
+        }
+
+# --- Queries ---
+def most_similar(similarity_index, name, label, k=10, same_month=True):
+    """Top-k (label, name, cosine similarity) neighbours of `name` in month `label`."""
+    i = similarity_index['lookup'].get((label, name))
+    if i is None:
+        raise KeyError(f"Unknown Pokemon for {label}: {name}")
+    embeddings = similarity_index['embeddings']
+    start, end = similarity_index['month_slices'][label] if same_month else (0, len(embeddings))
+    scores = embeddings[start:end] @ embeddings[i]
+    if start <= i < end:
+        scores[i - start] = -np.inf
+    k = min(k, int(np.isfinite(scores).sum()))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(*similarity_index['keys'][start + j], float(scores[j])) for j in top]
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.similarity_index
+    import json
+    import pandas as pd
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    pokemon_df = pd.read_csv("components/data/Pokemon.csv")
+    similarity_index = build_similarity_index({'2025-02': data}, pokemon_df)
+    print(f"Explained variance: {similarity_index['explained_variance_ratio'].sum():.2f}")
+    for name in ("Great Tusk", "Gholdengo", "Dragapult"):
+        print(name, [(n, round(s, 3)) for _, n, s in most_similar(similarity_index, name, '2025-02', k=5)])
+
+    # Incremental add: 10 more months projected with the same PCA
+    start = time.perf_counter()
+    for month in range(10):
+        add_month(similarity_index, f"extra-{month}", data, pokemon_df)
+    print(f"Added 10 months in {(time.perf_counter() - start) * 1000:.0f} ms; "
+          f"{len(similarity_index['keys'])} rows")
+    start = time.perf_counter()
+    for _ in range(1000):
+        most_similar(similarity_index, "Great Tusk", 'extra-9', k=10, same_month=False)
+    print(f"{(time.perf_counter() - start) * 1000:.3f} us per query over all months")
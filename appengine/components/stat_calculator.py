@@ -0,0 +1,169 @@
+import numpy as np
+from components.pokemon_index import build_name_index, resolve_pokemon_rows
+
+# EV spreads ("Jolly:0/252/0/0/4/252") decoded into integer arrays, level-100
+# stats for every (Pokemon, spread) in one vectorized pass, and a sorted speed
+# tier index for "who outspeeds X" queries.
+
+STATS = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+LEVEL = 100
+IV = 31
+SHEDINJA_HP = 1
+
+# Natures in the usual 5 x 5 grid: row = raised stat, column = lowered stat,
+# both in the order Attack, Defense, Speed, Sp. Atk, Sp. Def
+NATURES = ['Hardy', 'Lonely', 'Brave', 'Adamant', 'Naughty',
+           'Bold', 'Docile', 'Relaxed', 'Impish', 'Lax',
+           'Timid', 'Hasty', 'Serious', 'Jolly', 'Naive',
+           'Modest', 'Mild', 'Quiet', 'Bashful', 'Rash',
+           'Calm', 'Gentle', 'Sassy', 'Careful', 'Quirky']
+NATURE_INDEX = {name: i for i, name in enumerate(NATURES)}
+_GRID_STATS = [1, 2, 5, 3, 4]
+
+def nature_multipliers():
+    """(25, 6) int array of nature multipliers x10 (9, 10 or 11) in STATS order."""
+    mult = np.full((len(NATURES), len(STATS)), 10, dtype=np.int64)
+    for i in range(len(NATURES)):
+        raised, lowered = _GRID_STATS[i // 5], _GRID_STATS[i % 5]
+        if raised != lowered:
+            mult[i, raised] = 11
+            mult[i, lowered] = 9
+    return mult
+
+NATURE_MULTIPLIERS = nature_multipliers()
+
+# --- Spreads ---
+def parse_spread(spread):
+    """("Jolly:0/252/0/0/4/252") -> (nature ID, tuple of six EVs), or None for "Other" / malformed."""
+    nature, sep, evs = spread.partition(':')
+    if not sep or nature not in NATURE_INDEX:
+        return None
+    values = evs.split('/')
+    if len(values) != len(STATS) or not all(v.isdigit() for v in values):
+        return None
+    return NATURE_INDEX[nature], tuple(int(v) for v in values)
+
+def build_spread_arrays(entries, index=None):
+    """Decode every Pokemon's Spreads into flat arrays (one row per parsed spread).
+
+    Returns pokemon (int32 ID), nature (int8), evs (int16, n x 6) and
+    weight (float32 usage %) sorted by Pokemon ID, then by weight descending.
+    """
+    if index is None:
+        _, index = build_name_index(entries)
+    pokemon, natures, evs, weights = [], [], [], []
+    for p in entries:
+        spreads = p.get("Spreads", {})
+        if isinstance(spreads, str):
+            continue
+        for spread, pct in sorted(spreads.items(), key=lambda x: x[1], reverse=True):
+            parsed = parse_spread(spread)
+            if parsed is None:
+                continue
+            pokemon.append(index[p["Pokemon"]])
+            natures.append(parsed[0])
+            evs.append(parsed[1])
+            weights.append(pct)
+    order = np.argsort(np.asarray(pokemon, dtype=np.int32), kind='stable')
+    return {
+        'pokemon': np.asarray(pokemon, dtype=np.int32)[order],
+        'nature': np.asarray(natures, dtype=np.int8)[order],
+        'evs': np.asarray(evs, dtype=np.int16).reshape(-1, len(STATS))[order],
+        'weight': np.asarray(weights, dtype=np.float32)[order],
+    }
+
+# --- Stats ---
+def base_stat_matrix(names, pokemon_df):
+    """(N, 6) base stats for each name from Pokemon.csv; rows of -1 for unknown names."""
+    rows = resolve_pokemon_rows(names, pokemon_df)
+    table = pokemon_df[STATS].to_numpy(dtype=np.int64)
+    base = np.full((len(names), len(STATS)), -1, dtype=np.int64)
+    base[rows >= 0] = table[rows[rows >= 0]]
+    return base
+
+def compute_stats(base, evs, nature, level=LEVEL, ivs=IV):
+    """Final stats for rows of base stats, EVs and nature IDs (integer game formula)."""
+    base = np.asarray(base, dtype=np.int64)
+    raw = (2 * base + ivs + np.asarray(evs, dtype=np.int64) // 4) * level // 100
+    stats = (raw + 5) * NATURE_MULTIPLIERS[np.asarray(nature, dtype=np.int64)] // 10
+    stats[:, 0] = raw[:, 0] + level + 10
+    stats[base[:, 0] == SHEDINJA_HP, 0] = SHEDINJA_HP
+    return stats
+
+def spread_stats(spreads, base):
+    """Level-100 stats for every decoded spread; rows whose Pokemon has no base stats are -1."""
+    rows_base = base[spreads['pokemon']]
+    stats = compute_stats(rows_base, spreads['evs'], spreads['nature'])
+    stats[(rows_base < 0).any(axis=1)] = -1
+    return stats
+
+# --- Speed Tiers ---
+def stage_multiplier(stage):
+    """Stat stage multiplier as (numerator, denominator): +1 -> 3/2, -1 -> 2/3."""
+    return (2 + stage, 2) if stage >= 0 else (2, 2 - stage)
+
+def boosted(stat, stage):
+    num, den = stage_multiplier(stage)
+    return np.asarray(stat, dtype=np.int64) * num // den
+
+def build_speed_tiers(spreads, stats, names):
+    """Speed of every (Pokemon, spread), sorted ascending for binary search."""
+    valid = stats[:, 5] >= 0
+    order = np.argsort(stats[valid, 5], kind='stable')
+    return {
+        'speed': stats[valid, 5][order],
+        'pokemon': spreads['pokemon'][valid][order],
+        'weight': spreads['weight'][valid][order],
+        'names': names,
+        'index': {name: i for i, name in enumerate(names)},
+    }
+
+def target_speed(tiers, spreads, stats, name, spread='most_common'):
+    """Speed of `name` with its most common parsed spread, or its fastest (spread='fastest')."""
+    pid = tiers['index'][name]
+    rows = np.flatnonzero((spreads['pokemon'] == pid) & (stats[:, 5] >= 0))
+    if not rows.size:
+        raise KeyError(f"No parsed spreads for {name}")
+    if spread == 'fastest':
+        return int(stats[rows, 5].max())
+    return int(stats[rows[np.argmax(spreads['weight'][rows])], 5])
+
+def outspeeds(tiers, speed, stage=0, min_weight=0.0):
+    """Pokemon with a spread (at `stage` boosts) strictly faster than `speed`, fastest first.
+
+    One searchsorted per call when stage is 0; boosted queries rescale the
+    threshold instead of the index (ceil(speed * den / num) keeps it exact).
+    """
+    num, den = stage_multiplier(stage)
+    # boosted(s) > speed  <=>  s * num // den > speed  <=>  s >= ceil((speed + 1) * den / num)
+    threshold = -(-(int(speed) + 1) * den // num)
+    start = np.searchsorted(tiers['speed'], threshold, side='left')
+    found = {}
+    for k in range(len(tiers['speed']) - 1, start - 1, -1):
+        if tiers['weight'][k] < min_weight:
+            continue
+        pid = int(tiers['pokemon'][k])
+        if pid not in found:
+            found[pid] = int(boosted(tiers['speed'][k], stage))
+    return [(tiers['names'][pid], s) for pid, s in found.items()]
+
+def who_outspeeds(tiers, spreads, stats, name, target_stage=1, stage=0, min_weight=0.0):
+    """Who outspeeds `name` after it reaches `target_stage` (e.g. +1 after a Dragon Dance)."""
+    speed = int(boosted(target_speed(tiers, spreads, stats, name), target_stage))
+    return speed, outspeeds(tiers, speed, stage, min_weight)
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.stat_calculator
+    import json
+    import time
+    import pandas as pd
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    names, index = build_name_index(data)
+    spreads = build_spread_arrays(data, index)
+    start = time.perf_counter()
+    stats = spread_stats(spreads, base_stat_matrix(names, pd.read_csv("components/data/Pokemon.csv")))
+    print(f"{len(stats)} spreads in {(time.perf_counter() - start) * 1000:.2f} ms")
+    tiers = build_speed_tiers(spreads, stats, names)
+    speed, faster = who_outspeeds(tiers, spreads, stats, "Dragonite", target_stage=1, min_weight=5.0)
+    print(f"+1 Dragonite: {speed} Speed, outsped by {faster[:10]}")
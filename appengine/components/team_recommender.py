@@ -0,0 +1,131 @@
+import time
+import numpy as np
+from scipy import sparse
+from components.pokemon_index import build_name_index, usage_vector, teammate_matrix, counter_matrices
+
+# Team builder: given 1-5 Pokemon, fill the team with a beam search that
+# scores teammate co-occurrence and coverage of the most used threats.
+
+# --- Index ---
+def build_team_index(datasets, n_threats=100):
+    """Precompute the sparse co-occurrence matrix and threat answers for one or more months."""
+    names, index = build_name_index(datasets)
+    teammates = teammate_matrix(datasets, index)
+    # Teammate % is asymmetric (share of i's teams running j); average both directions
+    synergy = ((teammates + teammates.T) / 2.0).tocsr()
+    score = counter_matrices(datasets, index, fields=("Score",))["Score"]
+
+    usage = usage_vector(datasets, index)
+    threats = np.argsort(-usage, kind='stable')[:n_threats]
+    # answers[m, k]: Pokemon m is listed as a check or counter to threat k
+    answers = (score[threats] > 0).T.toarray()
+    return {
+        'names': names,
+        'index': index,
+        'synergy': synergy,
+        'threats': threats,
+        'answers': answers,
+    }
+
+def save_team_index(team_index, path):
+    """Save a team index to an .npz file so the web app can load it without the raw data."""
+    synergy = team_index['synergy']
+    np.savez(path, names=np.asarray(team_index['names'], dtype=str),
+             synergy_data=synergy.data, synergy_indices=synergy.indices, synergy_indptr=synergy.indptr,
+             threats=team_index['threats'], answers=team_index['answers'])
+
+def load_team_index(path):
+    """Load a team index written by save_team_index."""
+    with np.load(path, allow_pickle=False) as data:
+        names = data['names'].tolist()
+        synergy = sparse.csr_matrix((data['synergy_data'], data['synergy_indices'], data['synergy_indptr']),
+                                    shape=(len(names), len(names)))
+        return {
+            'names': names,
+            'index': {name: i for i, name in enumerate(names)},
+            'synergy': synergy,
+            'threats': data['threats'],
+            'answers': data['answers'],
+        }
+
+# --- Beam Search ---
+def _team_score(synergy_total, team_size, coverage, coverage_weight):
+    pairs = team_size * (team_size - 1) / 2
+    avg_synergy = synergy_total / pairs if pairs else 0.0
+    return avg_synergy / 100.0 + coverage_weight * coverage
+
+def recommend_team(team_index, chosen, team_size=6, beam_width=8, n_candidates=40, coverage_weight=0.25, n_results=3):
+    """Complete a team from the chosen Pokemon names.
+
+    Each beam state keeps its pairwise synergy total and a boolean mask of the
+    threats it answers, so expanding a state only costs one sparse row sum and
+    one OR over the candidate rows.
+    """
+    index = team_index['index']
+    unknown = [name for name in chosen if name not in index]
+    if unknown:
+        raise KeyError(f"Unknown Pokemon: {', '.join(unknown)}")
+    ids = list(dict.fromkeys(index[name] for name in chosen))
+    if not 1 <= len(ids) <= team_size - 1:
+        raise ValueError(f"Choose between 1 and {team_size - 1} different Pokemon")
+
+    synergy = team_index['synergy']
+    answers = team_index['answers']
+    n_threats = answers.shape[1]
+    start_synergy = synergy[ids][:, ids].sum() / 2.0
+    start_covered = answers[ids].any(axis=0)
+    beam = [(tuple(ids), start_synergy, start_covered)]
+
+    for _ in range(team_size - len(ids)):
+        expanded = {}
+        for team, synergy_total, covered in beam:
+            affinity = np.asarray(synergy[list(team)].sum(axis=0)).ravel()
+            affinity[list(team)] = -np.inf
+            k = min(n_candidates, len(affinity) - len(team))
+            candidates = np.argpartition(-affinity, k - 1)[:k]
+            new_synergy = synergy_total + affinity[candidates]
+            new_covered = covered | answers[candidates]
+            coverage = new_covered.sum(axis=1) / n_threats
+            scores = _team_score(new_synergy, len(team) + 1, coverage, coverage_weight)
+            for c, total, mask, score in zip(candidates, new_synergy, new_covered, scores):
+                key = tuple(sorted(team + (int(c),)))
+                if key not in expanded or expanded[key][0] < score:
+                    expanded[key] = (score, team + (int(c),), total, mask)
+        best = sorted(expanded.values(), key=lambda state: state[0], reverse=True)[:beam_width]
+        beam = [(team, total, mask) for _, team, total, mask in best]
+
+    names = team_index['names']
+    threats = team_index['threats']
+    results = []
+    for team, total, covered in beam[:n_results]:
+        coverage = covered.sum() / n_threats
+        results.append({
+            'team': [names[i] for i in team],
+            'score': float(_team_score(total, len(team), coverage, coverage_weight)),
+            'avg_teammate_pct': float(total / (len(team) * (len(team) - 1) / 2)),
+            'threat_coverage': float(coverage),
+            'uncovered_threats': [names[threats[k]] for k in np.flatnonzero(~covered)],
+        })
+    return results
+
+def benchmark(team_index, n_queries=500, seed=0):
+    """Latency percentiles (ms) for random 1-5 Pokemon queries drawn from the threat list."""
+    rng = np.random.default_rng(seed)
+    pool = [team_index['names'][i] for i in team_index['threats']]
+    timings = []
+    for _ in range(n_queries):
+        chosen = list(rng.choice(pool, size=rng.integers(1, 6), replace=False))
+        start = time.perf_counter()
+        recommend_team(team_index, chosen)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    p50, p99 = np.percentile(timings, [50, 99])
+    return {'queries': n_queries, 'p50_ms': float(p50), 'p99_ms': float(p99), 'max_ms': float(max(timings))}
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.team_recommender
+    import json
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    team_index = build_team_index(data)
+    print(recommend_team(team_index, ["Great Tusk", "Kingambit"])[0])
+    print(benchmark(team_index))
@@ -0,0 +1,101 @@
+import time
+import itertools
+import numpy as np
+from components.pokemon_index import build_name_index, counter_matrices
+
+# Batch team-vs-team scoring. matrix[i, j] is how much better Pokemon i does
+# against j than j does against i, from the Checks and Counters KOed and
+# Switched Out percentages. A team pairing is scored from the 6 x 6 block of
+# that matrix between the two teams.
+
+AGGREGATIONS = ('best_answer', 'mean')
+DEFAULT_CHUNK_SIZE = 4096
+
+# --- Matrix ---
+def build_matchup_matrix(datasets):
+    """Dense antisymmetric float32 matrix of pairwise advantages in [-1, 1], plus names and index."""
+    names, index = build_name_index(datasets)
+    counters = counter_matrices(datasets, index, fields=("KOed", "Switched Out"))
+    # forces_out[i, j]: share of j's matchups against i that end with j KOed or switched out
+    forces_out = ((counters["KOed"] + counters["Switched Out"]).T.toarray() / 100.0).clip(0.0, 1.0)
+    return {'names': names, 'index': index, 'matrix': (forces_out - forces_out.T).astype(np.float32)}
+
+def team_array(index, teams):
+    """2-D int array of Pokemon IDs from lists of names."""
+    unknown = sorted({name for team in teams for name in team if name not in index})
+    if unknown:
+        raise KeyError(f"Unknown Pokemon: {', '.join(unknown)}")
+    return np.array([[index[name] for name in team] for team in teams], dtype=np.int64)
+
+def team_combinations(shortlist_ids, team_size=6):
+    """Every `team_size`-combination of a shortlist of Pokemon IDs as a (n_teams, team_size) array."""
+    shortlist_ids = np.asarray(shortlist_ids, dtype=np.int64)
+    combos = itertools.combinations(range(len(shortlist_ids)), team_size)
+    flat = np.fromiter(itertools.chain.from_iterable(combos), dtype=np.int64)
+    return shortlist_ids[flat.reshape(-1, team_size)]
+
+# --- Scoring ---
+def _profiles(matrix, teams, aggregation):
+    # profile[t, j]: how team t fares against Pokemon j, either its best answer
+    # (max over members) or the average member
+    rows = matrix[teams]
+    return rows.max(axis=1) if aggregation == 'best_answer' else rows.mean(axis=1)
+
+def iter_team_scores(matchup, teams, opponents, aggregation='best_answer', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (start, scores) where scores[t, o] rates teams[start + t] against opponents[o].
+
+    A score is the team's average advantage over the opponent's members minus
+    the opponent's average advantage over the team's. Both aggregations reduce
+    over one team first, so each pairing costs a gather of 2 x 6 values rather
+    than the full 6 x 6 block.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"aggregation must be one of {AGGREGATIONS}")
+    matrix = matchup['matrix']
+    teams = np.asarray(teams, dtype=np.int64)
+    opponents = np.asarray(opponents, dtype=np.int64)
+    opponent_profiles = _profiles(matrix, opponents, aggregation)
+    # Our profiles are only read at the opponents' members, so gather just those
+    # columns once instead of a (chunk, 6, N) block per chunk
+    columns, local = np.unique(opponents, return_inverse=True)
+    local = local.reshape(opponents.shape)
+    against_opponents = np.ascontiguousarray(matrix[:, columns])
+    for start in range(0, len(teams), chunk_size):
+        chunk = teams[start:start + chunk_size]
+        ours = _profiles(against_opponents, chunk, aggregation)[:, local].mean(axis=2)
+        theirs = opponent_profiles[:, chunk].mean(axis=2).T
+        yield start, ours - theirs
+
+def score_teams(matchup, teams, opponents, aggregation='best_answer', chunk_size=DEFAULT_CHUNK_SIZE, top_k=10):
+    """Average score of each team over the opponent pool, and the top_k teams by it."""
+    averages = np.empty(len(teams), dtype=np.float64)
+    for start, scores in iter_team_scores(matchup, teams, opponents, aggregation, chunk_size):
+        averages[start:start + len(scores)] = scores.mean(axis=1)
+    best = np.argsort(-averages, kind='stable')[:top_k]
+    names = matchup['names']
+    return {
+        'average_scores': averages,
+        'top_teams': [([names[i] for i in teams[t]], float(averages[t])) for t in best],
+    }
+
+def benchmark(matchup, teams, opponents, aggregation='best_answer'):
+    """Team pairs scored per second when streaming every pairing."""
+    start = time.perf_counter()
+    for _ in iter_team_scores(matchup, teams, opponents, aggregation):
+        pass
+    elapsed = time.perf_counter() - start
+    pairs = len(teams) * len(opponents)
+    return {'pairs': pairs, 'seconds': elapsed, 'pairs_per_second': pairs / elapsed}
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.team_scoring
+    import json
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    matchup = build_matchup_matrix(data)
+    teams = team_combinations(np.arange(20))
+    rng = np.random.default_rng(0)
+    opponents = np.array([rng.choice(100, size=6, replace=False) for _ in range(100)])
+    print(score_teams(matchup, teams, opponents, top_k=3)['top_teams'])
+    for aggregation in AGGREGATIONS:
+        print(aggregation, benchmark(matchup, teams, opponents, aggregation))
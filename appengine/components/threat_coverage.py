@@ -0,0 +1,140 @@
+import time
+import numpy as np
+from components.pokemon_index import build_name_index, usage_vector, counter_matrices
+from components.pokemon_move_recommender import KO_THRESHOLD, SWITCH_THRESHOLD
+
+# Threat coverage as fixed-width bitsets: row i of `checks` has bit k set when
+# Pokemon i checks or counters threat k (same KOed / Switched Out thresholds as
+# is_threatened). Team coverage is an OR of at most six rows.
+
+WORD_BITS = 64
+
+# --- Bitset Helpers ---
+def pack_rows(bool_matrix):
+    """Pack a boolean (rows x bits) matrix into uint64 words, bit k of row i -> word k // 64."""
+    n_rows, n_bits = bool_matrix.shape
+    n_words = max(1, -(-n_bits // WORD_BITS))
+    padded = np.zeros((n_rows, n_words * WORD_BITS), dtype=bool)
+    padded[:, :n_bits] = bool_matrix
+    packed = np.packbits(padded, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64)
+
+def unpack_bits(words, n_bits):
+    """Indices of the set bits in a 1-D word array."""
+    bits = np.unpackbits(words.astype('<u8').view(np.uint8), bitorder='little')[:n_bits]
+    return np.flatnonzero(bits)
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words, axis=-1):
+        """Number of set bits along `axis`."""
+        return np.bitwise_count(words).sum(axis=axis, dtype=np.int64)
+else:
+    _BYTE_COUNTS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(words, axis=-1):
+        """Number of set bits along `axis` (byte lookup table for NumPy < 2.0)."""
+        counts = _BYTE_COUNTS[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.int64)
+        return counts.sum(axis=axis)
+
+# --- Index ---
+def build_coverage_index(datasets, n_threats=100, ko_threshold=KO_THRESHOLD, switch_threshold=SWITCH_THRESHOLD):
+    """Encode, per Pokemon, the set of top-`n_threats` Pokemon it checks or counters."""
+    names, index = build_name_index(datasets)
+    counters = counter_matrices(datasets, index, fields=("KOed", "Switched Out"))
+    usage = usage_vector(datasets, index)
+    threats = np.argsort(-usage, kind='stable')[:n_threats]
+
+    # counters[...][t, m] describes how m fares against t; transpose so rows are the checker
+    checks = ((counters["KOed"][threats] > ko_threshold)
+              .multiply(counters["Switched Out"][threats] > switch_threshold)).T.toarray()
+    return {
+        'names': names,
+        'index': index,
+        'threats': threats,
+        'checks': pack_rows(checks),
+        'all_threats': pack_rows(np.ones((1, len(threats)), dtype=bool))[0],
+    }
+
+def _team_ids(coverage, team):
+    index = coverage['index']
+    unknown = [name for name in team if name not in index]
+    if unknown:
+        raise KeyError(f"Unknown Pokemon: {', '.join(unknown)}")
+    return np.fromiter((index[name] for name in team), dtype=np.int64, count=len(team))
+
+def _decode(coverage, words):
+    threats = coverage['threats']
+    return [coverage['names'][threats[k]] for k in unpack_bits(words, len(threats))]
+
+# --- Queries ---
+def covered_bits(coverage, team_ids):
+    """Bitset of threats checked by at least one team member."""
+    return np.bitwise_or.reduce(coverage['checks'][team_ids], axis=0)
+
+def uncovered_threats(coverage, team):
+    """Top threats that nothing on the team checks or counters."""
+    uncovered = coverage['all_threats'] & ~covered_bits(coverage, _team_ids(coverage, team))
+    return _decode(coverage, uncovered)
+
+def team_coverage(coverage, team):
+    """Per-member checked threats, plus the team's covered and uncovered threats."""
+    ids = _team_ids(coverage, team)
+    covered = covered_bits(coverage, ids)
+    return {
+        'members': {name: _decode(coverage, coverage['checks'][i]) for name, i in zip(team, ids)},
+        'covered': _decode(coverage, covered),
+        'uncovered': _decode(coverage, coverage['all_threats'] & ~covered),
+    }
+
+def best_additions(coverage, team, k=5):
+    """The k Pokemon that would check the most currently uncovered threats."""
+    ids = _team_ids(coverage, team)
+    uncovered = coverage['all_threats'] & ~covered_bits(coverage, ids)
+    gains = popcount(coverage['checks'] & uncovered)
+    gains[ids] = -1
+    top = np.argsort(-gains, kind='stable')[:k]
+    return [(coverage['names'][i], int(gains[i])) for i in top if gains[i] > 0]
+
+def greedy_cover(coverage, team, team_size=6):
+    """Greedy set cover: repeatedly add the Pokemon that checks the most remaining threats."""
+    ids = list(_team_ids(coverage, team))
+    uncovered = coverage['all_threats'] & ~covered_bits(coverage, ids)
+    additions = []
+    while len(ids) < team_size and popcount(uncovered):
+        gains = popcount(coverage['checks'] & uncovered)
+        gains[ids] = -1
+        best = int(np.argmax(gains))
+        if gains[best] <= 0:
+            break
+        ids.append(best)
+        additions.append((coverage['names'][best], int(gains[best])))
+        uncovered &= ~coverage['checks'][best]
+    return {'additions': additions, 'uncovered': _decode(coverage, uncovered)}
+
+def benchmark(coverage, n_teams=10000, seed=0):
+    """Average microseconds to evaluate every threat against a random 6-Pokemon team."""
+    rng = np.random.default_rng(seed)
+    teams = rng.choice(len(coverage['threats']), size=(n_teams, 6))
+    checks = coverage['checks']
+    all_threats = coverage['all_threats']
+    start = time.perf_counter()
+    for team in teams:
+        popcount(all_threats & ~np.bitwise_or.reduce(checks[team], axis=0))
+    per_team = (time.perf_counter() - start) / n_teams * 1e6
+    # Whole batch at once: OR-reduce the six rows of every team in one pass
+    start = time.perf_counter()
+    popcount(all_threats & ~np.bitwise_or.reduce(checks[teams], axis=1))
+    batched = (time.perf_counter() - start) / n_teams * 1e6
+    return {'teams': n_teams, 'us_per_team': per_team, 'us_per_team_batched': batched}
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.threat_coverage
+    import json
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    coverage = build_coverage_index(data)
+    team = ["Great Tusk", "Kingambit", "Gholdengo"]
+    print(uncovered_threats(coverage, team)[:10])
+    print(best_additions(coverage, team))
+    print(greedy_cover(coverage, team))
+    print(benchmark(coverage))
@@ -1,7 +1,12 @@
 import json
 import pickle
 import os
+import argparse
+import pandas as pd
 from pokemon_move_recommender import train_model
+from out_of_core_training import train_model_out_of_core, DEFAULT_CHUNK_SIZE, N_COMPONENTS
+from forest_inference import export_model, save_exported_model, predict
+from type_effectiveness import build_type_engine, type_pair_features
 
 def load_pokemon_data():
     """Load Pokemon data from the JSON file."""
@@ -16,6 +21,12 @@ def load_pokemon_data():
         print(f"Error: Invalid JSON format in {data_path}")
         raise
 
+def load_type_features(pokemon_data):
+    """Pair features from the type chart, using the typings in Pokemon.csv."""
+    pokemon_df = pd.read_csv(os.path.join('appengine', 'components', 'data', 'Pokemon.csv'))
+    engine = build_type_engine([p["Pokemon"] for p in pokemon_data], pokemon_df)
+    return type_pair_features(engine)
+
 def save_model(model_data):
     """Save the trained model and its components to a pickle file."""
     model_path = os.path.join('appengine', 'components', 'models', 'pokemon_model.pkl')
@@ -27,18 +38,52 @@ def save_model(model_data):
         print(f"Error saving model: {str(e)}")
         raise
 
-def main():
+def export_for_serving(model, scaler, pca, df):
+    """Export the model to NumPy arrays and check it agrees with sklearn before saving."""
+    export_path = os.path.join('appengine', 'components', 'models', 'pokemon_model.npz')
+    exported = export_model(model, scaler, pca, list(df.columns))
+    sample = df.head(1000)
+    expected = model.predict(pca.transform(scaler.transform(sample)))
+    if not (predict(exported, sample.values) == expected).all():
+        raise ValueError("Exported model predictions differ from sklearn; not saving export.")
+    save_exported_model(exported, export_path)
+
+def main(out_of_core=False, chunk_size=DEFAULT_CHUNK_SIZE, work_dir=None, type_features=False):
     print("Loading Pokemon data...")
     pokemon_data = load_pokemon_data()
     
     print("Training model...")
-    model, scaler, pca, df, pokemon_data = train_model(pokemon_data)
+    if type_features:
+        if out_of_core:
+            raise ValueError("--type-features is only supported by the in-memory training path")
+        model, scaler, pca, df, pokemon_data = train_model(pokemon_data, pair_features=load_type_features(pokemon_data))
+    elif out_of_core:
+        work_dir = work_dir or os.path.join('appengine', 'components', 'models', 'training_data')
+        model, scaler, pca, df, pokemon_data = train_model_out_of_core(pokemon_data, work_dir, chunk_size)
+    else:
+        model, scaler, pca, df, pokemon_data = train_model(pokemon_data)
     
     print("Saving model...")
     model_data = (model, scaler, pca, df, pokemon_data)
     save_model(model_data)
+
+    print("Exporting model for serving...")
+    export_for_serving(model, scaler, pca, df)
     
     print("Done!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train and save the Pokemon move model.")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="Stream pair rows to memory-mapped files instead of holding them in RAM")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows per chunk for out-of-core training")
+    parser.add_argument('--work-dir', default=None,
+                        help="Directory for the memory-mapped training data")
+    parser.add_argument('--type-features', action='store_true',
+                        help="Add STAB type-effectiveness pair features from Pokemon.csv")
+    args = parser.parse_args()
+    if args.chunk_size < N_COMPONENTS:
+        parser.error(f"--chunk-size must be at least {N_COMPONENTS} (the number of PCA components)")
+    main(out_of_core=args.out_of_core, chunk_size=args.chunk_size, work_dir=args.work_dir,
+         type_features=args.type_features) 
\ No newline at end of file
@@ -0,0 +1,161 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+try:
+    from components.pokemon_index import resolve_pokemon_rows
+except ImportError:  # imported from the training scripts in components/
+    from pokemon_index import resolve_pokemon_rows
+
+# Type chart and vectorized N x N matchup matrices built from Pokemon.csv typings.
+
+TYPES = ['Normal', 'Fire', 'Water', 'Electric', 'Grass', 'Ice', 'Fighting', 'Poison', 'Ground',
+         'Flying', 'Psychic', 'Bug', 'Rock', 'Ghost', 'Dragon', 'Dark', 'Steel', 'Fairy']
+TYPE_INDEX = {name: i for i, name in enumerate(TYPES)}
+
+# Attacking type -> {defending type: multiplier}; anything not listed is 1x
+_CHART = {
+    'Normal': {'Rock': 0.5, 'Ghost': 0, 'Steel': 0.5},
+    'Fire': {'Fire': 0.5, 'Water': 0.5, 'Grass': 2, 'Ice': 2, 'Bug': 2, 'Rock': 0.5, 'Dragon': 0.5, 'Steel': 2},
+    'Water': {'Fire': 2, 'Water': 0.5, 'Grass': 0.5, 'Ground': 2, 'Rock': 2, 'Dragon': 0.5},
+    'Electric': {'Water': 2, 'Electric': 0.5, 'Grass': 0.5, 'Ground': 0, 'Flying': 2, 'Dragon': 0.5},
+    'Grass': {'Fire': 0.5, 'Water': 2, 'Grass': 0.5, 'Poison': 0.5, 'Ground': 2, 'Flying': 0.5, 'Bug': 0.5,
+              'Rock': 2, 'Dragon': 0.5, 'Steel': 0.5},
+    'Ice': {'Fire': 0.5, 'Water': 0.5, 'Grass': 2, 'Ice': 0.5, 'Ground': 2, 'Flying': 2, 'Dragon': 2, 'Steel': 0.5},
+    'Fighting': {'Normal': 2, 'Ice': 2, 'Poison': 0.5, 'Flying': 0.5, 'Psychic': 0.5, 'Bug': 0.5, 'Rock': 2,
+                 'Ghost': 0, 'Dark': 2, 'Steel': 2, 'Fairy': 0.5},
+    'Poison': {'Grass': 2, 'Poison': 0.5, 'Ground': 0.5, 'Rock': 0.5, 'Ghost': 0.5, 'Steel': 0, 'Fairy': 2},
+    'Ground': {'Fire': 2, 'Electric': 2, 'Grass': 0.5, 'Poison': 2, 'Flying': 0, 'Bug': 0.5, 'Rock': 2, 'Steel': 2},
+    'Flying': {'Electric': 0.5, 'Grass': 2, 'Fighting': 2, 'Bug': 2, 'Rock': 0.5, 'Steel': 0.5},
+    'Psychic': {'Fighting': 2, 'Poison': 2, 'Psychic': 0.5, 'Dark': 0, 'Steel': 0.5},
+    'Bug': {'Fire': 0.5, 'Grass': 2, 'Fighting': 0.5, 'Poison': 0.5, 'Flying': 0.5, 'Psychic': 2, 'Ghost': 0.5,
+            'Dark': 2, 'Steel': 0.5, 'Fairy': 0.5},
+    'Rock': {'Fire': 2, 'Ice': 2, 'Fighting': 0.5, 'Ground': 0.5, 'Flying': 2, 'Bug': 2, 'Steel': 0.5},
+    'Ghost': {'Normal': 0, 'Psychic': 2, 'Ghost': 2, 'Dark': 0.5},
+    'Dragon': {'Dragon': 2, 'Steel': 0.5, 'Fairy': 0},
+    'Dark': {'Fighting': 0.5, 'Psychic': 2, 'Ghost': 2, 'Dark': 0.5, 'Fairy': 0.5},
+    'Steel': {'Fire': 0.5, 'Water': 0.5, 'Electric': 0.5, 'Ice': 2, 'Rock': 2, 'Steel': 0.5, 'Fairy': 2},
+    'Fairy': {'Fire': 0.5, 'Fighting': 2, 'Poison': 0.5, 'Dragon': 2, 'Dark': 2, 'Steel': 0.5},
+}
+
+def type_chart():
+    """18 x 18 array, chart[attacking type, defending type] = damage multiplier."""
+    chart = np.ones((len(TYPES), len(TYPES)), dtype=np.float64)
+    for attacker, row in _CHART.items():
+        for defender, multiplier in row.items():
+            chart[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = multiplier
+    return chart
+
+TYPE_CHART = type_chart()
+
+# --- Engine ---
+# Only the engine for the latest dataset version is kept, so reloads do not accumulate engines
+_ENGINE_CACHE = {}
+_TYPING_COLUMNS = ['Name', 'Form', 'Type1', 'Type2']  # what the typings are resolved from
+
+def _engine_version(names, pokemon_df):
+    # Hashes the inputs of _typing_ids, so a cache hit skips resolving every name
+    digest = hashlib.sha1('\n'.join(names).encode())
+    digest.update(pd.util.hash_pandas_object(pokemon_df[_TYPING_COLUMNS], index=False).values.tobytes())
+    return digest.hexdigest()
+
+def _typing_ids(names, pokemon_df):
+    rows = resolve_pokemon_rows(names, pokemon_df)
+    type1 = np.full(len(names), -1, dtype=np.int64)
+    type2 = np.full(len(names), -1, dtype=np.int64)
+    for k, row in enumerate(rows):
+        if row < 0:
+            continue
+        type1[k] = TYPE_INDEX.get(str(pokemon_df['Type1'].iloc[row]).strip(), -1)
+        type2[k] = TYPE_INDEX.get(str(pokemon_df['Type2'].iloc[row]).strip(), -1)
+    return type1, type2
+
+def build_type_engine(names, pokemon_df):
+    """Defensive and offensive effectiveness for every Pokemon pair, cached for the latest dataset version.
+
+    defense[i, a]: multiplier an attack of type a deals to Pokemon i (dual types multiplied).
+    offense[i, j]: best STAB multiplier Pokemon i deals to Pokemon j.
+    Pokemon whose typing cannot be resolved are treated as neutral (1x everywhere).
+    """
+    version = _engine_version(names, pokemon_df)
+    if version in _ENGINE_CACHE:
+        return _ENGINE_CACHE[version]
+
+    type1, type2 = _typing_ids(names, pokemon_df)
+    known = type1 >= 0
+    # (N, 18): chart columns for each defender's types, second type defaulting to 1x
+    defense = np.ones((len(names), len(TYPES)))
+    defense[known] = TYPE_CHART[:, type1[known]].T
+    has_second = type2 >= 0
+    defense[has_second] *= TYPE_CHART[:, type2[has_second]].T
+
+    # offense[i, j] = max over i's STAB types a of defense[j, a], in one gather
+    offense = np.ones((len(names), len(names)))
+    offense[known] = defense[:, type1[known]].T
+    offense[has_second] = np.maximum(offense[has_second], defense[:, type2[has_second]].T)
+
+    engine = {
+        'version': version,
+        'names': list(names),
+        'index': {name: i for i, name in enumerate(names)},
+        'type1': type1,
+        'type2': type2,
+        'defense': defense,
+        'offense': offense,
+    }
+    _ENGINE_CACHE.clear()
+    _ENGINE_CACHE[version] = engine
+    return engine
+
+# --- Queries ---
+def team_weaknesses(engine, team):
+    """Per attacking type: how many members are weak, resist or are immune, most shared weakness first."""
+    ids = [engine['index'][name] for name in team]
+    multipliers = engine['defense'][ids]
+    weak = (multipliers > 1).sum(axis=0)
+    resist = ((multipliers < 1) & (multipliers > 0)).sum(axis=0)
+    immune = (multipliers == 0).sum(axis=0)
+    order = np.lexsort((resist + immune, -weak))
+    return [{'type': TYPES[a], 'weak': int(weak[a]), 'resist': int(resist[a]), 'immune': int(immune[a])}
+            for a in order]
+
+def best_typed_answers(engine, target, k=10, candidates=None):
+    """Pokemon that hit `target` hardest with STAB while taking the least from its STAB."""
+    t = engine['index'][target]
+    hits = engine['offense'][:, t]
+    taken = engine['offense'][t, :]
+    # Immunity to the target's STAB counts as a 4x resist rather than dividing by zero
+    score = hits / np.maximum(taken, 0.25)
+    pool = np.arange(len(score)) if candidates is None else np.array([engine['index'][c] for c in candidates])
+    pool = pool[pool != t]
+    ranked = pool[np.argsort(-score[pool], kind='stable')][:k]
+    return [{'pokemon': engine['names'][i], 'deals': float(hits[i]), 'takes': float(taken[i])} for i in ranked]
+
+def type_pair_features(engine):
+    """Optional recommender features: STAB multiplier p1 deals to p2 and p2 deals to p1."""
+    index = engine['index']
+    offense = engine['offense']
+
+    def pair_features(p1, p2):
+        i = index.get(p1["Pokemon"])
+        j = index.get(p2["Pokemon"])
+        if i is None or j is None:
+            return {'pair_type_offense': 1.0, 'pair_type_defense': 1.0}
+        return {'pair_type_offense': float(offense[i, j]), 'pair_type_defense': float(offense[j, i])}
+
+    return pair_features
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.type_effectiveness
+    import json
+    import time
+    import pandas as pd
+    with open("components/data/gen9ou_full_data.json", "r") as f:
+        data = json.load(f)
+    pokemon_df = pd.read_csv("components/data/Pokemon.csv")
+    names = [p["Pokemon"] for p in data]
+    start = time.perf_counter()
+    engine = build_type_engine(names, pokemon_df)
+    print(f"Built {len(names)}x{len(names)} matrices in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(team_weaknesses(engine, ["Great Tusk", "Kingambit", "Gholdengo", "Dragapult", "Iron Valiant", "Corviknight"])[:3])
+    print(best_typed_answers(engine, "Gholdengo", k=5, candidates=names[:100]))
@@ -0,0 +1,186 @@
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+from components.compressed_io import find_input, open_text
+
+# Cross-month usage trends. Each month is stored once as a small CSV of
+# per-Pokemon aggregates keyed by a stable integer ID (names.csv is the
+# append-only ID registry), so adding a month only reads and writes that
+# month. Loading stacks the months into (months x Pokemon) arrays and every
+# delta / trend below is a whole-array operation.
+
+TRENDS_DIR = 'components/data/trends'
+REGISTRY_FILE = 'names.csv'
+MONTH_PATTERN = re.compile(r"(\d{4}-\d{2})")
+MONTH_COLUMNS = ['ID', 'Pokemon', 'Rank', 'Usage %', 'Raw Count', 'Viability Ceiling']
+# Parsed moveset data of one month (full_pokemon_parser.py output), next to the combined CSV
+MOVESET_FILE = '{month}-gen9ou_full_data.json'
+
+# --- Store ---
+def month_of(source_file):
+    """"2024-02-pokemon_usage_stats_with_gen.csv" -> "2024-02"."""
+    match = MONTH_PATTERN.search(source_file)
+    return match.group(1) if match else None
+
+def split_usage_months(df):
+    """{month: rows} from combined_pokemon_usage.csv, where the month is only in Source File."""
+    months = df['Source File'].map(month_of)
+    return {month: group.drop(columns='Source File') for month, group in df.groupby(months)}
+
+def load_registry(store_dir=TRENDS_DIR):
+    """Name -> ID for every Pokemon seen in any stored month."""
+    path = os.path.join(store_dir, REGISTRY_FILE)
+    if not os.path.exists(path):
+        return {}
+    registry = pd.read_csv(path)
+    return dict(zip(registry['Pokemon'], registry['ID']))
+
+def stored_months(store_dir=TRENDS_DIR):
+    """Months with a stored aggregate file, oldest first."""
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(name[:-4] for name in os.listdir(store_dir)
+                  if name.endswith('.csv') and MONTH_PATTERN.fullmatch(name[:-4]))
+
+def ingest_month(month, month_df, store_dir=TRENDS_DIR, viability=None):
+    """Write one month's aggregates, assigning IDs to Pokemon not seen before.
+
+    `viability` optionally maps names to Viability Ceiling (from the moveset
+    data of the same month); other rows store NaN.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    registry = load_registry(store_dir)
+    new_names = [name for name in month_df['Pokemon'] if name not in registry]
+    for name in new_names:
+        registry[name] = len(registry)
+    if new_names:
+        pd.DataFrame({'ID': list(registry.values()), 'Pokemon': list(registry)}).to_csv(
+            os.path.join(store_dir, REGISTRY_FILE), index=False)
+
+    viability = viability or {}
+    out = pd.DataFrame({
+        'ID': month_df['Pokemon'].map(registry).astype(int),
+        'Pokemon': month_df['Pokemon'],
+        'Rank': month_df['Rank'],
+        'Usage %': month_df['Usage %'],
+        'Raw Count': month_df['Raw Count'],
+        'Viability Ceiling': month_df['Pokemon'].map(viability).astype(float),
+    })
+    out[MONTH_COLUMNS].to_csv(os.path.join(store_dir, f"{month}.csv"), index=False)
+    return len(new_names)
+
+def moveset_viability(month, moveset_dir):
+    """Name -> Viability Ceiling from the month's moveset data in `moveset_dir`, or None when there is none."""
+    try:
+        path = find_input(os.path.join(moveset_dir, MOVESET_FILE.format(month=month)))
+    except FileNotFoundError:
+        return None
+    with open_text(path) as f:
+        return {p["Pokemon"]: p["Viability Ceiling"] for p in json.load(f) if "Viability Ceiling" in p}
+
+def _has_viability(month, store_dir):
+    return pd.read_csv(os.path.join(store_dir, f"{month}.csv"))['Viability Ceiling'].notna().any()
+
+def ingest_combined_csv(path, store_dir=TRENDS_DIR, moveset_dir=None):
+    """Ingest the months of combined_pokemon_usage.csv (plain or compressed) that are not stored yet.
+
+    Viability Ceiling comes from each month's MOVESET_FILE in `moveset_dir`
+    (default: the CSV's directory). A stored month without viability is
+    ingested again once its moveset data appears.
+    """
+    moveset_dir = moveset_dir if moveset_dir is not None else os.path.dirname(path)
+    existing = set(stored_months(store_dir))
+    added = []
+    with open_text(path) as f:
+        combined = pd.read_csv(f)
+    for month, month_df in sorted(split_usage_months(combined).items()):
+        viability = moveset_viability(month, moveset_dir)
+        if month not in existing or (viability and not _has_viability(month, store_dir)):
+            ingest_month(month, month_df, store_dir, viability=viability)
+            added.append(month)
+    return added
+
+def load_history(store_dir=TRENDS_DIR):
+    """Stack every stored month into (months x Pokemon) arrays aligned by ID.
+
+    Usage and raw counts are 0 for months a Pokemon does not appear in; rank
+    and viability are NaN there, and viability is NaN for every Pokemon of a
+    month ingested without moveset data.
+    """
+    registry = load_registry(store_dir)
+    names = [None] * len(registry)
+    for name, i in registry.items():
+        names[i] = name
+    months = stored_months(store_dir)
+    shape = (len(months), len(names))
+    history = {
+        'months': months,
+        'names': names,
+        'index': registry,
+        'usage': np.zeros(shape),
+        'raw': np.zeros(shape),
+        'rank': np.full(shape, np.nan),
+        'viability': np.full(shape, np.nan),
+    }
+    for m, month in enumerate(months):
+        df = pd.read_csv(os.path.join(store_dir, f"{month}.csv"))
+        ids = df['ID'].to_numpy()
+        history['usage'][m, ids] = df['Usage %'].to_numpy()
+        history['raw'][m, ids] = df['Raw Count'].to_numpy()
+        history['rank'][m, ids] = df['Rank'].to_numpy()
+        history['viability'][m, ids] = df['Viability Ceiling'].to_numpy()
+    return history
+
+# --- Trends ---
+def month_deltas(history):
+    """(months - 1, Pokemon) changes between consecutive months; rank_change > 0 means it climbed."""
+    return {
+        'usage': np.diff(history['usage'], axis=0),
+        'rank_change': history['rank'][:-1] - history['rank'][1:],
+        'viability': np.diff(history['viability'], axis=0),
+    }
+
+def rolling_slope(matrix, window=3):
+    """Least-squares slope per column over each run of `window` consecutive months."""
+    if len(matrix) < window:
+        return np.empty((0, matrix.shape[1]))
+    windows = np.lib.stride_tricks.sliding_window_view(matrix, window, axis=0)  # (runs, N, window)
+    x = np.arange(window) - (window - 1) / 2.0
+    centred = windows - windows.mean(axis=2, keepdims=True)
+    return (centred * x).sum(axis=2) / (x * x).sum()
+
+def risers_fallers(history, k=10, min_usage=1.0, start=-2, end=-1):
+    """Top-k usage gains and losses between two months among Pokemon above `min_usage` % in either."""
+    if len(history['months']) < 2:
+        return [], []
+    before, after = history['usage'][start], history['usage'][end]
+    delta = after - before
+    eligible = np.flatnonzero(np.maximum(before, after) >= min_usage)
+    order = eligible[np.argsort(-delta[eligible], kind='stable')]
+
+    def rows(ids):
+        return [{'pokemon': history['names'][i], 'before': float(before[i]), 'after': float(after[i]),
+                 'delta': float(delta[i])} for i in ids]
+
+    risers, fallers = order[:k], order[::-1][:k]
+    return rows(risers[delta[risers] > 0]), rows(fallers[delta[fallers] < 0])
+
+def top_trajectories(history, k=10):
+    """Names and usage rows of the k most used Pokemon in the latest month."""
+    if not history['months']:
+        return [], history['usage'][:, :0]
+    top = np.argsort(-history['usage'][-1], kind='stable')[:k]
+    return [history['names'][i] for i in top], history['usage'][:, top]
+
+if __name__ == "__main__":
+    # Run from appengine/: python -m components.usage_trends [path/to/combined_pokemon_usage.csv]
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else '../pokemon_analysis/data/combined_pokemon_usage.csv'
+    print("Added months:", ingest_combined_csv(path))
+    history = load_history()
+    print(f"{len(history['months'])} months, {len(history['names'])} Pokemon")
+    risers, fallers = risers_fallers(history, k=5)
+    print("Risers:", [(r['pokemon'], round(r['delta'], 2)) for r in risers])
+    print("Fallers:", [(r['pokemon'], round(r['delta'], 2)) for r in fallers])
@@ -237,4 +237,68 @@ def create_counter_graph(counters_data, pokemon_name):
             x=1.05
         )
     )
-    return fig 
\ No newline at end of file
+    return fig
+
+def _empty_figure(message):
+    fig = go.Figure()
+    fig.add_annotation(text=message,
+                       xref="paper", yref="paper",
+                       x=0.5, y=0.5, showarrow=False)
+    return fig
+
+def create_risers_fallers_graph(risers, fallers, before_month, after_month):
+    """Horizontal bar chart of the largest usage gains and losses between two months."""
+    if before_month is None:
+        return _empty_figure("Usage changes need at least two months of data")
+    rows = sorted(risers + fallers, key=lambda r: r['delta'])
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[r['delta'] for r in rows],
+            y=[r['pokemon'] for r in rows],
+            orientation='h',
+            marker_color=['rgb(55, 83, 109)' if r['delta'] > 0 else 'rgb(219, 64, 82)' for r in rows],
+            customdata=[[r['before'], r['after']] for r in rows],
+            hovertemplate='%{y}: %{customdata[0]:.2f}% → %{customdata[1]:.2f}%<extra></extra>'
+        )
+    ])
+    fig.update_layout(
+        title=f'Biggest Usage Changes, {before_month} to {after_month}',
+        xaxis_title='Change in Usage % (points)',
+        yaxis_title='Pokemon',
+        showlegend=False,
+        height=600
+    )
+    return fig
+
+def create_usage_trend_graph(months, names, usage):
+    """Line chart of usage % per month for a set of Pokemon (usage is months x Pokemon)."""
+    if not months:
+        return _empty_figure("No usage data stored yet")
+    fig = go.Figure()
+    for k, name in enumerate(names):
+        fig.add_trace(go.Scatter(x=months, y=usage[:, k], mode='lines+markers', name=name))
+    fig.update_layout(
+        title='Usage Over Time (Current Top 10)',
+        xaxis_title='Month',
+        yaxis_title='Usage %'
+    )
+    return fig
+
+def create_rank_change_graph(names, rank_change, before_month, after_month):
+    """Bar chart of how many places each Pokemon climbed (positive) or dropped."""
+    if before_month is None:
+        return _empty_figure("Rank changes need at least two months of data")
+    fig = go.Figure(data=[
+        go.Bar(
+            x=names,
+            y=rank_change,
+            marker_color=['rgb(55, 83, 109)' if r > 0 else 'rgb(219, 64, 82)' for r in rank_change]
+        )
+    ])
+    fig.update_layout(
+        title=f'Rank Change of the Top 20, {before_month} to {after_month}',
+        xaxis_title='Pokemon',
+        yaxis_title='Places Climbed',
+        showlegend=False
+    )
+    return fig
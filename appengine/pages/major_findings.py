@@ -1,172 +1,213 @@
+import threading
 import dash
 from dash import html, dcc, callback, Input, Output
-from components.data_loader import load_gen9ou_data, load_pokemon_data, get_generation_to_region_mapping, get_stat_columns
+from components.data_loader import CUTOFFS, POKEMON_BLOB, cutoff_file, dataset_version, gen9ou_frame, load_gen9ou_cutoffs, load_pokemon_data, get_generation_to_region_mapping, get_stat_columns
+from components.brackets import build_bracket_store, bracket_entries, bracket_options
+from components.hot_reload import reloadable
 from components.visualizations import create_team_archetype_visuals, create_correlation_heatmap, create_total_stats_scatter
 
 
 # Register page
 dash.register_page(__name__, path='/major_findings')
 
-# Load data
-df_gen9ou = load_gen9ou_data()
-df_stats = load_pokemon_data()
-df_stats['Region'] = df_stats['Generation'].map(get_generation_to_region_mapping())
-stat_cols = get_stat_columns()
+# Figures are generated from the usage and base stat data once per data
+# version and regenerated in the background when either changes. The team
+# archetype figures depend on the rating bracket and are built the first
+# time a bracket is picked.
+def archetype_figures(figures, bracket):
+    with figures['lock']:
+        archetypes = figures['archetypes']
+        if bracket not in archetypes:
+            archetypes[bracket] = create_team_archetype_visuals(gen9ou_frame(bracket_entries(figures['store'], bracket)))
+        return archetypes[bracket]
 
-# Generate figures
-fig_cluster, fig_viability = create_team_archetype_visuals(df_gen9ou)
-heatmap_fig = create_correlation_heatmap(df_stats, stat_cols)
-scatter_fig = create_total_stats_scatter(df_stats, stat_cols)
+def build_figures():
+    df_stats = load_pokemon_data()
+    df_stats['Region'] = df_stats['Generation'].map(get_generation_to_region_mapping())
+    stat_cols = get_stat_columns()
+
+    figures = {
+        'store': build_bracket_store(load_gen9ou_cutoffs(fields=('Pokemon', 'Raw Count', 'Viability Ceiling', 'Teammates'))),
+        'archetypes': {},
+        'lock': threading.Lock(),
+        'heatmap': create_correlation_heatmap(df_stats, stat_cols),
+        'scatter': create_total_stats_scatter(df_stats, stat_cols),
+    }
+    archetype_figures(figures, figures['store']['cutoffs'][0])
+    return figures
+
+figures_data = reloadable('major_findings',
+                          lambda: dataset_version([cutoff_file(c) for c in CUTOFFS] + [POKEMON_BLOB]), build_figures)
 
 # --- Layout ---
-layout = html.Div([
-    html.H1("Major Findings", style={'textAlign': 'center', 'marginBottom': '30px'}),
+def layout(**kwargs):
+    figures = figures_data.get()
+    default_bracket = figures['store']['cutoffs'][0]
+    fig_cluster, fig_viability = archetype_figures(figures, default_bracket)
+    return html.Div([
+        html.H1("Major Findings", style={'textAlign': 'center', 'marginBottom': '30px'}),
 
-    html.Div([
-        html.H2("Team Archetype Analysis", style={'textAlign': 'center'}),
-        html.P("Our analysis of Pokémon team compositions reveals four distinct team archetypes based on teammate relationships:", style={'textAlign': 'center'}),
-        html.Ul([
-            html.Li([html.Strong("Bulky Offense:"), " Teams combining defensive walls with powerful attackers."], style={'textAlign': 'center'}),
-            html.Li([html.Strong("Hyper Offense:"), " Teams focused on speed control and powerful sweepers."], style={'textAlign': 'center'}),
-            html.Li([html.Strong("Balanced Teams:"), " Teams with a mix of support, pivots, and hazard control."], style={'textAlign': 'center'}),
-            html.Li([html.Strong("Stall/Fat Balance:"), " Teams built around regeneration cores and defensive tanks."], style={'textAlign': 'center'})
-        ], style={'textAlign': 'center', 'listStyle': 'none', 'padding': '0'}),
-        dcc.Graph(figure=fig_cluster, className='graph-style')
-    ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+        html.Div([
+            html.H2("Team Archetype Analysis", style={'textAlign': 'center'}),
+            html.P("Our analysis of Pokémon team compositions reveals four distinct team archetypes based on teammate relationships:", style={'textAlign': 'center'}),
+            html.Ul([
+                html.Li([html.Strong("Bulky Offense:"), " Teams combining defensive walls with powerful attackers."], style={'textAlign': 'center'}),
+                html.Li([html.Strong("Hyper Offense:"), " Teams focused on speed control and powerful sweepers."], style={'textAlign': 'center'}),
+                html.Li([html.Strong("Balanced Teams:"), " Teams with a mix of support, pivots, and hazard control."], style={'textAlign': 'center'}),
+                html.Li([html.Strong("Stall/Fat Balance:"), " Teams built around regeneration cores and defensive tanks."], style={'textAlign': 'center'})
+            ], style={'textAlign': 'center', 'listStyle': 'none', 'padding': '0'}),
+            dcc.Dropdown(
+                id='findings-bracket',
+                options=bracket_options(figures['store']),
+                value=default_bracket,
+                clearable=False,
+                style={'maxWidth': '300px', 'margin': '0 auto', 'textAlign': 'left'},
+            ),
+            dcc.Graph(id='findings-cluster', figure=fig_cluster, className='graph-style')
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
 
-    html.Div([
-        html.H2("Viability Analysis", style={'textAlign': 'center'}),
-        html.P("The visualization below shows the relationship between team archetypes and their average viability scores.", style={'textAlign': 'center'}),
-        dcc.Graph(figure=fig_viability, className='graph-style')
-    ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+        html.Div([
+            html.H2("Viability Analysis", style={'textAlign': 'center'}),
+            html.P("The visualization below shows the relationship between team archetypes and their average viability scores.", style={'textAlign': 'center'}),
+            dcc.Graph(id='findings-viability', figure=fig_viability, className='graph-style')
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
 
-    html.Div([
-        html.H2("Average Base Stats by Generation", style={'textAlign': 'center'}),
-        dcc.Graph(figure=scatter_fig, className='graph-style'),
-    ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+        html.Div([
+            html.H2("Average Base Stats by Generation", style={'textAlign': 'center'}),
+            dcc.Graph(figure=figures['scatter'], className='graph-style'),
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
     
-    html.Div([
-        html.P(
-            "Each point represents the mean total base stat for a specific generation. "
-            "The upward slope of the regression line suggests a power creep trend—a gradual increase in average stat totals over time. "
-            "Generation 6 appears to have a particularly high average, likely due to the introduction of Mega Evolutions. "
-            "Future generations do not have this sort of spike in total base stats, but they have more than the first five generations. "
-            "This graph may support the hypothesis that power creep does play a role in Pokemon regarding base stats. "
-            "Notice the red area around the red line, representing the confidence interval of the linear regression. "
-            "The line gets narrower around Generations 4,5,6 and wider in the later Generations. "
-            "The model is fairly confident in the middle generations, where there are more data points, "
-            "and slightly less confident at the extremes (Gen 1 and Gen 9).",
-            style={'textAlign': 'center'}
-        )
-    ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+        html.Div([
+            html.P(
+                "Each point represents the mean total base stat for a specific generation. "
+                "The upward slope of the regression line suggests a power creep trend—a gradual increase in average stat totals over time. "
+                "Generation 6 appears to have a particularly high average, likely due to the introduction of Mega Evolutions. "
+                "Future generations do not have this sort of spike in total base stats, but they have more than the first five generations. "
+                "This graph may support the hypothesis that power creep does play a role in Pokemon regarding base stats. "
+                "Notice the red area around the red line, representing the confidence interval of the linear regression. "
+                "The line gets narrower around Generations 4,5,6 and wider in the later Generations. "
+                "The model is fairly confident in the middle generations, where there are more data points, "
+                "and slightly less confident at the extremes (Gen 1 and Gen 9).",
+                style={'textAlign': 'center'}
+            )
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
     
-    html.Div([
-        html.H2("Pokemon Move Recommender Model Analysis", style={'textAlign': 'center', 'marginBottom': '30px'}),
-        
-        # Model Explanation
         html.Div([
-            html.P([
-                "1. ", html.Strong("Feature Extraction: "), "For each Pokemon, we extract key features including:",
-                html.Ul([
-                    html.Li("Base stats and viability metrics"),
-                    html.Li("Move usage statistics"),
-                    html.Li("Counter and check relationships"),
-                    html.Li("Average KO and switch-out rates")
-                ]),
-                html.Br(),
-                "2. ", html.Strong("Dimensionality Reduction: "), "We use Principal Component Analysis (PCA) to reduce the feature space to 5 components, ",
-                "which helps capture the most important patterns while reducing noise.",
-                html.Br(), html.Br(),
-                "3. ", html.Strong("Model Training: "), "A Random Forest Classifier is trained on these features to predict the optimal move choice. ",
-                "The model learns patterns from actual battle data, considering both offensive and defensive scenarios.",
-                html.Br(), html.Br(),
-                "4. ", html.Strong("Prediction: "), "When given a matchup, the model analyzes the relationship between the two Pokemon and recommends ",
-                "either the best move to use or suggests switching out if the matchup is unfavorable."
-            ], style={'textAlign': 'left', 'maxWidth': '800px', 'margin': '0 auto', 'padding': '20px'})
-        ], style={'marginBottom': '30px'}),
+            html.H2("Pokemon Move Recommender Model Analysis", style={'textAlign': 'center', 'marginBottom': '30px'}),
         
-        # Overall Performance and PCA in a two-column layout
-        html.Div([
-            # Left column - Overall Performance
-            html.Div([
-                html.H3("Overall Performance", style={'textAlign': 'center'}),
-                html.Table([
-                    html.Tr([html.Td(html.Strong("Accuracy:")), html.Td("0.4988")]),
-                    html.Tr([html.Td(html.Strong("Precision:")), html.Td("0.5085")]),
-                    html.Tr([html.Td(html.Strong("Recall:")), html.Td("0.4988")]),
-                    html.Tr([html.Td(html.Strong("F1 Score:")), html.Td("0.5008")])
-                ], style={'margin': '0 auto', 'borderCollapse': 'collapse'})
-            ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'}),
-            
-            # Right column - PCA Analysis
+            # Model Explanation
             html.Div([
-                html.H3("PCA Analysis", style={'textAlign': 'center'}),
                 html.P([
-                    html.Strong("Total Explained Variance: "), "0.6571",
+                    "1. ", html.Strong("Feature Extraction: "), "For each Pokemon, we extract key features including:",
+                    html.Ul([
+                        html.Li("Base stats and viability metrics"),
+                        html.Li("Move usage statistics"),
+                        html.Li("Counter and check relationships"),
+                        html.Li("Average KO and switch-out rates")
+                    ]),
                     html.Br(),
-                    "Component Breakdown:",
-                    html.Br(),
-                    "PC1: 0.2204 | PC2: 0.2194 | PC3: 0.0791",
-                    html.Br(),
-                    "PC4: 0.0788 | PC5: 0.0595"
-                ], style={'textAlign': 'center'})
-            ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'})
-        ], style={'marginBottom': '30px', 'textAlign': 'center'}),
+                    "2. ", html.Strong("Dimensionality Reduction: "), "We use Principal Component Analysis (PCA) to reduce the feature space to 5 components, ",
+                    "which helps capture the most important patterns while reducing noise.",
+                    html.Br(), html.Br(),
+                    "3. ", html.Strong("Model Training: "), "A Random Forest Classifier is trained on these features to predict the optimal move choice. ",
+                    "The model learns patterns from actual battle data, considering both offensive and defensive scenarios.",
+                    html.Br(), html.Br(),
+                    "4. ", html.Strong("Prediction: "), "When given a matchup, the model analyzes the relationship between the two Pokemon and recommends ",
+                    "either the best move to use or suggests switching out if the matchup is unfavorable."
+                ], style={'textAlign': 'left', 'maxWidth': '800px', 'margin': '0 auto', 'padding': '20px'})
+            ], style={'marginBottom': '30px'}),
         
-        # Move Performance Analysis in a two-column layout
-        html.Div([
-            # Left column - Best Performing Moves
+            # Overall Performance and PCA in a two-column layout
             html.Div([
-                html.H3("Top 10 Best Performing Moves", style={'textAlign': 'center'}),
-                html.Table([
-                    html.Tr([html.Th("Move"), html.Th("F1 Score")]),
-                    html.Tr([html.Td("Psyshield Bash"), html.Td("0.994")]),
-                    html.Tr([html.Td("Grav Apple"), html.Td("0.994")]),
-                    html.Tr([html.Td("Future Sight"), html.Td("0.984")]),
-                    html.Tr([html.Td("Psycho Boost"), html.Td("0.980")]),
-                    html.Tr([html.Td("Other"), html.Td("0.976")]),
-                    html.Tr([html.Td("Slack Off"), html.Td("0.946")]),
-                    html.Tr([html.Td("Matcha Gotcha"), html.Td("0.944")]),
-                    html.Tr([html.Td("Shadow Sneak"), html.Td("0.943")]),
-                    html.Tr([html.Td("Quick Attack"), html.Td("0.932")]),
-                    html.Tr([html.Td("Fiery Dance"), html.Td("0.884")])
-                ], style={'margin': '0 auto', 'borderCollapse': 'collapse'})
-            ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+                # Left column - Overall Performance
+                html.Div([
+                    html.H3("Overall Performance", style={'textAlign': 'center'}),
+                    html.Table([
+                        html.Tr([html.Td(html.Strong("Accuracy:")), html.Td("0.4988")]),
+                        html.Tr([html.Td(html.Strong("Precision:")), html.Td("0.5085")]),
+                        html.Tr([html.Td(html.Strong("Recall:")), html.Td("0.4988")]),
+                        html.Tr([html.Td(html.Strong("F1 Score:")), html.Td("0.5008")])
+                    ], style={'margin': '0 auto', 'borderCollapse': 'collapse'})
+                ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'}),
             
-            # Right column - Worst Performing Moves
+                # Right column - PCA Analysis
+                html.Div([
+                    html.H3("PCA Analysis", style={'textAlign': 'center'}),
+                    html.P([
+                        html.Strong("Total Explained Variance: "), "0.6571",
+                        html.Br(),
+                        "Component Breakdown:",
+                        html.Br(),
+                        "PC1: 0.2204 | PC2: 0.2194 | PC3: 0.0791",
+                        html.Br(),
+                        "PC4: 0.0788 | PC5: 0.0595"
+                    ], style={'textAlign': 'center'})
+                ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'})
+            ], style={'marginBottom': '30px', 'textAlign': 'center'}),
+        
+            # Move Performance Analysis in a two-column layout
             html.Div([
-                html.H3("Top 10 Worst Performing Moves", style={'textAlign': 'center'}),
-                html.Table([
-                    html.Tr([html.Th("Move"), html.Th("F1 Score")]),
-                    html.Tr([html.Td("Seed Flare"), html.Td("0.024")]),
-                    html.Tr([html.Td("SWITCH"), html.Td("0.025")]),
-                    html.Tr([html.Td("Snipe Shot"), html.Td("0.046")]),
-                    html.Tr([html.Td("Steam Eruption"), html.Td("0.062")]),
-                    html.Tr([html.Td("Psycho Cut"), html.Td("0.076")]),
-                    html.Tr([html.Td("Glare"), html.Td("0.079")]),
-                    html.Tr([html.Td("Moonlight"), html.Td("0.091")]),
-                    html.Tr([html.Td("Triple Arrows"), html.Td("0.094")]),
-                    html.Tr([html.Td("Beak Blast"), html.Td("0.122")]),
-                    html.Tr([html.Td("Overheat"), html.Td("0.178")])
-                ], style={'margin': '0 auto', 'borderCollapse': 'collapse'})
-            ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'})
-        ], style={'marginBottom': '30px', 'textAlign': 'center'}),
+                # Left column - Best Performing Moves
+                html.Div([
+                    html.H3("Top 10 Best Performing Moves", style={'textAlign': 'center'}),
+                    html.Table([
+                        html.Tr([html.Th("Move"), html.Th("F1 Score")]),
+                        html.Tr([html.Td("Psyshield Bash"), html.Td("0.994")]),
+                        html.Tr([html.Td("Grav Apple"), html.Td("0.994")]),
+                        html.Tr([html.Td("Future Sight"), html.Td("0.984")]),
+                        html.Tr([html.Td("Psycho Boost"), html.Td("0.980")]),
+                        html.Tr([html.Td("Other"), html.Td("0.976")]),
+                        html.Tr([html.Td("Slack Off"), html.Td("0.946")]),
+                        html.Tr([html.Td("Matcha Gotcha"), html.Td("0.944")]),
+                        html.Tr([html.Td("Shadow Sneak"), html.Td("0.943")]),
+                        html.Tr([html.Td("Quick Attack"), html.Td("0.932")]),
+                        html.Tr([html.Td("Fiery Dance"), html.Td("0.884")])
+                    ], style={'margin': '0 auto', 'borderCollapse': 'collapse'})
+                ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+            
+                # Right column - Worst Performing Moves
+                html.Div([
+                    html.H3("Top 10 Worst Performing Moves", style={'textAlign': 'center'}),
+                    html.Table([
+                        html.Tr([html.Th("Move"), html.Th("F1 Score")]),
+                        html.Tr([html.Td("Seed Flare"), html.Td("0.024")]),
+                        html.Tr([html.Td("SWITCH"), html.Td("0.025")]),
+                        html.Tr([html.Td("Snipe Shot"), html.Td("0.046")]),
+                        html.Tr([html.Td("Steam Eruption"), html.Td("0.062")]),
+                        html.Tr([html.Td("Psycho Cut"), html.Td("0.076")]),
+                        html.Tr([html.Td("Glare"), html.Td("0.079")]),
+                        html.Tr([html.Td("Moonlight"), html.Td("0.091")]),
+                        html.Tr([html.Td("Triple Arrows"), html.Td("0.094")]),
+                        html.Tr([html.Td("Beak Blast"), html.Td("0.122")]),
+                        html.Tr([html.Td("Overheat"), html.Td("0.178")])
+                    ], style={'margin': '0 auto', 'borderCollapse': 'collapse'})
+                ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top'})
+            ], style={'marginBottom': '30px', 'textAlign': 'center'}),
         
-        # Analysis Summary
-        html.Div([
-            html.P([
-                "The performance analysis reveals interesting patterns in move prediction. The best performing moves tend to be ",
-                "signature moves with clear use cases (like Psyshield Bash and Grav Apple), while the worst performing moves ",
-                "are often situational or rarely used moves. The model particularly struggles with status moves and moves that ",
-                "require specific conditions to be effective."
-            ], style={'textAlign': 'center', 'maxWidth': '800px', 'margin': '0 auto'})
-        ])
-    ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+            # Analysis Summary
+            html.Div([
+                html.P([
+                    "The performance analysis reveals interesting patterns in move prediction. The best performing moves tend to be ",
+                    "signature moves with clear use cases (like Psyshield Bash and Grav Apple), while the worst performing moves ",
+                    "are often situational or rarely used moves. The model particularly struggles with status moves and moves that ",
+                    "require specific conditions to be effective."
+                ], style={'textAlign': 'center', 'maxWidth': '800px', 'margin': '0 auto'})
+            ])
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
     
-    html.Hr()
-], style={
-    'maxWidth': '1200px',
-    'margin': '0 auto',
-    'padding': '20px',
-    'textAlign': 'center'
-})
+        html.Hr()
+    ], style={
+        'maxWidth': '1200px',
+        'margin': '0 auto',
+        'padding': '20px',
+        'textAlign': 'center'
+    })
+
+@callback(
+    Output('findings-cluster', 'figure'),
+    Output('findings-viability', 'figure'),
+    Input('findings-bracket', 'value'),
+    prevent_initial_call=True,
+)
+def update_archetypes(bracket):
+    return archetype_figures(figures_data.get(), bracket)
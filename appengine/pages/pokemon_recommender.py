@@ -1,88 +1,96 @@
+import threading
 import dash
-from dash import html, dcc, Input, Output, State, callback
-import json
-import pandas as pd
-from components.pokemon_move_recommender import load_model, get_pokemon_info, build_predictor
-from components.visualizations import create_move_usage_graph, create_counter_graph
+from dash import html, dcc, Input, Output, State, callback, clientside_callback, ClientsideFunction
+from flask import abort, request
+from components.data_loader import CUTOFFS, cutoff_file, dataset_version, load_gen9ou_cutoffs
+from components.brackets import build_bracket_store, bracket_entries, bracket_options
+from components.hot_reload import reloadable
+from components.job_queue import LocalJobManager
+from components.recommender_job import RECOMMENDER_FIELDS, recommend_job, recommender_version
+from components.chart_bundle import build_chart_bundle, encode_bundle, bundle_response
 
-# Load Pokemon data
-with open("./components/data/gen9ou_full_data.json", "r") as f:
-    pokemon_data = json.load(f)
+# Recommendations run as background jobs on the local process pool; results are
+# cached by input and by data / model version, so a repeated query skips the job
+job_manager = LocalJobManager(cache_by=[lambda: str(recommender_version())])
 
-# Register Dash page
-dash.register_page(__name__, path='/pokemon_recommender')
-
-layout = html.Div([
-    html.H1('Pokemon Move Recommender'),
-    html.Div([
-        html.Label('Your Pokemon:'),
-        dcc.Input(id='pokemon1-input', type='text', placeholder='Enter Pokemon name'),
-        html.Br(),
-        html.Label('Opponent Pokemon:'),
-        dcc.Input(id='pokemon2-input', type='text', placeholder='Enter Pokemon name'),
-        html.Br(),
-        html.Button('Get Recommendation', id='recommend-button', n_clicks=0),
-    ]),
-    html.Div(id='recommendation-output', style={'marginTop': 20}),
-    html.Div([
-        dcc.Graph(id='move-usage-graph'),
-        dcc.Graph(id='counter-graph')
-    ], style={'display': 'flex', 'flexDirection': 'row', 'justifyContent': 'space-around'})
-])
-
-@callback(
-    [Output('recommendation-output', 'children'),
-     Output('move-usage-graph', 'figure'),
-     Output('counter-graph', 'figure')],
-    Input('recommend-button', 'n_clicks'),
-    State('pokemon1-input', 'value'),
-    State('pokemon2-input', 'value')
-)
-def update_output(n_clicks, pokemon1, pokemon2):
-    if n_clicks > 0 and pokemon1 and pokemon2:
-        try:
-            # Load model and create predictor
-            model_data = load_model()
-            model, scaler, pca, _, _ = model_data
-            recommend = build_predictor(model, scaler, pca, pokemon_data)
+# The move and counter charts are drawn in the browser from one compact bundle
+# per rating bracket (assets/recommender_charts.js), so picking another Pokemon
+# needs no request; a bracket's bundle is encoded the first time it is asked for
+BUNDLE_URL = '/_bundle/recommender_charts'
 
-            recommendation = recommend(pokemon1, pokemon2)
+def build_chart_data():
+    store = build_bracket_store(load_gen9ou_cutoffs(fields=RECOMMENDER_FIELDS))
+    return {'store': store, 'bundles': {}, 'lock': threading.Lock()}
 
-            p1_info = get_pokemon_info(pokemon1, pokemon_data)
-            p2_info = get_pokemon_info(pokemon2, pokemon_data)
+chart_data = reloadable('recommender_charts', lambda: dataset_version([cutoff_file(c) for c in CUTOFFS]),
+                        build_chart_data, lazy=True)
 
-            if not p1_info or not p2_info:
-                return "Error: One or both Pokemon not found.", {}, {}
+def bundle_for(bracket):
+    current = chart_data.get()
+    bracket = int(bracket) if bracket.isdigit() else bracket
+    if bracket not in [option['value'] for option in bracket_options(current['store'])]:
+        abort(404)
+    with current['lock']:
+        if bracket not in current['bundles']:
+            current['bundles'][bracket] = encode_bundle(build_chart_bundle(bracket_entries(current['store'], bracket)))
+        encoded = current['bundles'][bracket]
+    return bundle_response(encoded, request)
 
-            # Create visualizations using imported functions
-            move_fig = create_move_usage_graph(p1_info["moves"], pokemon1)
-            counter_fig = create_counter_graph(p1_info["counters"], pokemon1)
+dash.get_app().server.add_url_rule(BUNDLE_URL + '/<bracket>.json', 'recommender_charts', bundle_for)
 
-            recommendation_output = html.Div([
-                html.H3('Recommendation:'),
-                html.P(recommendation),
-                html.H4('Pokemon Details:'),
-                html.Div([
-                    html.Div([
-                        html.H5(f'{pokemon1} Stats:'),
-                        html.P(f'Raw Count: {p1_info["raw_count"]}'),
-                        html.P(f'Viability Ceiling: {p1_info["viability_ceiling"]}'),
-                    ], style={'marginRight': '20px'}),
-                    html.Div([
-                        html.H5(f'{pokemon2} Stats:'),
-                        html.P(f'Raw Count: {p2_info["raw_count"]}'),
-                        html.P(f'Viability Ceiling: {p2_info["viability_ceiling"]}'),
-                    ])
-                ], style={'display': 'flex', 'justifyContent': 'space-around'})
-            ])
+# Register Dash page
+dash.register_page(__name__, path='/pokemon_recommender')
 
-            return recommendation_output, move_fig, counter_fig
+def layout(**kwargs):
+    store = chart_data.get()['store']
+    return html.Div([
+        html.H1('Pokemon Move Recommender'),
+        html.Div([
+            html.Label('Your Pokemon:'),
+            dcc.Input(id='pokemon1-input', type='text', placeholder='Enter Pokemon name'),
+            html.Br(),
+            html.Label('Opponent Pokemon:'),
+            dcc.Input(id='pokemon2-input', type='text', placeholder='Enter Pokemon name'),
+            html.Br(),
+            html.Label('Rating bracket:'),
+            dcc.Dropdown(id='recommender-bracket', options=bracket_options(store), value=store['cutoffs'][0],
+                         clearable=False, style={'maxWidth': '300px'}),
+            html.Button('Get Recommendation', id='recommend-button', n_clicks=0),
+            html.Button('Cancel', id='cancel-button', n_clicks=0, disabled=True, style={'marginLeft': '10px'}),
+        ]),
+        html.Div(id='recommendation-progress', style={'marginTop': 10}),
+        html.Div(id='recommendation-output', style={'marginTop': 20}),
+        dcc.Store(id='chart-bundle-url', data=dash.get_relative_path(BUNDLE_URL)),
+        html.Div([
+            dcc.Graph(id='move-usage-graph'),
+            dcc.Graph(id='counter-graph')
+        ], style={'display': 'flex', 'flexDirection': 'row', 'justifyContent': 'space-around'})
+    ])
 
-        except Exception as e:
-            print(f"Error in update_output: {str(e)}")
-            return html.Div([
-                html.H3('Error:'),
-                html.P(str(e))
-            ]), {}, {}
+clientside_callback(
+    ClientsideFunction(namespace='recommender', function_name='charts'),
+    Output('move-usage-graph', 'figure'),
+    Output('counter-graph', 'figure'),
+    Input('pokemon1-input', 'value'),
+    Input('recommender-bracket', 'value'),
+    State('chart-bundle-url', 'data'),
+)
 
-    return '', {}, {}
+# The job body lives in components/recommender_job.py so spawned pool processes can import it
+update_output = callback(
+    Output('recommendation-output', 'children'),
+    Input('recommend-button', 'n_clicks'),
+    State('pokemon1-input', 'value'),
+    State('pokemon2-input', 'value'),
+    State('recommender-bracket', 'value'),
+    background=True,
+    manager=job_manager,
+    progress=[Output('recommendation-progress', 'children')],
+    progress_default=[''],
+    running=[(Output('recommend-button', 'disabled'), True, False),
+             (Output('cancel-button', 'disabled'), False, True)],
+    cancel=[Input('cancel-button', 'n_clicks')],
+    cache_args_to_ignore=[0],  # n_clicks
+    interval=250,
+    prevent_initial_call=True,
+)(recommend_job)
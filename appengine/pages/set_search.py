@@ -0,0 +1,78 @@
+import dash
+from dash import html, dcc, Input, Output, State, callback
+from components.data_loader import GEN9OU_BLOB, dataset_version, load_gen9ou_entries
+from components.attribute_index import FIELDS, load_or_build_attribute_index, search, usage_of
+from components.hot_reload import reloadable
+
+# Register the page
+dash.register_page(__name__, path='/set_search')
+
+# Postings are loaded (or built) once per data version; each query is a few
+# array intersections against the index current when the request started
+attribute_index = reloadable('set_search', lambda: dataset_version([GEN9OU_BLOB]),
+                             lambda: load_or_build_attribute_index(load_gen9ou_entries()))
+
+FIELD_LABELS = {'move': 'Move', 'item': 'Item', 'ability': 'Ability', 'tera': 'Tera Type'}
+N_FILTERS = 3
+DEFAULT_FILTERS = [('item', 'Choice Scarf', 20), ('move', None, 0), ('tera', None, 0)]
+MAX_ROWS = 50
+
+def filter_row(k):
+    field, value, min_pct = DEFAULT_FILTERS[k]
+    return html.Div([
+        dcc.Dropdown(id=f'set-field-{k}', options=[{'label': FIELD_LABELS[f], 'value': f} for f in FIELDS],
+                     value=field, clearable=False, style={'width': '160px'}),
+        dcc.Dropdown(id=f'set-value-{k}', value=value, placeholder='Any value', style={'width': '300px'}),
+        dcc.Input(id=f'set-min-{k}', type='number', min=0, max=100, value=min_pct, style={'width': '90px'}),
+        html.Span('% or more', style={'alignSelf': 'center'}),
+    ], style={'display': 'flex', 'gap': '10px', 'marginBottom': '10px'})
+
+# --- Layout ---
+layout = html.Div([
+    html.H1("Set Search", style={'textAlign': 'center', 'marginBottom': '30px'}),
+
+    html.Div([
+        html.P("Find Pokémon by the moves, items, abilities and Tera Types they run, e.g. every Pokémon using "
+               "Choice Scarf on more than 20% of its sets. Leave a value empty to ignore that filter.",
+               style={'textAlign': 'center'}),
+        *[filter_row(k) for k in range(N_FILTERS)],
+        dcc.RadioItems(id='set-mode', options=[{'label': ' Match all filters', 'value': 'all'},
+                                               {'label': ' Match any filter', 'value': 'any'}],
+                       value='all', inline=True, inputStyle={'marginLeft': '15px'}),
+    ], style={'maxWidth': '800px', 'margin': '0 auto'}),
+
+    html.Div(id='set-output', style={'maxWidth': '1000px', 'margin': '30px auto', 'padding': '20px'})
+])
+
+for k in range(N_FILTERS):
+    @callback(Output(f'set-value-{k}', 'options'), Output(f'set-value-{k}', 'value'),
+              Input(f'set-field-{k}', 'value'), State(f'set-value-{k}', 'value'))
+    def update_values(field, value):
+        # A value left over from the previous field is cleared; the default on first load is kept
+        field_index = attribute_index.get()[field]
+        return ([{'label': v, 'value': v} for v in field_index['values']],
+                value if value in field_index['lookup'] else None)
+
+@callback(
+    Output('set-output', 'children'),
+    Input('set-mode', 'value'),
+    *[Input(f'set-{part}-{k}', 'value') for k in range(N_FILTERS) for part in ('field', 'value', 'min')],
+)
+def update_results(mode, *filters):
+    clauses = [(field, value, min_pct or 0) for field, value, min_pct in zip(filters[::3], filters[1::3], filters[2::3])
+               if value]
+    if not clauses:
+        return html.P("Choose at least one value.", style={'textAlign': 'center'})
+
+    index = attribute_index.get()
+    ids = search(index, all_of=clauses) if mode == 'all' else search(index, any_of=clauses)
+    names = index['names']
+    usage = [usage_of(index, field, value, ids[:MAX_ROWS]) for field, value, _ in clauses]
+
+    header = html.Tr([html.Th('Pokémon')] + [html.Th(f"{value} (%)") for _, value, _ in clauses])
+    rows = [html.Tr([html.Td(names[i])] + [html.Td(f"{column[r]:.1f}") for column in usage])
+            for r, i in enumerate(ids[:MAX_ROWS])]
+    return html.Div([
+        html.P(f"{len(ids)} Pokémon match" + (f" (showing the {MAX_ROWS} most used)" if len(ids) > MAX_ROWS else "")),
+        html.Table([html.Thead(header), html.Tbody(rows)], className='table table-striped'),
+    ])
@@ -0,0 +1,110 @@
+import threading
+import dash
+from dash import html, dcc, Input, Output, State, callback
+from components.data_loader import CUTOFFS, cutoff_file, dataset_version, load_gen9ou_cutoffs
+from components.brackets import build_bracket_store, bracket_entries, bracket_options
+from components.hot_reload import reloadable
+from components.pokemon_move_recommender import KO_THRESHOLD, SWITCH_THRESHOLD
+from components.team_recommender import build_team_index, recommend_team
+from components.threat_coverage import build_coverage_index, best_additions, uncovered_threats
+
+# Register the page
+dash.register_page(__name__, path='/team_recommender')
+
+# Every rating cutoff is loaded once per data version; the indexes for a
+# bracket are built the first time it is picked and reused until the cutoff
+# files change, when the watcher rebuilds them in the background
+def indexes_for(team_data, bracket):
+    # One lock per data version, so concurrent callbacks build a new bracket only once
+    with team_data['lock']:
+        indexes = team_data['indexes']
+        if bracket not in indexes:
+            entries = bracket_entries(team_data['store'], bracket)
+            indexes[bracket] = build_team_index(entries), build_coverage_index(entries)
+        return indexes[bracket]
+
+def build_team_data():
+    store = build_bracket_store(load_gen9ou_cutoffs())
+    team_data = {'store': store, 'indexes': {}, 'lock': threading.Lock()}
+    indexes_for(team_data, store['cutoffs'][0])
+    return team_data
+
+team_data = reloadable('team_recommender', lambda: dataset_version([cutoff_file(c) for c in CUTOFFS]),
+                       build_team_data)
+
+# --- Layout ---
+def layout(**kwargs):
+    current = team_data.get()
+    default_bracket = current['store']['cutoffs'][0]
+    team_index, _ = indexes_for(current, default_bracket)
+    return html.Div([
+        html.H1("Pokémon Team Recommender", style={'textAlign': 'center', 'marginBottom': '30px'}),
+
+        html.Div([
+            html.P(
+                "Pick 1 to 5 Pokémon and the recommender fills the rest of the team. Suggestions favour Pokémon that "
+                "are often used together (teammate percentages) and that cover the 100 most used threats "
+                "(checks and counters).",
+                style={'textAlign': 'center'}
+            ),
+            dcc.Dropdown(
+                id='team-input',
+                options=[{'label': name, 'value': name} for name in team_index['names']],
+                multi=True,
+                placeholder='Choose up to 5 Pokémon',
+            ),
+            dcc.Dropdown(
+                id='team-bracket',
+                options=bracket_options(current['store']),
+                value=default_bracket,
+                clearable=False,
+                style={'marginTop': '10px'},
+            ),
+            html.Button('Recommend Team', id='team-button', n_clicks=0, style={'marginTop': '15px'}),
+        ], style={'maxWidth': '800px', 'margin': '0 auto'}),
+
+        html.Div(id='team-output', style={'maxWidth': '1000px', 'margin': '30px auto', 'padding': '20px'})
+    ])
+
+@callback(
+    Output('team-output', 'children'),
+    Input('team-button', 'n_clicks'),
+    State('team-input', 'value'),
+    State('team-bracket', 'value')
+)
+def update_team(n_clicks, chosen, bracket=None):
+    if not n_clicks or not chosen:
+        return ''
+    if len(chosen) > 5:
+        return html.P("Please choose at most 5 Pokémon.")
+
+    current = team_data.get()
+    if bracket not in current['store']['cutoffs']:
+        bracket = current['store']['cutoffs'][0]
+    team_index, coverage_index = indexes_for(current, bracket)
+    try:
+        results = recommend_team(team_index, chosen)
+    except (KeyError, ValueError) as e:
+        return html.Div([html.H3('Error:'), html.P(str(e))])
+
+    additions = best_additions(coverage_index, chosen)
+    cards = [html.Div([
+        html.H4("Coverage Check"),
+        html.P(f"{len(uncovered_threats(coverage_index, chosen))} of the top {len(coverage_index['threats'])} "
+               f"threats are not countered by your picks (KOed over {KO_THRESHOLD}% and switched out over "
+               f"{SWITCH_THRESHOLD}%)."),
+        html.P([html.Strong("Single additions that counter the most of them: "),
+                ", ".join(f"{name} (+{gain})" for name, gain in additions) or "None"]),
+    ], style={'marginBottom': '30px'})]
+    for rank, result in enumerate(results, start=1):
+        suggested = [name for name in result['team'] if name not in chosen]
+        cards.append(html.Div([
+            html.H4(f"Option {rank}"),
+            html.P([html.Strong("Team: "), ", ".join(result['team'])]),
+            html.P([html.Strong("Suggested additions: "), ", ".join(suggested)]),
+            html.P(f"Average teammate usage: {result['avg_teammate_pct']:.1f}% | "
+                   f"Top-100 threat coverage: {result['threat_coverage'] * 100:.0f}%"),
+            html.P([html.Strong("Unanswered threats: "),
+                    ", ".join(result['uncovered_threats'][:10]) or "None"]),
+        ], style={'marginBottom': '30px'}))
+    return cards
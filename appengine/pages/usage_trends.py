@@ -0,0 +1,54 @@
+import dash
+import numpy as np
+from dash import html, dcc
+from components.hot_reload import directory_version, reloadable
+from components.usage_trends import TRENDS_DIR, load_history, month_deltas, risers_fallers, top_trajectories
+from components.visualizations import create_risers_fallers_graph, create_usage_trend_graph, create_rank_change_graph
+
+# Register page
+dash.register_page(__name__, path='/usage_trends')
+
+# Per-month aggregates are stored under components/data/trends; the figures
+# are built once from the stacked month arrays and rebuilt when a month is added
+def build_trend_figures():
+    history = load_history()
+    months = history['months']
+    risers, fallers = risers_fallers(history, k=10)
+    top_names, top_usage = top_trajectories(history, k=10)
+
+    # With fewer than two months the change figures show an empty state
+    before, after = (months[-2], months[-1]) if len(months) >= 2 else (None, None)
+    top20, rank_change = [], []
+    if before is not None:
+        top20 = np.argsort(-history['usage'][-1], kind='stable')[:20]
+        rank_change = np.nan_to_num(month_deltas(history)['rank_change'][-1, top20])
+    return {
+        'months': months,
+        'movers': create_risers_fallers_graph(risers, fallers, before, after),
+        'trends': create_usage_trend_graph(months, top_names, top_usage),
+        'ranks': create_rank_change_graph([history['names'][i] for i in top20], rank_change, before, after),
+    }
+
+trend_figures = reloadable('usage_trends', lambda: directory_version(TRENDS_DIR), build_trend_figures)
+
+# --- Layout ---
+def layout(**kwargs):
+    figures = trend_figures.get()
+    return html.Div([
+        html.H1("Usage Trends", style={'textAlign': 'center', 'marginBottom': '30px'}),
+
+        html.Div([
+            html.P(f"Gen 9 OU usage compared across {', '.join(figures['months'])}.", style={'textAlign': 'center'}),
+            dcc.Graph(figure=figures['movers'], className='graph-style')
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+
+        html.Div([
+            dcc.Graph(figure=figures['trends'], className='graph-style')
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+
+        html.Div([
+            html.P("Pokémon new to the usage stats in the earlier month show no rank change.",
+                   style={'textAlign': 'center'}),
+            dcc.Graph(figure=figures['ranks'], className='graph-style')
+        ], style={'marginBottom': '70px', 'textAlign': 'center'}),
+    ])
@@ -1,11 +1,13 @@
 import csv
 import os
+import unicodedata
+from compressed_io import open_text
 
 def create_pokemon_generation_map(pokemon_csv_path):
     """Create a mapping of Pokemon names to their generations."""
     pokemon_generations = {}
     
-    with open(pokemon_csv_path, 'r', encoding='utf-8') as f:
+    with open_text(pokemon_csv_path, newline='') as f:
         reader = csv.DictReader(f)
         for row in reader:
             name = row['Name'].strip()
@@ -19,6 +21,9 @@ def create_pokemon_generation_map(pokemon_csv_path):
                 full_name = name
                 
             pokemon_generations[full_name] = generation
+            # Smogon spells names without accents ("Flabébé" -> "Flabebe")
+            plain_name = unicodedata.normalize('NFKD', full_name).encode('ascii', 'ignore').decode()
+            pokemon_generations.setdefault(plain_name, generation)
             
             # Also add the base name without form
             if form:
@@ -31,7 +36,7 @@ def add_generation_to_stats(input_file, output_file, pokemon_generations):
     rows = []
     
     # Read the input file
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with open_text(input_file, newline='') as f:
         reader = csv.DictReader(f)
         fieldnames = reader.fieldnames + ['Generation']
         
@@ -50,7 +55,7 @@ def add_generation_to_stats(input_file, output_file, pokemon_generations):
     
     # Write the output file
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
         writer.writeheader()
         writer.writerows(rows)
 
@@ -1,17 +1,32 @@
 
 import pandas as pd
 import glob
+import os
+from compressed_io import EXTENSIONS, find_input, open_text
 
-# Find all relevant CSVs
-csv_files = glob.glob("**/*pokemon_usage_stats_with_gen.csv", recursive=True)
+def usage_csv_files(pattern="**/*pokemon_usage_stats_with_gen.csv"):
+    """One path per month: the plain CSV if present, else its compressed copy in find_input's order."""
+    bases = set()
+    for path in glob.glob(pattern + "*", recursive=True):
+        base, _, extension = path.rpartition('.')
+        bases.add(base if extension in EXTENSIONS else path)
+    return [find_input(base) for base in sorted(bases) if base.endswith('.csv')]
 
-combined_df = pd.DataFrame()
+def combine_usage_csvs(csv_files, output_file):
+    """Stack the per-month usage CSVs, tagging each row with the file it came from."""
+    combined_df = pd.DataFrame()
+    for file in csv_files:
+        with open_text(file) as f:
+            df = pd.read_csv(f)
+        df["Source File"] = os.path.basename(file)  # Optional: track which file each row came from
+        combined_df = pd.concat([combined_df, df], ignore_index=True)
+    combined_df.to_csv(output_file, index=False)
+    return len(combined_df)
 
-for file in csv_files:
-    df = pd.read_csv(file)
-    df["Source File"] = file  # Optional: track which file each row came from
-    combined_df = pd.concat([combined_df, df], ignore_index=True)
+if __name__ == "__main__":
+    # Find all relevant CSVs (a compressed copy such as .csv.gz is read when the plain file is missing)
+    csv_files = usage_csv_files()
 
-# Save combined result
-combined_df.to_csv("combined_pokemon_usage.csv", index=False)
-print(f"✅ Combined {len(csv_files)} files into 'combined_pokemon_usage.csv'")
+    # Save combined result
+    combine_usage_csvs(csv_files, "combined_pokemon_usage.csv")
+    print(f"✅ Combined {len(csv_files)} files into 'combined_pokemon_usage.csv'")
@@ -0,0 +1,18 @@
+import importlib.util
+import os
+
+# The analysis scripts read dumps and CSVs through
+# appengine/components/compressed_io.py. This module loads it by path, so the
+# scripts can `from compressed_io import open_text` without touching sys.path.
+_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'appengine', 'components', 'compressed_io.py')
+_spec = importlib.util.spec_from_file_location('components.compressed_io', _SOURCE)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+
+MAGIC = _module.MAGIC
+EXTENSIONS = _module.EXTENSIONS
+detect_compression = _module.detect_compression
+find_input = _module.find_input
+open_binary = _module.open_binary
+open_text = _module.open_text
+read_text = _module.read_text
@@ -1,5 +1,6 @@
 import re
 import json
+from compressed_io import open_text
 
 def extract_float(line):
     match = re.search(r"\d+\.\d+|\d+", line)
@@ -160,9 +161,34 @@ def parse_all_pokemon(text):
 
     return parsed_data
 
+def parse_all_cutoffs(month_dir, cutoffs=(0, 1500, 1695, 1825), out_dir="."):
+    """Parse every gen9ou-<cutoff>.txt of one month and write gen9ou-<cutoff>_full_data.json next to each other.
+
+    Cutoff 0 keeps its original name (gen9ou_full_data.json) so the app picks it up unchanged.
+    """
+    written = {}
+    for cutoff in cutoffs:
+        try:
+            parsed = parse_pokemon_file(f"{month_dir}/gen9ou-{cutoff}.txt")
+        except FileNotFoundError:
+            continue
+        name = "gen9ou_full_data.json" if cutoff == 0 else f"gen9ou-{cutoff}_full_data.json"
+        with open(f"{out_dir}/{name}", "w") as out:
+            json.dump(parsed, out, indent=4)
+        written[cutoff] = len(parsed)
+    return written
+
+def parse_pokemon_file(path):
+    """parse_all_pokemon on a moveset dump, plain or .gz / .bz2 / .xz / .zst compressed."""
+    with open_text(path) as f:
+        return parse_all_pokemon(f.read())
+
 # Example usage:
 # with open("gen9ou-0.txt", "r") as f:
 #     raw = f.read()
 # parsed = parse_all_pokemon(raw)
 # with open("gen9ou_full_data.json", "w") as out:
 #     json.dump(parsed, out, indent=4)
+#
+# All rating brackets of a month at once (read side by side by appengine/components/brackets.py):
+# parse_all_cutoffs("chaos/2025-02", out_dir="../appengine/components/data")
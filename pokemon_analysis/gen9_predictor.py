@@ -8,35 +8,49 @@ from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-# Load the dataset
-df = pd.read_csv("combined_pokemon_usage.csv")
-
-# Create binary target: 1 if Generation == 9, else 0
-df["Is_Gen9"] = (df["Generation"] == 9).astype(int)
-
-# Select features and target
-X = df[["Usage %", "Raw Count", "Raw %", "Real Count", "Real %"]]
-y = df["Is_Gen9"]
-
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# Train logistic regression model
-model = LogisticRegression(max_iter=1000)
-model.fit(X_train, y_train)
-
-# Predict and evaluate
-y_pred = model.predict(X_test)
-print(classification_report(y_test, y_pred))
-
-# Feature importance
-print("Feature Coefficients:")
-for feature, coef in zip(X.columns, model.coef_[0]):
-    print(f"{feature}: {coef:.4f}")
-
-y_scores = model.predict_proba(X_test)[:, 1]
-precision, recall, _ = precision_recall_curve(y_test, y_scores)
-
-sns.boxplot(x='Generation', y='Usage %', data=df)
-plt.title("Usage % Distribution by Generation")
-plt.show()
\ No newline at end of file
+def run_gen9_predictor(csv_path="combined_pokemon_usage.csv", report_path=None, figure_path=None):
+    """Fit the Gen 9 classifier; write the report / figure to the given paths, or print and show them."""
+    # Load the dataset
+    df = pd.read_csv(csv_path)
+
+    # Create binary target: 1 if Generation == 9, else 0
+    df["Is_Gen9"] = (df["Generation"] == 9).astype(int)
+
+    # Select features and target
+    X = df[["Usage %", "Raw Count", "Raw %", "Real Count", "Real %"]]
+    y = df["Is_Gen9"]
+
+    # Train-test split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Train logistic regression model
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X_train, y_train)
+
+    # Predict and evaluate
+    y_pred = model.predict(X_test)
+    report = classification_report(y_test, y_pred)
+
+    # Feature importance
+    report += "\nFeature Coefficients:\n"
+    for feature, coef in zip(X.columns, model.coef_[0]):
+        report += f"{feature}: {coef:.4f}\n"
+    if report_path:
+        with open(report_path, 'w') as f:
+            f.write(report)
+    else:
+        print(report)
+
+    y_scores = model.predict_proba(X_test)[:, 1]
+    precision, recall, _ = precision_recall_curve(y_test, y_scores)
+
+    sns.boxplot(x='Generation', y='Usage %', data=df)
+    plt.title("Usage % Distribution by Generation")
+    if figure_path:
+        plt.savefig(figure_path)
+        plt.close()
+    else:
+        plt.show()
+
+if __name__ == "__main__":
+    run_gen9_predictor()
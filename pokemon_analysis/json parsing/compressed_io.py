@@ -0,0 +1,12 @@
+import importlib.util
+import os
+
+# The scripts in this folder use the same helper as the ones above it (../compressed_io.py)
+_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'compressed_io.py')
+_spec = importlib.util.spec_from_file_location('pokemon_analysis_compressed_io', _SOURCE)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+
+find_input = _module.find_input
+open_text = _module.open_text
+read_text = _module.read_text
@@ -1,8 +1,10 @@
 import re
 import json
+import os
+from compressed_io import open_text
 
 def parse_pokemon_stats(file_path):
-    with open(file_path, 'r') as file:
+    with open_text(file_path) as file:
         content = file.read()
     
     # Split by Pokemon entries using the header pattern
@@ -1,6 +1,7 @@
 
 import re
 import json
+from compressed_io import open_text
 
 def extract_float(line):
     match = re.search(r"\d+\.\d+|\d+", line)
@@ -161,6 +162,11 @@ def parse_all_pokemon(text):
 
     return parsed_data
 
+def parse_pokemon_file(path):
+    """parse_all_pokemon on a moveset dump, plain or .gz / .bz2 / .xz / .zst compressed."""
+    with open_text(path) as f:
+        return parse_all_pokemon(f.read())
+
 # Example usage:
 # with open("gen9ou-0.txt", "r") as f:
 #     raw = f.read()
@@ -1,12 +1,8 @@
-from full_pokemon_parser import parse_all_pokemon
+from full_pokemon_parser import parse_pokemon_file
 import json
 
-# Read the latest gen9ou data file
-with open("../data/2025-02-gen9ou-0.txt", "r") as f:
-    raw = f.read()
-
-# Parse the data
-parsed = parse_all_pokemon(raw)
+# Read and parse the latest gen9ou data file (a .gz / .bz2 / .xz / .zst copy also works)
+parsed = parse_pokemon_file("../data/2025-02-gen9ou-0.txt")
 
 # Save to JSON
 with open("../data/gen9ou_full_data.json", "w") as out:
@@ -1,20 +1,22 @@
 import re
 import csv
 import os
+from compressed_io import open_text
 
-def parse_pokemon_stats():
+def parse_pokemon_stats(input_file=None, output_file=None):
     try:
         # Get the current script's directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        input_file = os.path.join(script_dir, "2023-02-gen9ou-0.txt")
-        output_file = os.path.join(script_dir, "2023-02-pokemon_usage_stats.csv")
+        input_file = input_file or os.path.join(script_dir, "2023-02-gen9ou-0.txt")
+        output_file = output_file or os.path.join(script_dir, "2023-02-pokemon_usage_stats.csv")
         
         print(f"Script directory: {script_dir}")
         print(f"Input file: {input_file}")
         print(f"Output file: {output_file}")
         
         # Read the input file
-        with open(input_file, 'r', encoding='utf-8') as f:
+        # A .gz / .bz2 / .xz / .zst copy of the input is read in place if the .txt is not there
+        with open_text(input_file) as f:
             lines = f.readlines()
         
         print(f"Read {len(lines)} lines from input file")
@@ -63,7 +65,7 @@ def parse_pokemon_stats():
         
         # Write to CSV
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
+            writer = csv.writer(f, lineterminator='\n')
             writer.writerows(csv_data)
         
         print(f"Successfully wrote {len(csv_data)} rows to {output_file}")
@@ -0,0 +1,238 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from compressed_io import find_input
+
+# Declarative runner for the analysis scripts. Each stage lists the files it
+# reads and writes and the scripts it runs; a stage depends on whichever
+# stages write its inputs. A stage is skipped when the SHA-256 of its inputs
+# and scripts matches the last run and its outputs still exist, and stages whose dependencies are done run in
+# parallel (e.g. the per-month parses).
+#
+#   python pokemon_analysis/pipeline.py                 # everything except model training
+#   python pokemon_analysis/pipeline.py train_model     # also (re)train the move model
+#   python pokemon_analysis/pipeline.py --list
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(ANALYSIS_DIR)
+DATA_DIR = os.path.join(ANALYSIS_DIR, 'data')
+OUTPUT_DIR = os.path.join(ANALYSIS_DIR, 'output')
+CACHE_PATH = os.path.join(ANALYSIS_DIR, '.pipeline_cache.json')
+USAGE_DUMP = re.compile(r"(\d{4}-\d{2})-gen9ou-0\.txt")
+# Stages left out unless named on the command line (training needs several GB of RAM)
+OPT_IN = ('train_model',)
+# The scripts import each other by bare name
+sys.path.insert(0, ANALYSIS_DIR)
+
+# --- Stage functions (module level so worker processes can run them) ---
+def _usage_csv(inputs, outputs):
+    from parse_pokemon_stats import parse_pokemon_stats
+    parse_pokemon_stats(inputs[0], outputs[0])
+
+def _add_generation(inputs, outputs):
+    from add_generations import add_generation_to_stats, create_pokemon_generation_map
+    add_generation_to_stats(inputs[0], outputs[0], create_pokemon_generation_map(inputs[1]))
+
+def _combine(inputs, outputs):
+    from combine_pokemon_usage_csvs import combine_usage_csvs
+    combine_usage_csvs(inputs, outputs[0])
+
+def _gen9_predictor(inputs, outputs):
+    import matplotlib
+    matplotlib.use('Agg')
+    from gen9_predictor import run_gen9_predictor
+    run_gen9_predictor(inputs[0], report_path=outputs[0], figure_path=outputs[1])
+
+def _full_data(inputs, outputs):
+    from full_pokemon_parser import parse_pokemon_file
+    with open(outputs[0], 'w') as out:
+        json.dump(parse_pokemon_file(inputs[0]), out, indent=4)
+
+def _train_model(inputs, outputs):
+    # train_and_save_model.py resolves its paths from the repository root
+    subprocess.run([sys.executable, os.path.join('appengine', 'components', 'train_and_save_model.py')],
+                   cwd=REPO_ROOT, check=True)
+
+# --- Stages ---
+def usage_months():
+    """Months with a usage dump in data/ (plain or compressed)."""
+    months = set()
+    for path in glob.glob(os.path.join(DATA_DIR, '*-gen9ou-0.txt*')):
+        match = USAGE_DUMP.match(os.path.basename(path))
+        if match:
+            months.add(match.group(1))
+    return sorted(months)
+
+def build_stages():
+    """The pipeline as a list of {'name', 'run', 'inputs', 'outputs', 'scripts'} dicts (absolute paths)."""
+    data = lambda name: os.path.join(DATA_DIR, name)
+    script = lambda *names: [os.path.join(ANALYSIS_DIR, name) for name in names]
+    components = os.path.join(REPO_ROOT, 'appengine', 'components')
+    app_data = os.path.join(components, 'data')
+    models = os.path.join(components, 'models')
+    stages = []
+    for month in usage_months():
+        stages.append({'name': f'usage_csv:{month}', 'run': _usage_csv,
+                       'inputs': [data(f'{month}-gen9ou-0.txt')],
+                       'outputs': [data(f'{month}-pokemon_usage_stats.csv')],
+                       'scripts': script('parse_pokemon_stats.py', 'compressed_io.py')})
+        stages.append({'name': f'add_generation:{month}', 'run': _add_generation,
+                       'inputs': [data(f'{month}-pokemon_usage_stats.csv'), data('Pokemon.csv')],
+                       'outputs': [data(f'{month}-pokemon_usage_stats_with_gen.csv')],
+                       'scripts': script('add_generations.py', 'compressed_io.py')})
+    stages.append({'name': 'combine', 'run': _combine,
+                   'inputs': [data(f'{month}-pokemon_usage_stats_with_gen.csv') for month in usage_months()],
+                   'outputs': [data('combined_pokemon_usage.csv')],
+                   'scripts': script('combine_pokemon_usage_csvs.py', 'compressed_io.py')})
+    stages.append({'name': 'gen9_predictor', 'run': _gen9_predictor,
+                   'inputs': [data('combined_pokemon_usage.csv')],
+                   'outputs': [os.path.join(OUTPUT_DIR, 'gen9_predictor_report.txt'),
+                               os.path.join(OUTPUT_DIR, 'gen9_usage_by_generation.png')],
+                   'scripts': script('gen9_predictor.py')})
+    stages.append({'name': 'full_data', 'run': _full_data,
+                   'inputs': [os.path.join(ANALYSIS_DIR, 'json parsing', 'data', 'gen9ou-0.txt')],
+                   'outputs': [os.path.join(app_data, 'gen9ou_full_data.json')],
+                   'scripts': script('full_pokemon_parser.py', 'compressed_io.py')})
+    stages.append({'name': 'train_model', 'run': _train_model,
+                   'inputs': [os.path.join(app_data, 'gen9ou_full_data.json'), os.path.join(app_data, 'Pokemon.csv')],
+                   'outputs': [os.path.join(models, 'pokemon_model.pkl'), os.path.join(models, 'pokemon_model.npz')],
+                   'scripts': [os.path.join(components, name) for name in (
+                       'train_and_save_model.py', 'pokemon_move_recommender.py', 'out_of_core_training.py',
+                       'forest_inference.py', 'type_effectiveness.py', 'pokemon_index.py')]})
+    return stages
+
+def dependencies(stages):
+    """Stage name -> names of the stages that write its inputs."""
+    producers = {path: stage['name'] for stage in stages for path in stage['outputs']}
+    return {stage['name']: sorted({producers[path] for path in stage['inputs'] if path in producers})
+            for stage in stages}
+
+def select(stages, targets):
+    """The named stages plus everything upstream of them (all but OPT_IN stages when no targets are given)."""
+    deps = dependencies(stages)
+    names = {stage['name'] for stage in stages}
+    targets = targets or [name for name in names if name not in OPT_IN]
+    unknown = [target for target in targets if target not in names]
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown}; see --list")
+    wanted, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(deps[name])
+    return [stage for stage in stages if stage['name'] in wanted]
+
+# --- Cache ---
+def inputs_hash(stage):
+    """SHA-256 over the stage name and the contents of every input and script, in order.
+
+    Raises FileNotFoundError when an input or script is missing.
+    """
+    digest = hashlib.sha256(stage['name'].encode())
+    for path in [find_input(path) for path in stage['inputs']] + stage.get('scripts', []):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def load_cache(path=CACHE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_cache(cache, path=CACHE_PATH):
+    with open(path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+# --- Runner ---
+def _timed(run, inputs, outputs):
+    start = time.perf_counter()
+    run([find_input(path) for path in inputs], outputs)
+    return time.perf_counter() - start
+
+def run_pipeline(stages, workers=None, force=False, cache_path=CACHE_PATH):
+    """Run `stages` in dependency order, up to `workers` at a time; returns {name: (status, seconds)}.
+
+    Status is 'ran', 'cached', 'failed' or 'blocked' (an upstream stage failed).
+    """
+    deps = dependencies(stages)
+    by_name = {stage['name']: stage for stage in stages}
+    cache = {} if force else load_cache(cache_path)
+    report, hashes, running = {}, {}, {}
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    def ready():
+        for name in by_name:
+            if name in report or name in running.values():
+                continue
+            upstream = [report.get(dep, (None,))[0] for dep in deps[name] if dep in by_name]
+            if any(status in ('failed', 'blocked') for status in upstream):
+                report[name] = ('blocked', 0.0)
+            elif all(status in ('ran', 'cached') for status in upstream):
+                yield name
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        while len(report) < len(by_name):
+            for name in list(ready()):
+                stage = by_name[name]
+                try:
+                    hashes[name] = inputs_hash(stage)
+                except FileNotFoundError as e:
+                    # A missing source fails this stage (and blocks its dependents), not the run
+                    print(f"Stage {name} failed: {e}")
+                    report[name] = ('failed', 0.0)
+                    cache.pop(name, None)
+                    continue
+                if cache.get(name) == hashes[name] and all(os.path.exists(path) for path in stage['outputs']):
+                    report[name] = ('cached', 0.0)
+                    continue
+                running[pool.submit(_timed, stage['run'], stage['inputs'], stage['outputs'])] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    report[name] = ('ran', future.result())
+                    cache[name] = hashes[name]
+                except Exception as e:
+                    print(f"Stage {name} failed: {e}")
+                    report[name] = ('failed', 0.0)
+                    cache.pop(name, None)
+                save_cache(cache, cache_path)
+    return report
+
+def print_report(report, wall_seconds):
+    print(f"\n{'stage':<28}{'status':<10}{'seconds':>10}")
+    for name, (status, seconds) in report.items():
+        print(f"{name:<28}{status:<10}{seconds:>10.2f}")
+    busy = sum(seconds for _, seconds in report.values())
+    print(f"{'total':<28}{'':<10}{wall_seconds:>10.2f}  (stage time {busy:.2f} s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pokemon_analysis pipeline, skipping unchanged stages.")
+    parser.add_argument('targets', nargs='*', help="Stages to bring up to date (default: all but train_model)")
+    parser.add_argument('--workers', type=int, default=None, help="Stages run in parallel (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Ignore the cache and rerun every selected stage")
+    parser.add_argument('--list', action='store_true', help="Print the stages and their dependencies")
+    args = parser.parse_args()
+
+    stages = build_stages()
+    if args.list:
+        for name, upstream in dependencies(stages).items():
+            print(f"{name:<28}<- {', '.join(upstream) or '(sources)'}")
+        sys.exit(0)
+    start = time.perf_counter()
+    report = run_pipeline(select(stages, args.targets), workers=args.workers, force=args.force)
+    print_report(report, time.perf_counter() - start)
+    sys.exit(1 if any(status == 'failed' for status, _ in report.values()) else 0)